@@ -0,0 +1,230 @@
+# app.py — Srboli Light application (screens, dashboard, app class)
+import os
+import sys
+from kivy.config import Config
+
+# Disable red right-click dots (multitouch emulation)
+Config.set("input", "mouse", "mouse,disable_multitouch")
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.gridlayout import GridLayout
+from kivy.core.window import Window
+from kivy.metrics import dp
+
+from core import metrics, startup, state_store
+from core.library import AUDIO_EXTS
+from core.scheduler import TimerScheduler
+from services import frame_monitor
+from services.tasks import TaskRunner
+from services.screen_memory import LazyScreenManager, PendingScreen
+
+# Soft blue background
+Window.clearcolor = (0.12, 0.16, 0.22, 1)
+
+# Mobile optimizations
+if sys.platform in ('android', 'ios'):
+    from android.permissions import request_permissions, Permission
+    request_permissions([Permission.READ_EXTERNAL_STORAGE, Permission.WRITE_EXTERNAL_STORAGE])
+
+# --- Safe import function ---
+def try_import(module_path, class_name):
+    try:
+        module = __import__(module_path, fromlist=[class_name])
+        return getattr(module, class_name)
+    except Exception as e:
+        print(f"⚠️ Could not import {module_path}.{class_name}: {e}")
+
+        class Placeholder(Screen):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                box = BoxLayout(orientation="vertical", padding=20, spacing=10)
+                box.add_widget(Label(text=f"[b]{class_name}[/b]\n(Not found or failed to load)", markup=True))
+                btn = Button(text="← Back", size_hint_y=None, height=dp(48))
+                btn.bind(on_release=lambda *a: setattr(self.manager, "current", "dashboard"))
+                box.add_widget(btn)
+                self.add_widget(box)
+
+        return Placeholder
+
+
+# ✅ FIXED: Proper mapping of module -> class -> screen_name
+screen_specs = {
+    "screens.backrooms_screen": ("BackroomsScreen", "backrooms"),
+    "screens.loading_timer_screen": ("LoadingTimerScreen", "loading_timer"),
+    "screens.morse_screen": ("MorseScreen", "morse"),
+    "screens.music_screen": ("MusicScreen", "music"),
+    "screens.randomizer": ("UtilityToolsScreen", "randomizer"),
+    "screens.spin_screen": ("SpinScreen", "spin"),
+    "screens.unhelpful_calc_screen": ("UnhelpfulCalcScreen", "unhelpful_calc"),
+}
+
+
+# Screens are imported and built on their first visit (PendingScreen), so
+# pygame and each screen's widgets stay out of startup
+def screen_loader(module_path, class_name):
+    return lambda: try_import(module_path, class_name)
+
+
+# --- Dashboard screen ---
+class Dashboard(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        layout = BoxLayout(orientation="vertical", padding=12, spacing=12)
+
+        title = Label(
+            text="[b]Srboli Light[/b]",
+            markup=True,
+            font_size=32,
+            size_hint_y=None,
+            height=dp(60),
+            color=(0.8, 0.9, 1, 1)
+        )
+        layout.add_widget(title)
+
+        sv = ScrollView()
+        grid = GridLayout(cols=1, spacing=10, size_hint_y=None, padding=(8, 8))
+        grid.bind(minimum_height=grid.setter("height"))
+
+        def add_btn(text, screen_name):
+            b = Button(
+                text=text,
+                size_hint_y=None,
+                height=dp(50),
+                background_color=(0.2, 0.4, 0.7, 1),
+                color=(1, 1, 1, 1),
+            )
+            b.bind(on_release=lambda *a: setattr(self.manager, "current", screen_name))
+            grid.add_widget(b)
+
+        add_btn("Backrooms Guide", "backrooms")
+        add_btn("Loading / Timer", "loading_timer")
+        add_btn("Morse Converter", "morse")
+        add_btn("Music Player", "music")
+        add_btn("Randomizer Tools", "randomizer")
+        add_btn("Wheel of Names", "spin")
+        add_btn("Unhelpful Calculator", "unhelpful_calc")
+
+        sv.add_widget(grid)
+        layout.add_widget(sv)
+
+        layout.add_widget(Label(text="by domore100", size_hint_y=None, height=dp(24)))
+        self.add_widget(layout)
+
+
+# --- Base mixin for screens with back button ---
+class ScreenWithBack(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not any(isinstance(w, Button) and w.text == "← Back" for w in self.walk()):
+            back_btn = Button(
+                text="← Back",
+                size_hint_y=None,
+                height=dp(48),
+                background_color=(0.2, 0.4, 0.7, 1),
+                color=(1, 1, 1, 1),
+            )
+            back_btn.bind(on_release=lambda *a: setattr(self.manager, "current", "dashboard"))
+            self.add_widget(back_btn)
+
+
+# --- Main App ---
+class SrboliLightApp(App):
+    def __init__(self, launch_request=None, instance_server=None, **kwargs):
+        super().__init__(**kwargs)
+        # what main.py parsed from the command line, and the single-instance listener
+        self.launch_request = launch_request
+        self.instance_server = instance_server
+
+    def build(self):
+        self.title = "Srboli Light"
+        # app-wide countdowns; screens only display them
+        self.scheduler = TimerScheduler().start()
+        # background work for every screen; results come back through Clock
+        self.tasks = TaskRunner()
+        # idle unless SRBOLI_FRAME_MONITOR=1 or F12; Ctrl+F12 dumps a report
+        self.frame_monitor = frame_monitor.install(self)
+        # hidden screens are evicted after SRBOLI_EVICT_IDLE seconds and rebuilt on return
+        sm = LazyScreenManager(home="dashboard")
+
+        sm.add_widget(Dashboard(name="dashboard"))
+
+        # ✅ FIXED: Use the correct screen names from screen_specs
+        for mod, (cls_name, screen_name) in screen_specs.items():
+            sm.add_widget(PendingScreen(screen_loader(mod, cls_name), name=screen_name))
+
+        sm.current = "dashboard"
+        startup.mark("build")
+        if self.launch_request:
+            Clock.schedule_once(lambda dt: self.open_request(self.launch_request))
+        if self.instance_server is not None:
+            # later launches hand their request over instead of opening a second window
+            self.instance_server.attach(
+                lambda request: Clock.schedule_once(lambda dt: self.open_request(request, focus=True)))
+        return sm
+
+    def on_start(self):
+        # after the first frame: start exporting, and write the startup report if one was asked for
+        Clock.schedule_once(self._after_first_frame)
+
+    def _after_first_frame(self, dt):
+        # metrics.jsonl every minute; SRBOLI_METRICS_PORT also serves /metrics on localhost
+        port = os.environ.get("SRBOLI_METRICS_PORT")
+        metrics.start_export(port=int(port) if port and port.isdigit() else None)
+        startup.finish()
+
+    def open_request(self, request, focus=False):
+        """Act on a launch request: ``{"screen", "level", "files"}`` from core.instance.parse_args."""
+        sm = self.root
+        files = request.get("files") or []
+        level = request.get("level")
+        screen = request.get("screen") or ("music" if files else "backrooms" if level else None)
+        if screen and sm.has_screen(screen):
+            sm.current = screen
+        elif screen:
+            print(f"⚠️ Unknown screen in launch request: {screen}")
+        if files and sm.has_screen("music"):
+            music = sm.ensure("music")
+            if hasattr(music, "add_tracks"):
+                tracks = [p for p in files if p.lower().endswith(AUDIO_EXTS) and os.path.isfile(p)]
+                music.add_tracks(tracks)
+                for folder in (p for p in files if os.path.isdir(p)):
+                    music.scan_folder(folder)
+                if tracks:
+                    music.select_and_play(music.playlist.index(tracks[0]))
+        if level and sm.has_screen("backrooms"):
+            backrooms = sm.ensure("backrooms")
+            if hasattr(backrooms, "search_input"):
+                # searched now if the levels are loaded, otherwise as soon as they are
+                backrooms.search_input.text = str(level)
+                if backrooms.levels:
+                    backrooms.perform_search()
+        if focus:
+            try:
+                Window.restore()
+                Window.raise_window()
+            except Exception as e:
+                print(f"⚠️ Could not raise window: {e}")
+
+    def on_stop(self):
+        self.scheduler.shutdown()
+        self.tasks.shutdown()
+        # screens that own worker threads or processes (the Music Player); never-built ones have none
+        for screen in self.root.screens:
+            if hasattr(screen, "shutdown"):
+                screen.shutdown()
+        # write whatever the session store still has queued
+        state_store.close_store()
+        if self.instance_server is not None:
+            self.instance_server.close()
+        metrics.stop_export()
+        if self.frame_monitor.running:
+            self.frame_monitor.stop()
+            self.frame_monitor.dump()
+
@@ -0,0 +1 @@
+# This package holds the benchmark and simulation tools
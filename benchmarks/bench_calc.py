@@ -0,0 +1,101 @@
+# benchmarks/bench_calc.py — calculator engine throughput
+"""
+Measure how fast core.calc evaluates generated expressions, both in batch
+through core.calc_batch and while simulating someone typing an expression
+one key at a time.
+
+    python -m benchmarks.bench_calc --lines 200000 --workers 1,4
+    python -m benchmarks.bench_calc --digits 5000 --number fraction --lines 2000
+
+Expressions are generated from ``--seed``, so runs are comparable across
+machines and commits.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import calc, calc_batch  # noqa: E402
+
+OPS = ("+", "-", "×", "÷")
+TYPED_CHARS = 2000      # longest expression the typing benchmark types in
+
+
+def make_expressions(count, terms=6, digits=8, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        parts = []
+        for t in range(terms):
+            if t:
+                parts.append(rng.choice(OPS))
+            n = str(rng.randint(1, 9)) + "".join(rng.choice("0123456789") for _ in range(digits - 1))
+            parts.append(n if rng.random() < 0.7 else n[:digits // 2] + "." + n[digits // 2:])
+        out.append("".join(parts))
+    return out
+
+
+def bench_batch(exprs, workers, number, precision, mode):
+    t0 = time.perf_counter()
+    n = sum(1 for _ in calc_batch.evaluate_stream(exprs, mode, number, precision,
+                                                  seed=0, workers=workers))
+    elapsed = time.perf_counter() - t0
+    return {"workers": workers, "mode": mode, "lines": n, "seconds": elapsed,
+            "lines_per_second": n / elapsed if elapsed else float("inf")}
+
+
+def bench_typing(expr, number, precision):
+    """Evaluate every prefix of ``expr`` like the honest keypad does, warm vs. cold memo."""
+    prefixes = [expr[:i] for i in range(1, len(expr) + 1) if expr[i - 1].isdigit()]
+    warm = calc.Calculator(number, precision)
+    t0 = time.perf_counter()
+    for p in prefixes:
+        warm.evaluate(p)
+    warm_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for p in prefixes:
+        calc.parse.cache_clear()
+        calc.Calculator(number, precision).evaluate(p)
+    cold_s = time.perf_counter() - t0
+    return {"keystrokes": len(prefixes), "warm_seconds": warm_s, "cold_seconds": cold_s}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--lines", type=int, default=50_000)
+    ap.add_argument("--terms", type=int, default=6)
+    ap.add_argument("--digits", type=int, default=8)
+    ap.add_argument("--number", choices=calc.MODES, default="decimal")
+    ap.add_argument("--precision", type=int, default=calc.DEFAULT_PRECISION)
+    ap.add_argument("--workers", default="1", help="comma separated worker counts")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", dest="json_out", help="also write the report to this file")
+    args = ap.parse_args(argv)
+
+    exprs = make_expressions(args.lines, args.terms, args.digits, args.seed)
+    report = {"lines": args.lines, "terms": args.terms, "digits": args.digits,
+              "number": args.number, "precision": args.precision, "batch": []}
+
+    for w in [int(w) for w in args.workers.split(",") if w.strip()]:
+        for mode in (calc_batch.HONEST, calc_batch.PRANK):
+            r = bench_batch(exprs, w, args.number, args.precision, mode)
+            report["batch"].append(r)
+            print(f"{mode:<7} workers={w:<3} {r['lines_per_second']:>12,.0f} lines/s  ({r['seconds']:.2f} s)")
+
+    typing = bench_typing("×".join(exprs[:10])[:TYPED_CHARS], args.number, args.precision)
+    report["typing"] = typing
+    print(f"typing  {typing['keystrokes']} keystrokes: warm {typing['warm_seconds'] * 1000:.1f} ms, "
+          f"cold {typing['cold_seconds'] * 1000:.1f} ms")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
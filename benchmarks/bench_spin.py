@@ -0,0 +1,99 @@
+# benchmarks/bench_spin.py — Wheel of Names spin simulation and fairness check
+"""
+Simulate millions of spins through core.spin and report throughput and the
+chi-square fit of the winners against the configured weights.
+
+    python -m benchmarks.bench_spin --weights 1,2,3,4 --spins 5000000
+    python -m benchmarks.bench_spin --names-file roster.txt --seed 42
+
+Name files use the Weighted Pick format: one ``name`` or ``name:weight`` per
+line. The exit code is 1 when the fit is rejected at ``--alpha`` or when any
+spin landed outside the slice it was aimed at, so the script can gate a build.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import spin  # noqa: E402
+from core.randomizer import parse_weighted, read_list_file  # noqa: E402
+
+
+def read_weights(path):
+    parsed = parse_weighted(read_list_file(path))
+    return [name for name, _ in parsed], [w for _, w in parsed]
+
+
+def run(weights, spins, seed=None, repeat=3, scalar=False):
+    """Time ``repeat`` simulations; return the best throughput and the last run's stats."""
+    sim = spin.simulate_scalar if scalar else spin.simulate
+    best = None
+    counts = mismatches = None
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        counts, mismatches = sim(weights, spins, None if seed is None else seed + i)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    stat, dof, p = spin.chi_square(counts, weights)
+    return {
+        "spins": spins,
+        "items": len(weights),
+        "backend": "scalar" if scalar or spin.np is None else "numpy",
+        "best_seconds": best,
+        "spins_per_second": spins / best if best else float("inf"),
+        "chi_square": stat,
+        "dof": dof,
+        "p_value": p,
+        "mismatches": mismatches,
+        "counts": counts,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--weights", default="1,1,1,1,1,1,1,1", help="comma separated weights")
+    src.add_argument("--names-file", help="roster file, one name[:weight] per line")
+    ap.add_argument("--spins", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--alpha", type=float, default=0.001, help="reject the fit below this p-value")
+    ap.add_argument("--scalar", action="store_true", help="use the pure-Python path")
+    ap.add_argument("--json", dest="json_out", help="also write the report to this file")
+    args = ap.parse_args(argv)
+
+    if args.names_file:
+        names, weights = read_weights(args.names_file)
+    else:
+        weights = [float(w) for w in args.weights.split(",") if w.strip()]
+        names = [f"#{i}" for i in range(len(weights))]
+    if not weights:
+        ap.error("no weights given")
+
+    report = run(weights, args.spins, args.seed, max(1, args.repeat), args.scalar)
+
+    print(f"backend:     {report['backend']}")
+    print(f"spins:       {report['spins']:,} x {len(weights)} items")
+    print(f"throughput:  {report['spins_per_second']:,.0f} spins/s (best of {args.repeat})")
+    print(f"chi-square:  {report['chi_square']:.3f} (dof={report['dof']}, p={report['p_value']:.4f})")
+    print(f"mismatches:  {report['mismatches']}")
+    total_w = sum(max(0.0, w) for w in weights) or 1.0
+    for name, w, c in list(zip(names, weights, report["counts"]))[:20]:
+        print(f"  {name:<20} expected {max(0.0, w) / total_w:8.4%}  observed {c / args.spins:8.4%}")
+
+    if args.json_out:
+        report["names"] = names
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = report["mismatches"] or report["p_value"] < args.alpha
+    if failed:
+        print("FAIL: observed winners do not match the configured weights")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
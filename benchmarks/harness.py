@@ -0,0 +1,138 @@
+# benchmarks/harness.py — timing, memory and baseline helpers for the suite
+"""
+A small pyperf-style harness with no dependencies.
+
+* ``measure(fn)`` calibrates a loop count so that one sample takes at least
+  ``min_time``, then takes ``repeat`` samples. It reports per-call min,
+  median, mean and stdev, plus the tracemalloc peak and the memory still
+  held after one extra call.
+* Baselines are JSON files with one result per case. ``compare`` reports
+  each case's ratio to the baseline and flags cases that got slower or
+  hungrier than ``threshold``.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+MAX_LOOPS = 1 << 20
+
+
+def measure(fn, repeat=5, min_time=0.05, memory=True):
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time or loops >= MAX_LOOPS:
+            break
+        # aim a bit past min_time so the next round usually settles it
+        loops = min(MAX_LOOPS, max(loops * 2, int(loops * min_time * 1.2 / max(elapsed, 1e-9))))
+
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - t0) / loops)
+
+    result = {
+        "loops": loops,
+        "repeat": repeat,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+    if memory:
+        result.update(measure_memory(fn))
+    return result
+
+
+def measure_memory(fn):
+    """Peak traced bytes during one call and bytes still held afterwards."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    fn()
+    after, peak = tracemalloc.get_traced_memory()
+    if not was_tracing:
+        tracemalloc.stop()
+    return {"peak_bytes": max(0, peak - before), "retained_bytes": max(0, after - before)}
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(path, results):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+    os.replace(tmp, path)
+
+
+def compare(results, baseline, threshold=0.10):
+    """Rows of ``(name, time_ratio, memory_ratio, regressed)`` for cases in both runs.
+
+    Times compare the per-call minimum, which is the least noisy statistic.
+    Memory compares the tracemalloc peak and ignores growth under 64 KiB.
+    """
+    old = (baseline or {}).get("results", {})
+    rows = []
+    for name, cur in results.items():
+        prev = old.get(name)
+        if not prev:
+            continue
+        t_ratio = cur["min"] / prev["min"] if prev.get("min") else None
+        m_ratio = None
+        if prev.get("peak_bytes") and "peak_bytes" in cur:
+            m_ratio = cur["peak_bytes"] / prev["peak_bytes"]
+        slower = t_ratio is not None and t_ratio > 1 + threshold
+        hungrier = (m_ratio is not None and m_ratio > 1 + threshold
+                    and cur["peak_bytes"] - prev["peak_bytes"] > 64 * 1024)
+        rows.append((name, t_ratio, m_ratio, slower or hungrier))
+    return rows
+
+
+def fmt_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def fmt_bytes(n):
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
@@ -0,0 +1,302 @@
+# benchmarks/suite.py — hot-path benchmarks for every tool, with baselines
+"""
+Time and memory benchmarks for each tool's hot path. Results can be compared
+against a saved baseline, so a regression shows up as a ratio against the
+previous build.
+
+    python -m benchmarks.suite                      # run all, compare to the baseline
+    python -m benchmarks.suite --save               # ... and make this run the new baseline
+    python -m benchmarks.suite -k morse -k calc     # only cases whose name contains these
+    python -m benchmarks.suite --check              # exit 1 on any regression (for CI)
+
+The Kivy cases build real widgets without opening a window, so they measure
+canvas-instruction and widget churn rather than GPU time. They are skipped
+when Kivy cannot be imported, or with ``--no-kivy``.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks import harness  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(".benchmarks", "baseline.json")
+
+CASES = []
+# teardown callbacks registered by the case being run; run() calls them after measuring it
+_cleanups = []
+
+
+class Skip(Exception):
+    pass
+
+
+def case(name, kivy=False):
+    """Register ``setup(scale) -> callable``; the callable is what gets timed."""
+    def deco(setup):
+        CASES.append((name, kivy, setup))
+        return setup
+    return deco
+
+
+def _temp_dir(prefix):
+    """Scratch directory removed once the current case has been measured."""
+    path = tempfile.mkdtemp(prefix=prefix)
+    _cleanups.append(lambda: shutil.rmtree(path, ignore_errors=True))
+    return path
+
+
+def _words(n, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz0123456789"
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(2, 9))) for _ in range(n)]
+
+
+# ----- Backrooms -----
+
+def _levels(n):
+    rng = random.Random(0)
+    return {str(i): {"nickname": " ".join(_words(3, rng)), "danger": rng.choice("12345"),
+                     "expectation": "", "entities": _words(4, rng), "description": " ".join(_words(80, rng)),
+                     "tips": _words(5, rng)} for i in range(n)}
+
+
+@case("backrooms.load_json")
+def _(scale):
+    from core.backrooms import load_levels_from_file
+    path = os.path.join(_temp_dir("bench_backrooms_"), "levels.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(_levels(int(2000 * scale)), f)
+    return lambda: load_levels_from_file(path)
+
+
+@case("backrooms.load_50_shards")
+def _(scale):
+    # parse + merge only; the process pool is left out so the number does not depend on core count
+    from core.backrooms import load_levels_from_sources
+    folder = _temp_dir("bench_backrooms_shards_")
+    levels = _levels(int(2000 * scale))
+    keys = list(levels)
+    step = max(1, len(keys) // 50)
+    for i in range(0, len(keys), step):
+        with open(os.path.join(folder, f"{i:06}.json"), "w", encoding="utf-8") as f:
+            json.dump({k: levels[k] for k in keys[i:i + step]}, f)
+    return lambda: load_levels_from_sources([folder])
+
+
+@case("backrooms.search_nickname_miss")
+def _(scale):
+    from core.backrooms import find_level
+    levels = _levels(int(2000 * scale))
+    return lambda: find_level(levels, "no such level")
+
+
+@case("backrooms.search_number")
+def _(scale):
+    from core.backrooms import find_level
+    levels = _levels(int(2000 * scale))
+    return lambda: find_level(levels, "1234")
+
+
+# ----- Morse -----
+
+def _text(chars):
+    rng = random.Random(1)
+    return " ".join(_words(chars // 6, rng)).upper()
+
+
+@case("morse.text_to_morse")
+def _(scale):
+    from core.morse import text_to_morse
+    text = _text(int(200_000 * scale))
+    return lambda: text_to_morse(text)
+
+
+@case("morse.morse_to_text")
+def _(scale):
+    from core.morse import text_to_morse, morse_to_text
+    code = text_to_morse(_text(int(200_000 * scale)))
+    return lambda: morse_to_text(code)
+
+
+# ----- Randomizer -----
+
+@case("randomizer.password_200")
+def _(scale):
+    from core.randomizer import generate_password
+    return lambda: generate_password(200, words=True, simple=True)
+
+
+@case("randomizer.weighted_parse_and_pick")
+def _(scale):
+    from core.randomizer import parse_weighted, weighted_pick
+    rng = random.Random(2)
+    lines = [f"{w}:{rng.randint(0, 9)}" for w in _words(int(50_000 * scale), rng)]
+    return lambda: weighted_pick(parse_weighted(lines))
+
+
+@case("randomizer.weighted_pick")
+def _(scale):
+    from core.randomizer import parse_weighted, weighted_pick
+    rng = random.Random(3)
+    parsed = parse_weighted(f"{w}:{rng.randint(0, 9)}" for w in _words(int(50_000 * scale), rng))
+    return lambda: weighted_pick(parsed)
+
+
+@case("randomizer.list_pick_100")
+def _(scale):
+    from core.randomizer import pick_items
+    items = _words(int(100_000 * scale), random.Random(4))
+    return lambda: pick_items(items, 100)
+
+
+@case("randomizer.collection_pick")
+def _(scale):
+    from core.items import ItemCollection
+    rng = random.Random(7)
+    items = ItemCollection((w, rng.randint(0, 9)) for w in _words(int(50_000 * scale), rng))
+    return items.pick
+
+
+@case("items.build_unique_100k")
+def _(scale):
+    from core.items import ItemCollection
+    words = _words(int(100_000 * scale), random.Random(8))
+    return lambda: ItemCollection().add_many(words, unique=True)
+
+
+# ----- Wheel / calculator engines -----
+
+@case("spin.plan_spin_1000")
+def _(scale):
+    from core.spin import plan_spin
+    weights = [1 + i % 7 for i in range(int(1000 * scale))]
+    return lambda: plan_spin(weights, 123.0)
+
+
+@case("calc.evaluate_cold")
+def _(scale):
+    from core import calc
+    expr = "×".join(f"({i}+{i}.5÷7)" for i in range(1, int(300 * scale)))
+
+    def run():
+        calc.parse.cache_clear()
+        calc.Calculator().evaluate(expr)
+    return run
+
+
+# ----- Kivy widgets -----
+
+def _kivy():
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    try:
+        import kivy  # noqa: F401
+    except ImportError as e:
+        raise Skip(f"kivy not available: {e}")
+
+
+@case("kivy.wheel_redraw", kivy=True)
+def _(scale):
+    _kivy()
+    from screens.spin_screen import WheelWidget
+    wheel = WheelWidget(size=(600, 600))
+    wheel.set_items([{"name": f"name{i}", "weight": 1 + i % 5} for i in range(int(200 * scale))])
+    return wheel.redraw
+
+
+@case("kivy.randomizer_refresh_list", kivy=True)
+def _(scale):
+    _kivy()
+    from core.items import ItemCollection
+    from screens.randomizer import UtilityToolsScreen
+    screen = UtilityToolsScreen(name="bench")
+    screen._build_list_ui()
+    screen.items = ItemCollection(_words(int(300 * scale), random.Random(5)))
+    return screen._refresh_list
+
+
+@case("kivy.backrooms_display_level", kivy=True)
+def _(scale):
+    _kivy()
+    from screens.backrooms_screen import BackroomsScreen
+    screen = BackroomsScreen(name="bench")
+    level = _levels(1)["0"]
+    level["tips"] = _words(int(50 * scale), random.Random(6))
+    return lambda: screen.display_level(level)
+
+
+# ----- runner -----
+
+def run(patterns=(), scale=1.0, repeat=5, min_time=0.05, kivy=True, out=print):
+    results = {}
+    for name, needs_kivy, setup in CASES:
+        if patterns and not any(p in name for p in patterns):
+            continue
+        if needs_kivy and not kivy:
+            continue
+        try:
+            try:
+                fn = setup(scale)
+            except Skip as e:
+                out(f"{name:<36} skipped ({e})")
+                continue
+            r = harness.measure(fn, repeat=repeat, min_time=min_time)
+        finally:
+            while _cleanups:
+                _cleanups.pop()()
+        results[name] = r
+        out(f"{name:<36} {harness.fmt_time(r['min']):>10} min  {harness.fmt_time(r['median']):>10} median"
+            f"  ±{harness.fmt_time(r['stdev']):>9}  peak {harness.fmt_bytes(r['peak_bytes']):>10}")
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("-k", dest="patterns", action="append", default=[], help="only cases containing this")
+    ap.add_argument("--scale", type=float, default=1.0, help="multiply every input size")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    ap.add_argument("--no-kivy", action="store_true")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE)
+    ap.add_argument("--save", action="store_true", help="store this run as the new baseline")
+    ap.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown / growth (0.10 = 10%%)")
+    ap.add_argument("--check", action="store_true", help="exit 1 when any case regressed")
+    ap.add_argument("--json", dest="json_out", help="also write this run's results to this file")
+    args = ap.parse_args(argv)
+
+    results = run(args.patterns, args.scale, max(2, args.repeat), args.min_time, not args.no_kivy)
+
+    baseline = harness.load_baseline(args.baseline)
+    regressed = []
+    if baseline:
+        env = baseline.get("environment", {})
+        print(f"\ncompared with {args.baseline} (commit {env.get('commit')}, {env.get('time')})")
+        for name, t_ratio, m_ratio, bad in harness.compare(results, baseline, args.threshold):
+            t = f"{t_ratio:6.2f}x time" if t_ratio is not None else "      - time"
+            m = f"{m_ratio:6.2f}x memory" if m_ratio is not None else "      - memory"
+            print(f"{name:<36} {t}  {m}{'  REGRESSION' if bad else ''}")
+            if bad:
+                regressed.append(name)
+
+    if args.save:
+        # keep baseline entries for cases this run filtered out
+        merged = dict((baseline or {}).get("results", {}))
+        merged.update(results)
+        harness.save_baseline(args.baseline, merged)
+        print(f"\nbaseline saved to {args.baseline}")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"environment": harness.environment(), "results": results}, f, indent=2)
+
+    if regressed:
+        print(f"\n{len(regressed)} case(s) regressed beyond {args.threshold:.0%}")
+    return 1 if regressed and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# This package holds the Kivy-free engines behind the screens
@@ -0,0 +1,550 @@
+# core/audio_meta.py — audio metadata from container headers (no decoding)
+"""
+Reads duration, bitrate and basic tags (title/artist/album) straight from the
+container headers of MP3, FLAC, Ogg (Vorbis/Opus), WAV and M4A files, so the
+Music Player never has to decode a whole file just to learn its length.
+
+``probe(path)`` returns a dict with the keys in ``FIELDS`` (missing values are
+None). ``MetadataCache`` persists results keyed by path + mtime + size and
+``MetadataService`` probes on a small worker pool.
+"""
+import json
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core import metrics
+
+CACHE_FILE = "music_meta_cache.json"
+FIELDS = ("format", "duration", "bitrate", "sample_rate", "channels", "title", "artist", "album")
+
+# bytes read from the end of an Ogg file to find the last granule position
+OGG_TAIL = 256 * 1024
+
+PROBE_TIME = metrics.histogram("music.probe_seconds", "Time to read one track's metadata")
+PROBE_FAILURES = metrics.counter("music.probe_failures", "Tracks whose metadata could not be read")
+
+
+def probe(path):
+    """Return metadata for ``path``; raises OSError if the file cannot be read."""
+    meta = dict.fromkeys(FIELDS)
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(12)
+        f.seek(0)
+        if head[:4] == b"fLaC":
+            _probe_flac(f, meta)
+        elif head[:4] == b"OggS":
+            _probe_ogg(f, size, meta)
+        elif head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            _probe_wav(f, meta)
+        elif head[4:8] == b"ftyp":
+            _probe_mp4(f, size, meta)
+        else:
+            _probe_mp3(f, size, meta)
+    if meta["bitrate"] is None and meta["duration"]:
+        meta["bitrate"] = int(size * 8 / meta["duration"] / 1000)
+    return meta
+
+
+# ----- FLAC -----
+
+def _probe_flac(f, meta):
+    meta["format"] = "flac"
+    f.seek(4)
+    last = False
+    while not last:
+        hdr = f.read(4)
+        if len(hdr) < 4:
+            break
+        last = bool(hdr[0] & 0x80)
+        btype = hdr[0] & 0x7F
+        length = int.from_bytes(hdr[1:4], "big")
+        if btype == 0:  # STREAMINFO
+            data = f.read(length)
+            bits = int.from_bytes(data[10:18], "big")
+            rate = bits >> 44
+            meta["sample_rate"] = rate
+            meta["channels"] = ((bits >> 41) & 0x7) + 1
+            total = bits & 0xFFFFFFFFF
+            if rate and total:
+                meta["duration"] = total / rate
+        elif btype == 4:  # VORBIS_COMMENT
+            _apply_vorbis_comment(f.read(length), meta)
+        else:
+            f.seek(length, os.SEEK_CUR)
+
+
+def _apply_vorbis_comment(data, meta):
+    try:
+        pos = 4 + struct.unpack_from("<I", data, 0)[0]
+        count = struct.unpack_from("<I", data, pos)[0]
+        pos += 4
+        for _ in range(count):
+            n = struct.unpack_from("<I", data, pos)[0]
+            key, _, value = data[pos + 4:pos + 4 + n].decode("utf-8", "replace").partition("=")
+            pos += 4 + n
+            key = key.lower()
+            if key in ("title", "artist", "album") and not meta[key]:
+                meta[key] = value
+    except struct.error:
+        pass  # truncated comment block, keep what we have
+
+
+# ----- Ogg (Vorbis / Opus) -----
+
+def ogg_packets(data, limit=2):
+    """Reassemble the first ``limit`` packets from the Ogg pages in ``data``."""
+    packets, current, pos = [], b"", 0
+    while pos + 27 <= len(data) and len(packets) < limit:
+        if data[pos:pos + 4] != b"OggS":
+            break
+        nsegs = data[pos + 26]
+        table = data[pos + 27:pos + 27 + nsegs]
+        pos += 27 + nsegs
+        for lace in table:
+            current += data[pos:pos + lace]
+            pos += lace
+            if lace < 255:
+                packets.append(current)
+                current = b""
+                if len(packets) >= limit:
+                    break
+    return packets
+
+
+def _probe_ogg(f, size, meta):
+    packets = ogg_packets(f.read(64 * 1024))
+    if not packets:
+        return
+    ident = packets[0]
+    rate = preskip = None
+    if ident[:7] == b"\x01vorbis":
+        meta["format"] = "vorbis"
+        meta["channels"] = ident[11]
+        rate = meta["sample_rate"] = struct.unpack_from("<I", ident, 12)[0]
+        nominal = struct.unpack_from("<i", ident, 20)[0]
+        if nominal > 0:
+            meta["bitrate"] = nominal // 1000
+        if len(packets) > 1 and packets[1][:7] == b"\x03vorbis":
+            _apply_vorbis_comment(packets[1][7:], meta)
+    elif ident[:8] == b"OpusHead":
+        meta["format"] = "opus"
+        meta["channels"] = ident[9]
+        preskip = struct.unpack_from("<H", ident, 10)[0]
+        meta["sample_rate"] = struct.unpack_from("<I", ident, 12)[0]
+        rate = 48000  # Opus granules always count 48 kHz samples
+        if len(packets) > 1 and packets[1][:8] == b"OpusTags":
+            _apply_vorbis_comment(packets[1][8:], meta)
+    granule = _last_granule(f, size)
+    if rate and granule:
+        meta["duration"] = max(0, granule - (preskip or 0)) / rate
+
+
+def _last_granule(f, size):
+    f.seek(max(0, size - OGG_TAIL))
+    tail = f.read()
+    pos = tail.rfind(b"OggS")
+    while pos >= 0:
+        if pos + 14 <= len(tail):
+            granule = struct.unpack_from("<q", tail, pos + 6)[0]
+            if granule > 0:
+                return granule
+        pos = tail.rfind(b"OggS", 0, pos)
+    return None
+
+
+# ----- WAV -----
+
+def _probe_wav(f, meta):
+    meta["format"] = "wav"
+    f.seek(12)
+    byte_rate = None
+    while True:
+        hdr = f.read(8)
+        if len(hdr) < 8:
+            break
+        cid, length = hdr[:4], struct.unpack("<I", hdr[4:])[0]
+        if cid == b"fmt ":
+            data = f.read(length)
+            _, channels, rate, byte_rate = struct.unpack_from("<HHII", data, 0)
+            meta["channels"], meta["sample_rate"] = channels, rate
+            meta["bitrate"] = byte_rate * 8 // 1000
+        elif cid == b"data":
+            if byte_rate:
+                meta["duration"] = length / byte_rate
+            f.seek(length + (length & 1), os.SEEK_CUR)
+        elif cid == b"LIST":
+            _apply_riff_info(f.read(length), meta)
+        else:
+            f.seek(length + (length & 1), os.SEEK_CUR)
+
+
+def _apply_riff_info(data, meta):
+    if data[:4] != b"INFO":
+        return
+    keys = {b"INAM": "title", b"IART": "artist", b"IPRD": "album"}
+    pos = 4
+    while pos + 8 <= len(data):
+        cid, length = data[pos:pos + 4], struct.unpack_from("<I", data, pos + 4)[0]
+        if cid in keys:
+            meta[keys[cid]] = data[pos + 8:pos + 8 + length].rstrip(b"\0").decode("latin-1")
+        pos += 8 + length + (length & 1)
+
+
+# ----- MP3 -----
+
+_MP3_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 25: (11025, 12000, 8000)}
+
+
+def parse_mp3_header(b):
+    """Decode a 4-byte MPEG audio frame header.
+
+    Returns ``(frame_length, samples_per_frame, sample_rate, bitrate_kbps, channels)``
+    or None if ``b`` is not a valid header.
+    """
+    if len(b) < 4 or b[0] != 0xFF or (b[1] & 0xE0) != 0xE0:
+        return None
+    version = {3: 1, 2: 2, 0: 25}.get((b[1] >> 3) & 3)
+    layer = {1: 3, 2: 2, 3: 1}.get((b[1] >> 1) & 3)
+    br_idx, sr_idx = b[2] >> 4, (b[2] >> 2) & 3
+    if version is None or layer is None or br_idx in (0, 15) or sr_idx == 3:
+        return None
+    bitrate = _MP3_BITRATES[(1 if version == 1 else 2, layer)][br_idx]
+    rate = _MP3_RATES[version][sr_idx]
+    padding = (b[2] >> 1) & 1
+    channels = 1 if (b[3] >> 6) == 3 else 2
+    if layer == 1:
+        spf = 384
+        length = (12 * bitrate * 1000 // rate + padding) * 4
+    else:
+        spf = 1152 if (layer == 2 or version == 1) else 576
+        length = spf // 8 * bitrate * 1000 // rate + padding
+    return length, spf, rate, bitrate, channels
+
+
+def id3v2_size(head):
+    """Size of a leading ID3v2 tag (header and footer included), 0 if absent."""
+    if len(head) < 10 or head[:3] != b"ID3":
+        return 0
+    size = _syncsafe(head[6:10]) + 10
+    if head[5] & 0x10:
+        size += 10
+    return size
+
+
+def find_mp3_frame(f, start, limit=256 * 1024):
+    """Offset of the first frame at/after ``start`` whose successor also syncs."""
+    f.seek(start)
+    data = f.read(limit)
+    pos = data.find(b"\xff")
+    while 0 <= pos < len(data) - 4:
+        hdr = parse_mp3_header(data[pos:pos + 4])
+        if hdr:
+            nxt = pos + hdr[0]
+            if nxt + 4 > len(data) or parse_mp3_header(data[nxt:nxt + 4]):
+                return start + pos
+        pos = data.find(b"\xff", pos + 1)
+    return None
+
+
+def _probe_mp3(f, size, meta):
+    head = f.read(10)
+    tag_size = id3v2_size(head)
+    if tag_size:
+        f.seek(0)
+        _apply_id3v2(f.read(tag_size), meta)
+    start = find_mp3_frame(f, tag_size)
+    if start is None:
+        return
+    meta["format"] = "mp3"
+    f.seek(start)
+    frame = f.read(200)
+    length, spf, rate, bitrate, channels = parse_mp3_header(frame)
+    meta["sample_rate"], meta["channels"] = rate, channels
+
+    end = size
+    f.seek(max(0, size - 128))
+    if f.read(3) == b"TAG":
+        end -= 128
+        if not meta["title"]:
+            f.seek(size - 125)
+            v1 = f.read(90)
+            for i, key in enumerate(("title", "artist", "album")):
+                value = v1[i * 30:(i + 1) * 30].rstrip(b"\0 ").decode("latin-1")
+                meta[key] = meta[key] or value or None
+
+    frames = _vbr_frame_count(frame, channels)
+    if frames:
+        meta["duration"] = frames * spf / rate
+    elif bitrate:
+        meta["bitrate"] = bitrate
+        meta["duration"] = (end - start) * 8 / (bitrate * 1000)
+
+
+def _vbr_frame_count(frame, channels):
+    """Frame count from a Xing/Info or VBRI header in the first frame, if any."""
+    mpeg1 = (frame[1] >> 3) & 3 == 3
+    side = (32 if channels == 2 else 17) if mpeg1 else (17 if channels == 2 else 9)
+    pos = 4 + side
+    if frame[pos:pos + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack_from(">I", frame, pos + 4)[0]
+        if flags & 1:
+            return struct.unpack_from(">I", frame, pos + 8)[0]
+    if frame[36:40] == b"VBRI":
+        return struct.unpack_from(">I", frame, 36 + 14)[0]
+    return None
+
+
+def _syncsafe(b):
+    return (b[0] << 21) | (b[1] << 14) | (b[2] << 7) | b[3]
+
+
+_ID3_KEYS = {
+    b"TIT2": "title", b"TPE1": "artist", b"TALB": "album",
+    b"TT2": "title", b"TP1": "artist", b"TAL": "album",
+}
+
+
+def _apply_id3v2(tag, meta):
+    major = tag[3]
+    pos = 10
+    if tag[5] & 0x40 and major >= 3:  # extended header
+        ext = _syncsafe(tag[10:14]) if major == 4 else struct.unpack_from(">I", tag, 10)[0] + 4
+        pos += ext
+    id_len, hdr_len = (3, 6) if major == 2 else (4, 10)
+    while pos + hdr_len <= len(tag):
+        fid = tag[pos:pos + id_len]
+        if not fid.strip(b"\0"):
+            break  # padding
+        raw = tag[pos + id_len:pos + id_len + (3 if major == 2 else 4)]
+        if major == 2:
+            length = int.from_bytes(raw, "big")
+        elif major == 4:
+            length = _syncsafe(raw)
+        else:
+            length = int.from_bytes(raw, "big")
+        body = tag[pos + hdr_len:pos + hdr_len + length]
+        pos += hdr_len + length
+        key = _ID3_KEYS.get(fid)
+        if key and body:
+            meta[key] = _id3_text(body)
+
+
+def _id3_text(body):
+    enc, data = body[0], body[1:]
+    if enc == 1:
+        text = data.decode("utf-16", "replace")
+    elif enc == 2:
+        text = data.decode("utf-16-be", "replace")
+    elif enc == 3:
+        text = data.decode("utf-8", "replace")
+    else:
+        text = data.decode("latin-1")
+    return text.split("\0")[0] or None
+
+
+# ----- MP4 / M4A -----
+
+def _atoms(data, pos=0, end=None):
+    end = len(data) if end is None else end
+    while pos + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", data, pos)
+        hdr = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            hdr = 16
+        elif size == 0:
+            size = end - pos
+        if size < hdr:
+            return
+        yield kind, pos + hdr, min(pos + size, end)
+        pos += size
+
+
+def _find_atom(data, path, pos=0, end=None):
+    for kind, start, stop in _atoms(data, pos, end):
+        if kind == path[0]:
+            if len(path) == 1:
+                return start, stop
+            if kind == b"meta":
+                start += 4  # version + flags precede the children
+            return _find_atom(data, path[1:], start, stop)
+    return None
+
+
+def _probe_mp4(f, size, meta):
+    meta["format"] = "m4a"
+    # walk top-level atoms on disk; only moov is read into memory
+    pos = 0
+    moov = None
+    while pos + 8 <= size:
+        f.seek(pos)
+        hdr = f.read(16)
+        length, kind = struct.unpack_from(">I4s", hdr, 0)
+        if length == 1:
+            length = struct.unpack_from(">Q", hdr, 8)[0]
+        elif length == 0:
+            length = size - pos
+        if length < 8:
+            return
+        if kind == b"moov":
+            f.seek(pos)
+            moov = f.read(length)
+            break
+        pos += length
+    if not moov:
+        return
+
+    mvhd = _find_atom(moov, [b"moov", b"mvhd"])
+    if mvhd:
+        start = mvhd[0]
+        if moov[start] == 1:
+            timescale, duration = struct.unpack_from(">IQ", moov, start + 20)
+        else:
+            timescale, duration = struct.unpack_from(">II", moov, start + 12)
+        if timescale:
+            meta["duration"] = duration / timescale
+
+    stsd = _find_atom(moov, [b"moov", b"trak", b"mdia", b"minf", b"stbl", b"stsd"])
+    if stsd and stsd[1] - stsd[0] >= 8 + 36:
+        entry = stsd[0] + 8
+        meta["channels"] = struct.unpack_from(">H", moov, entry + 24)[0]
+        meta["sample_rate"] = struct.unpack_from(">I", moov, entry + 32)[0] >> 16
+
+    ilst = _find_atom(moov, [b"moov", b"udta", b"meta", b"ilst"])
+    if ilst:
+        keys = {b"\xa9nam": "title", b"\xa9ART": "artist", b"\xa9alb": "album"}
+        for kind, start, stop in _atoms(moov, *ilst):
+            key = keys.get(kind)
+            data = key and _find_atom(moov, [b"data"], start, stop)
+            if data:
+                meta[key] = moov[data[0] + 8:data[1]].decode("utf-8", "replace")
+
+
+# ----- cache & service -----
+
+class MetadataCache:
+    """On-disk metadata cache keyed by path, validated against mtime and size."""
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    @staticmethod
+    def _stamp(path):
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size]
+
+    def get(self, path):
+        """Cached metadata for ``path``, or None if missing or stale."""
+        entry = self._entries.get(path)
+        if not entry:
+            return None
+        try:
+            if entry["stamp"] != self._stamp(path):
+                return None
+        except OSError:
+            return None
+        return entry["meta"]
+
+    def put(self, path, meta):
+        try:
+            stamp = self._stamp(path)
+        except OSError:
+            return
+        with self._lock:
+            self._entries[path] = {"stamp": stamp, "meta": meta}
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self._entries)
+            self._dirty = False
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print("Metadata cache save error:", e)
+
+
+class MetadataService:
+    """Probes tracks on a worker pool and persists the results.
+
+    ``callback(path, meta)`` runs on a worker thread, with the cached entry or
+    a fresh probe; ``meta`` is None when the file could not be read. The
+    cache is written whenever the queue drains.
+    """
+
+    def __init__(self, cache=None, max_workers=2):
+        self.cache = cache if cache is not None else MetadataCache()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="audio-meta")
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def get(self, path):
+        return self.cache.get(path)
+
+    def request(self, paths, callback=None):
+        """Look ``paths`` up in the cache and probe the misses, all on the pool."""
+        paths = list(paths)
+        if paths:
+            self._pool.submit(self._lookup, paths, callback)
+
+    def _lookup(self, paths, callback):
+        # cache hits stat every file, which must not happen on the caller's (UI) thread
+        for path in paths:
+            meta = self.cache.get(path)
+            if meta is not None:
+                if callback:
+                    callback(path, meta)
+                continue
+            with self._lock:
+                if path in self._pending:
+                    continue
+                try:
+                    self._pending[path] = self._pool.submit(self._run, path, callback)
+                except RuntimeError:
+                    return  # shut down while looking up
+
+    def _run(self, path, callback):
+        try:
+            with PROBE_TIME.time():
+                meta = probe(path)
+            self.cache.put(path, meta)
+        except Exception as e:
+            print(f"Metadata probe failed for {path}: {e}")
+            PROBE_FAILURES.inc()
+            meta = None
+        with self._lock:
+            self._pending.pop(path, None)
+            drained = not self._pending
+        if drained:
+            self.cache.save()
+        if callback:
+            callback(path, meta)
+        return meta
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.cache.save()
@@ -0,0 +1,221 @@
+# core/backrooms.py — Backrooms level data: locating, loading and searching (no Kivy)
+import json
+import os
+
+# Filenames it will try automatically
+POSSIBLE_FILENAMES = ("backrooms_data.json", "backrooms_levels.json")
+# Folders of .json shards it will try automatically
+POSSIBLE_DIRNAMES = ("backrooms_data", "backrooms_levels")
+# File to persist the user-selected sources (JSON files or folders), one per line
+PATH_SAVE = "backrooms_json_path.txt"
+# Optional top-level key in a shard: higher numbers win conflicts (default 0)
+PRIORITY_KEY = "_priority"
+# Below this many bytes in total, shards are parsed in-process: a pool would cost more than it saves
+PARALLEL_MIN_BYTES = 512 * 1024
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+
+
+def search_dirs():
+    """Working dir -> project root -> the folder above it -> screens dir."""
+    return [os.getcwd(), _ROOT, os.path.dirname(_ROOT), os.path.join(_ROOT, "screens")]
+
+
+def read_saved_sources():
+    """Saved files/folders in order; None if nothing was ever saved."""
+    if not os.path.exists(PATH_SAVE):
+        return None
+    with open(PATH_SAVE, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def save_sources(paths):
+    with open(PATH_SAVE, "w", encoding="utf-8") as f:
+        f.write("\n".join(os.path.abspath(p) for p in paths))
+
+
+def find_levels_sources():
+    """Saved sources that still exist, else the first file or shard folder found in ``search_dirs()``."""
+    saved = [p for p in (read_saved_sources() or []) if os.path.exists(p)]
+    if saved:
+        return saved
+    for base in search_dirs():
+        for fn in POSSIBLE_FILENAMES:
+            p = os.path.join(base, fn)
+            if os.path.isfile(p):
+                return [os.path.abspath(p)]
+        for dn in POSSIBLE_DIRNAMES:
+            p = os.path.join(base, dn)
+            if os.path.isdir(p):
+                return [os.path.abspath(p)]
+    return []
+
+
+def looked_in():
+    """Human-readable list of where ``find_levels_sources`` looked, for the not-found message."""
+    looked = []
+    saved = read_saved_sources()
+    if saved is not None:
+        looked.extend(f"Saved source: {p}" + ("" if os.path.exists(p) else " (missing)") for p in saved)
+        if not saved:
+            looked.append("Saved source: <empty>")
+    looked.extend(os.path.abspath(p) for p in POSSIBLE_FILENAMES if os.path.exists(p))
+    if not looked:
+        looked = ["Checked working dir, project root, and screens folder for: "
+                  + ", ".join(POSSIBLE_FILENAMES + tuple(d + "/" for d in POSSIBLE_DIRNAMES))]
+    return looked
+
+
+def load_levels_from_file(path):
+    """Level dict keyed by string level number; {} if the file is missing or invalid."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        print("Backrooms JSON load error:", e)
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {str(k): v for k, v in data.items()}
+
+
+# ----- multi-file sources -----
+
+def expand_sources(paths):
+    """Files in load order: each path as given, folders as their .json files sorted by relative path."""
+    files, seen = [], set()
+
+    def add(p):
+        real = os.path.realpath(p)
+        if real not in seen:
+            seen.add(real)
+            files.append(os.path.abspath(p))
+
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                found.extend(os.path.join(dirpath, fn) for fn in filenames
+                             if fn.lower().endswith(".json") and not fn.startswith("."))
+            for p in sorted(found, key=lambda p: os.path.relpath(p, path).lower()):
+                add(p)
+        elif os.path.isfile(path):
+            add(path)
+    return files
+
+
+def parse_shard(path):
+    """``(path, priority, levels, error)`` for one file; runs in pool workers, so no printing."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        return path, 0, {}, str(e)
+    if not isinstance(data, dict):
+        return path, 0, {}, "top level is not an object"
+    priority = data.pop(PRIORITY_KEY, 0)
+    if not isinstance(priority, (int, float)) or isinstance(priority, bool):
+        priority = 0
+    return path, priority, {str(k): v for k, v in data.items()}, None
+
+
+def _item_key(item):
+    try:
+        return json.dumps(item, sort_keys=True)
+    except (TypeError, ValueError):
+        return repr(item)
+
+
+def merge_shards(shards):
+    """Merge parsed shards into one level dict; returns ``(levels, report)``.
+
+    Precedence: higher ``_priority`` wins; on equal priority the later shard
+    (in ``expand_sources`` order) wins. For a level found in several shards:
+
+    * a field only one shard has is kept;
+    * list fields (``tips``, ``entities``, ...) are combined: the earlier
+      items first, then new ones, without duplicates;
+    * any other field that differs takes the winning value and is recorded
+      in ``report["conflicts"]``;
+    * a level identical to one already loaded only counts as a duplicate.
+
+    Entries that are not JSON objects cannot be searched or shown; they are
+    skipped and listed in ``report["errors"]``.
+    """
+    order = sorted(range(len(shards)), key=lambda i: (shards[i][1], i))
+    levels, origin = {}, {}  # origin: level -> field -> path the value came from
+    report = {"files": len(shards), "duplicates": 0, "conflicts": [], "errors": []}
+    for i in order:
+        path, _, shard, error = shards[i]
+        if error:
+            report["errors"].append({"file": path, "error": error})
+            continue
+        for key, entry in shard.items():
+            if not isinstance(entry, dict):
+                report["errors"].append({"file": path, "error": f"level {key} is not an object"})
+                continue
+            old = levels.get(key)
+            if old is None:
+                levels[key] = entry
+                origin[key] = dict.fromkeys(entry, path)
+                continue
+            if old == entry:
+                report["duplicates"] += 1
+                continue
+            merged = dict(old)
+            for field, value in entry.items():
+                current = merged.get(field)
+                if field not in merged:
+                    merged[field] = value
+                    origin[key][field] = path
+                elif isinstance(current, list) and isinstance(value, list):
+                    seen = {_item_key(x) for x in current}
+                    merged[field] = current + [x for x in value if _item_key(x) not in seen]
+                elif current != value:
+                    report["conflicts"].append({"level": key, "field": field, "kept": path,
+                                                "dropped": origin[key].get(field)})
+                    merged[field] = value
+                    origin[key][field] = path
+            levels[key] = merged
+    report["levels"] = len(levels)
+    return levels, report
+
+
+def load_levels_from_sources(paths, executor=None, parallel_min_bytes=PARALLEL_MIN_BYTES):
+    """Expand, parse and merge ``paths``; returns ``(levels, report)`` as ``merge_shards``.
+
+    With an ``executor`` (a process pool), shards are parsed in parallel
+    once there are several of them, they add up to ``parallel_min_bytes``
+    and there is more than one CPU to run them on.
+    """
+    files = expand_sources(paths)
+    total = 0
+    for p in files:
+        try:
+            total += os.path.getsize(p)
+        except OSError:
+            pass
+    if executor is not None and len(files) > 1 and total >= parallel_min_bytes and (os.cpu_count() or 1) > 1:
+        shards = list(executor.map(parse_shard, files))
+    else:
+        shards = [parse_shard(p) for p in files]
+        executor = None
+    levels, report = merge_shards(shards)
+    report["parallel"] = executor is not None
+    return levels, report
+
+
+def find_level(levels, query):
+    """Level for a number or (part of a) nickname; None if nothing matches."""
+    q = query.strip().lower()
+    if not q:
+        return None
+    if q.isdigit() and q in levels:
+        return levels[q]
+    for k, v in levels.items():
+        nick = str(v.get("nickname", "")).lower()
+        if q in nick or q == k:
+            return v
+    return None
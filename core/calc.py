@@ -0,0 +1,321 @@
+# core/calc.py — honest expression engine for the Unhelpful Calculator (no Kivy, no eval)
+"""
+The text is tokenised and then parsed with a Pratt parser into hash-consed
+nodes: identical subexpressions share one node with a unique ``uid``. Parsed
+strings are LRU-cached. Each ``Calculator`` keeps the node values of the
+previous expression, so typing one more digit re-evaluates only the nodes
+that changed, and memory stays bounded by two expressions.
+
+Two number modes:
+
+* ``"decimal"``: ``decimal.Decimal`` rounded to ``precision`` significant
+  digits; fractional powers are allowed.
+* ``"fraction"``: exact ``fractions.Fraction`` arithmetic. Results are shown
+  exactly, plus a decimal approximation.
+
+Supported: ``+ - * / ^``, their keypad forms ``× ÷ −``, unary minus,
+parentheses and ``1.5E+20`` literals. Powers are right-associative and bind tighter than unary minus.
+Nesting depth and the size of exact powers are capped, so huge or hostile
+input fails fast with ``CalcError`` instead of hanging.
+"""
+import decimal
+import re
+from decimal import Decimal
+from fractions import Fraction
+from functools import lru_cache
+
+MODES = ("decimal", "fraction")
+DEFAULT_PRECISION = 28
+MAX_DEPTH = 200             # parenthesis / unary / power nesting
+MAX_RESULT_BITS = 1 << 22   # ~1.26 million decimal digits for exact results
+EXACT_DIGITS = 4000         # longer exact results are shown rounded
+INTERN_LIMIT = 50_000
+
+SYMBOLS = {"×": "*", "÷": "/", "−": "-", "x": "*", ":": "/"}
+BINARY = {"+": 10, "-": 10, "*": 20, "/": 20, "^": 30}
+RIGHT_ASSOC = {"^"}
+PREFIX_BP = 25      # -2^2 == -(2^2), but -2*3 == (-2)*3
+
+# what prank mode answers instead of a result
+FAKE_ERRORS = [
+    "Stnax Error: Unexpected cheese slice.",
+    "Error 404: Answer not found.",
+    "Fatal Error: You tried to divide by cucumber.",
+    "Upgrade to Premium Math to continue.",
+    "Your math privileges have expired.",
+    "Calculator tired. Try again later.",
+    "Illegal equation detected. FBI notified.",
+    "Do you even math, bro?",
+    "Processor overheated by this equation.",
+    "Result classified. Clearance required.",
+    "Unexpected Error: Universe not ready.",
+    "Nah. I’m good.",
+    "LOL. No.",
+    "Math not found. Install Linux?",
+    "Critical math failure. Report to IT.",
+    "Answer lost. Try again in 2042.",
+]
+
+_TOKEN = re.compile(r"\s*(?:((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(\S))")
+
+
+class CalcError(ValueError):
+    pass
+
+
+# ----- tokens and nodes -----
+
+def tokenize(text):
+    tokens = []
+    pos, end = 0, len(text.rstrip())
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        number, sym = m.group(1), m.group(2)
+        if number is not None:
+            tokens.append(("num", number))
+        else:
+            sym = SYMBOLS.get(sym, sym)
+            if sym not in BINARY and sym not in "()":
+                raise CalcError(f"Unexpected character '{sym}'")
+            tokens.append(("op", sym))
+        pos = m.end()
+    return tokens
+
+
+class Node:
+    """An interned AST node; equal subtrees are the same object."""
+
+    __slots__ = ("uid", "op", "value", "left", "right")
+
+    def __init__(self, uid, op, value, left, right):
+        self.uid = uid
+        self.op = op            # "num", "neg" or a binary operator
+        self.value = value      # literal text for "num"
+        self.left = left
+        self.right = right
+
+
+_interned = {}
+_next_uid = 0
+
+
+def _node(op, value=None, left=None, right=None):
+    global _next_uid
+    key = (op, value, left.uid if left else None, right.uid if right else None)
+    node = _interned.get(key)
+    if node is None:
+        if len(_interned) >= INTERN_LIMIT:
+            _interned.clear()
+        _next_uid += 1
+        node = _interned[key] = Node(_next_uid, op, value, left, right)
+    return node
+
+
+# ----- Pratt parser -----
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        tok = self.peek()
+        if tok is None:
+            raise CalcError("Incomplete expression")
+        self.pos += 1
+        return tok
+
+    def expr(self, rbp=0, depth=0):
+        if depth > MAX_DEPTH:
+            raise CalcError("Expression too deeply nested")
+        left = self.prefix(depth)
+        while True:
+            tok = self.peek()
+            if tok is None or tok[1] == ")":
+                return left
+            if tok[0] != "op" or tok[1] not in BINARY:
+                raise CalcError("Missing operator")
+            lbp = BINARY[tok[1]]
+            if lbp <= rbp:
+                return left
+            self.pos += 1
+            next_bp = lbp - 1 if tok[1] in RIGHT_ASSOC else lbp
+            left = _node(tok[1], None, left, self.expr(next_bp, depth + 1))
+
+    def prefix(self, depth):
+        kind, text = self.take()
+        if kind == "num":
+            return _node("num", text)
+        if text == "(":
+            inner = self.expr(0, depth + 1)
+            if self.peek() != ("op", ")"):
+                raise CalcError("Missing ')'")
+            self.pos += 1
+            return inner
+        if text == "-":
+            return _node("neg", None, self.expr(PREFIX_BP, depth + 1))
+        if text == "+":
+            return self.expr(PREFIX_BP, depth + 1)
+        raise CalcError(f"Unexpected '{text}'")
+
+
+@lru_cache(maxsize=512)
+def parse(text):
+    tokens = tokenize(text)
+    if not tokens:
+        raise CalcError("Empty expression")
+    parser = _Parser(tokens)
+    node = parser.expr()
+    if parser.peek() is not None:
+        raise CalcError("Unmatched ')'")
+    return node
+
+
+# ----- evaluation -----
+
+@lru_cache(maxsize=64)
+def _pow10(k):
+    return 10 ** k
+
+
+def _int_from_digits(digits):
+    """int(digits) in sub-quadratic time (int() is quadratic and length-capped)."""
+    if len(digits) <= EXACT_DIGITS:
+        return int(digits)
+    k = len(digits) // 2
+    return _int_from_digits(digits[:-k]) * _pow10(k) + _int_from_digits(digits[-k:])
+
+
+def exact_literal(text):
+    mantissa, _, exp = text.lower().partition("e")
+    if len(exp) > 12:
+        raise CalcError("Exponent too large")
+    whole, _, frac = mantissa.partition(".")
+    n = _int_from_digits((whole + frac).lstrip("0") or "0")
+    if not n:
+        return Fraction(0)
+    shift = (int(exp) if exp else 0) - len(frac)
+    if abs(shift) * 3.33 > MAX_RESULT_BITS:
+        raise CalcError("Result too large")
+    return Fraction(n * _pow10(shift)) if shift >= 0 else Fraction(n, _pow10(-shift))
+
+
+class Calculator:
+    def __init__(self, mode="decimal", precision=DEFAULT_PRECISION):
+        self._memo = {}
+        self.configure(mode, precision)
+
+    def configure(self, mode=None, precision=None):
+        mode = mode or self.mode
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.mode = mode
+        self.precision = max(1, int(precision or self.precision))
+        self.context = decimal.Context(
+            prec=self.precision, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN,
+            traps=[decimal.InvalidOperation, decimal.DivisionByZero, decimal.Overflow])
+        self._memo.clear()
+
+    def value(self, text):
+        """Decimal or Fraction value of ``text``; raises CalcError."""
+        root = parse(text)
+        prev, self._memo = self._memo, {}
+        return self._eval(root, prev)
+
+    def evaluate(self, text):
+        """Formatted result of ``text``; raises CalcError."""
+        return self.format(self.value(text))
+
+    def format(self, value):
+        if isinstance(value, Fraction):
+            num, den = value.numerator, value.denominator
+            exact = max(num.bit_length(), den.bit_length()) <= EXACT_DIGITS * 3.32
+            if den == 1:
+                return str(num) if exact else "≈ " + self._format_decimal(self._rounded(num))
+            approx = self._format_decimal(self.context.divide(self._rounded(num), self._rounded(den)))
+            return f"{num}/{den} ≈ {approx}" if exact else "≈ " + approx
+        return self._format_decimal(self.context.plus(value))
+
+    def _rounded(self, n):
+        """int -> Decimal at the working precision without a full base conversion."""
+        extra = n.bit_length() - (self.precision + 10) * 4
+        if extra <= 0:
+            return Decimal(n)
+        return self.context.multiply(Decimal(n >> extra), self.context.power(Decimal(2), extra))
+
+    def _format_decimal(self, d):
+        d = d.normalize(self.context)
+        if d.is_zero():
+            return "0"
+        if -7 < d.adjusted() < self.precision:
+            return format(d, "f")
+        return str(d)
+
+    def _eval(self, root, prev):
+        # iterative post-order walk: long chains like 1+1+...+1 never hit the recursion limit
+        memo = self._memo
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if node.uid in memo:
+                stack.pop()
+                continue
+            if node.uid in prev:
+                memo[node.uid] = prev[node.uid]
+                stack.pop()
+                continue
+            pending = [c for c in (node.left, node.right) if c is not None and c.uid not in memo]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            memo[node.uid] = self._apply(node, memo)
+        return memo[root.uid]
+
+    def _apply(self, node, memo):
+        op = node.op
+        try:
+            if op == "num":
+                return exact_literal(node.value) if self.mode == "fraction" else Decimal(node.value)
+            a = memo[node.left.uid]
+            if op == "neg":
+                return -a if self.mode == "fraction" else self.context.minus(a)
+            b = memo[node.right.uid]
+            if self.mode == "fraction":
+                return self._fraction_op(op, a, b)
+            ctx = self.context
+            if op == "+":
+                return ctx.add(a, b)
+            if op == "-":
+                return ctx.subtract(a, b)
+            if op == "*":
+                return ctx.multiply(a, b)
+            if op == "/":
+                return ctx.divide(a, b)
+            return ctx.power(a, b)
+        except (decimal.DivisionByZero, ZeroDivisionError):
+            raise CalcError("Division by zero") from None
+        except decimal.Overflow:
+            raise CalcError("Result too large") from None
+        except decimal.InvalidOperation:
+            raise CalcError("Undefined result") from None
+
+    @staticmethod
+    def _fraction_op(op, a, b):
+        if op == "+":
+            return a + b
+        if op == "-":
+            return a - b
+        if op == "*":
+            return a * b
+        if op == "/":
+            return a / b
+        if b.denominator != 1:
+            raise CalcError("Fractional powers need decimal mode")
+        size = max(a.numerator.bit_length(), a.denominator.bit_length())
+        if size > 1 and abs(b.numerator) * size > MAX_RESULT_BITS:
+            raise CalcError("Result too large")
+        return a ** b.numerator
@@ -0,0 +1,150 @@
+# core/calc_batch.py — headless batch evaluation for the calculator engine
+"""
+Evaluate files of expressions line by line, without Kivy.
+
+    python -m core.calc_batch expressions.txt -o results.txt
+    python -m core.calc_batch - --mode prank --seed 7 < expressions.txt
+    python -m core.calc_batch big.txt --number fraction --workers 8 --echo
+
+Input is read lazily in chunks of lines. Chunks run on a process pool with a
+bounded number in flight, and results are written in input order. Memory use
+therefore depends on the window, not on the file size. Blank lines stay blank,
+so line N of the output always belongs to line N of the input.
+
+Prank mode answers every line with one of ``FAKE_ERRORS``. With ``--seed``
+each line draws from its own RNG seeded by ``(seed, line number)``, so the
+output does not depend on worker count or chunk size.
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from core.calc import Calculator, CalcError, DEFAULT_PRECISION, FAKE_ERRORS, MODES
+
+HONEST = "honest"
+PRANK = "prank"
+CHUNK_LINES = 2000
+WINDOW_PER_WORKER = 2
+
+
+def prank_error(seed, index):
+    """The fake error for line ``index`` (0-based); reproducible when ``seed`` is set."""
+    rng = random.Random(f"{seed}:{index}") if seed is not None else random
+    return rng.choice(FAKE_ERRORS)
+
+
+_calculators = {}
+
+
+def _calculator(number, precision):
+    # one engine per process and setting, so its memo carries over between chunks
+    key = (number, precision)
+    calc = _calculators.get(key)
+    if calc is None:
+        calc = _calculators[key] = Calculator(number, precision)
+    return calc
+
+
+def evaluate_chunk(settings, start, lines):
+    """Evaluate ``lines`` (numbered from ``start``) and return one result per line."""
+    mode, number, precision, seed = settings
+    calc = _calculator(number, precision) if mode == HONEST else None
+    out = []
+    for i, line in enumerate(lines, start):
+        expr = line.strip()
+        if not expr:
+            out.append("")
+        elif calc is None:
+            out.append(prank_error(seed, i))
+        else:
+            try:
+                out.append(calc.evaluate(expr))
+            except CalcError as e:
+                out.append(f"Error: {e}")
+    return out
+
+
+def _chunks(lines, size):
+    it = iter(lines)
+    start = 0
+    while True:
+        chunk = [line.rstrip("\r\n") for line in itertools.islice(it, size)]
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def evaluate_stream(lines, mode=HONEST, number="decimal", precision=DEFAULT_PRECISION,
+                    seed=None, workers=None, chunk_size=CHUNK_LINES):
+    """Yield one result string per input line, in input order.
+
+    ``workers=1`` evaluates in this process; otherwise a process pool of
+    ``workers`` (default: CPU count) keeps at most ``2 * workers`` chunks in
+    flight.
+    """
+    if mode not in (HONEST, PRANK):
+        raise ValueError(f"mode must be {HONEST!r} or {PRANK!r}")
+    settings = (mode, number, precision, seed)
+    chunks = _chunks(lines, max(1, chunk_size))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for start, chunk in chunks:
+            yield from evaluate_chunk(settings, start, chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window = deque()
+        for start, chunk in chunks:
+            window.append(pool.submit(evaluate_chunk, settings, start, chunk))
+            if len(window) >= workers * WINDOW_PER_WORKER:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("input", help="expression file, one per line ('-' for stdin)")
+    ap.add_argument("-o", "--output", help="result file (default: stdout)")
+    ap.add_argument("--mode", choices=(HONEST, PRANK), default=HONEST)
+    ap.add_argument("--number", choices=MODES, default="decimal")
+    ap.add_argument("--precision", type=int, default=DEFAULT_PRECISION)
+    ap.add_argument("--seed", type=int, default=None, help="make prank answers reproducible")
+    ap.add_argument("--workers", type=int, default=None, help="processes (1 = no pool)")
+    ap.add_argument("--chunk-size", type=int, default=CHUNK_LINES)
+    ap.add_argument("--echo", action="store_true", help="write 'expression = result'")
+    args = ap.parse_args(argv)
+
+    try:
+        src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+        dst = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    except OSError as e:
+        ap.error(str(e))
+
+    try:
+        lines = src
+        if args.echo:
+            echo, lines = itertools.tee(src)
+        results = evaluate_stream(lines, args.mode, args.number, args.precision,
+                                  args.seed, args.workers, args.chunk_size)
+        if args.echo:
+            for line, result in zip(echo, results):
+                expr = line.strip()
+                dst.write(f"{expr} = {result}\n" if expr else "\n")
+        else:
+            for result in results:
+                dst.write(result + "\n")
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
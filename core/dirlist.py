@@ -0,0 +1,107 @@
+# core/dirlist.py — cached directory listings and per-tool last directories (no Kivy)
+"""
+Directory listings for the file picker.
+
+``DirectoryCache.list(path)`` reads a directory with one ``os.scandir`` pass.
+It uses the dirent type, so regular files are never stat'ed. The result is
+cached against the directory's mtime, which changes whenever an entry is
+added, removed or renamed, so going back to a directory is a single stat.
+
+``last_dir(tool)`` and ``remember_dir(tool, path)`` store the directory each
+tool last used in ``LAST_DIRS_FILE``.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+LAST_DIRS_FILE = "last_dirs.json"
+
+
+class DirectoryCache:
+    def __init__(self, max_dirs=64):
+        self.max_dirs = max_dirs
+        self._entries = OrderedDict()  # path -> (mtime_ns, listing)
+        self._lock = threading.Lock()
+
+    def list(self, path):
+        """``[(name, is_dir)]`` with directories first, each group sorted case-insensitively.
+
+        Raises OSError if ``path`` cannot be read.
+        """
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            hit = self._entries.get(path)
+            if hit is not None and hit[0] == mtime:
+                self._entries.move_to_end(path)
+                return hit[1]
+
+        dirs, files = [], []
+        with os.scandir(path) as it:
+            for e in it:
+                try:
+                    is_dir = e.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(e.name)
+        dirs.sort(key=str.lower)
+        files.sort(key=str.lower)
+        listing = [(n, True) for n in dirs] + [(n, False) for n in files]
+
+        with self._lock:
+            self._entries[path] = (mtime, listing)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_dirs:
+                self._entries.popitem(last=False)
+        return listing
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+
+LISTINGS = DirectoryCache()
+
+
+def matches(name, extensions=(), text=""):
+    """True if a file ``name`` has one of ``extensions`` and contains ``text`` (both case-insensitive)."""
+    low = name.lower()
+    if extensions and not low.endswith(tuple(extensions)):
+        return False
+    return not text or text in low
+
+
+def _load_last_dirs():
+    try:
+        with open(LAST_DIRS_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def last_dir(tool, default="."):
+    """The directory ``tool`` last used, if it still exists; else ``default``."""
+    path = _load_last_dirs().get(tool)
+    if path and os.path.isdir(path):
+        return path
+    return os.path.abspath(default)
+
+
+def remember_dir(tool, path):
+    data = _load_last_dirs()
+    path = os.path.abspath(path)
+    if data.get(tool) == path:
+        return
+    data[tool] = path
+    tmp = LAST_DIRS_FILE + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, LAST_DIRS_FILE)
+    except OSError as e:
+        print("Last directory save error:", e)
@@ -0,0 +1,197 @@
+# core/instance.py — single-instance handoff over a loopback socket (no Kivy)
+"""
+Lets a second launch hand its request to the window that is already open,
+instead of starting another Kivy/SDL/pygame process.
+
+The first instance listens on a loopback TCP port picked by the OS. It
+writes that port and a random token to ``INSTANCE_FILE``, which only the
+current user can read. The file lives in a per-user directory, not the
+working directory, so launches from any folder (a file manager, a shortcut,
+a terminal) find the same running instance.
+
+A later launch works like this:
+
+1. Parse its command line into a request dict with ``parse_args``.
+2. Read the file, connect, and send one JSON line:
+   ``{"token": ..., "request": {...}}``.
+3. Exit as soon as the running instance answers ``ok``.
+
+If nothing answers, because the file is missing, the port is stale, or
+another program holds it, the launch starts normally and becomes the new
+primary.
+
+Loopback TCP behaves the same on Windows, macOS, Linux and Android. The
+token stops other local programs from driving the app.
+
+The server starts before Kivy is imported, so launches made while the first
+window is still loading are not lost. Requests are queued until the app
+calls ``attach``.
+"""
+import argparse
+import json
+import os
+import secrets
+import socket
+import sys
+import threading
+
+
+def _runtime_dir():
+    """Per-user directory for the instance file."""
+    if "ANDROID_PRIVATE" in os.environ:
+        return os.environ["ANDROID_PRIVATE"]
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("XDG_STATE_HOME") \
+            or os.path.expanduser("~/.local/state")
+    return os.path.join(base, "srboli-light")
+
+
+INSTANCE_FILE = os.path.join(_runtime_dir(), "instance.json")
+ENV_SINGLE = "SRBOLI_SINGLE_INSTANCE"
+CONNECT_TIMEOUT = 0.5
+# longest request line accepted before the token is checked
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+def parse_args(argv):
+    """Command line -> ``(request, single_instance)``; paths are made absolute for the receiver."""
+    parser = argparse.ArgumentParser(prog="srboli-light")
+    parser.add_argument("files", nargs="*", help="audio files or folders to open in the Music Player")
+    parser.add_argument("--screen", help="screen to show, e.g. music, backrooms, spin")
+    parser.add_argument("--level", help="open the Backrooms Guide at this level number or nickname")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="start a separate process even if one is already running")
+    args = parser.parse_args(argv)
+    request = {"screen": args.screen, "level": args.level,
+               "files": [os.path.abspath(p) for p in args.files]}
+    single = not args.new_instance and os.environ.get(ENV_SINGLE, "1") != "0"
+    return request, single
+
+
+def forward(request, path=INSTANCE_FILE, timeout=CONNECT_TIMEOUT):
+    """Hand ``request`` to a running instance; True if it accepted it."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            info = json.load(f)
+        port, token = int(info["port"]), str(info["token"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    message = json.dumps({"token": token, "request": request}).encode("utf-8") + b"\n"
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=timeout) as s:
+            s.sendall(message)
+            return s.makefile("rb").readline().strip() == b"ok"
+    except OSError:
+        return False
+
+
+class InstanceServer:
+    """Accepts requests from later launches and passes them to ``attach``'s handler."""
+
+    def __init__(self, path=INSTANCE_FILE):
+        self.path = path
+        self.token = secrets.token_hex(16)
+        self.port = None
+        self._sock = None
+        self._handler = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(8)
+        # wake up now and then so close() never waits on a blocked accept
+        sock.settimeout(1.0)
+        self._sock = sock
+        self.port = sock.getsockname()[1]
+        self._write_info()
+        threading.Thread(target=self._serve, name="instance-server", daemon=True).start()
+        return self
+
+    def _write_info(self):
+        os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+        tmp = self.path + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"port": self.port, "pid": os.getpid(), "token": self.token}, f)
+        os.replace(tmp, self.path)
+
+    def attach(self, handler):
+        """Deliver queued and future requests to ``handler`` (called on the server thread)."""
+        with self._lock:
+            self._handler = handler
+            pending, self._pending = self._pending, []
+        for request in pending:
+            self._deliver(handler, request)
+
+    def _serve(self):
+        while not self._closed:
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            try:
+                with conn:
+                    request = self._receive(conn)
+            except Exception as e:
+                # one bad client must never stop the server
+                print("Launch request rejected:", e)
+                continue
+            if request is None:
+                continue
+            with self._lock:
+                handler = self._handler
+                if handler is None:
+                    self._pending.append(request)
+            if handler is not None:
+                self._deliver(handler, request)
+
+    def _receive(self, conn):
+        try:
+            conn.settimeout(2.0)
+            line = conn.makefile("rb").readline(MAX_REQUEST_BYTES + 1)
+            try:
+                message = json.loads(line) if 0 < len(line) <= MAX_REQUEST_BYTES else None
+            except (ValueError, RecursionError):   # RecursionError: deeply nested JSON
+                message = None
+            ok = isinstance(message, dict) and isinstance(message.get("request"), dict)
+            if ok:
+                # compare bytes: compare_digest raises TypeError on non-ASCII str
+                token = str(message.get("token", "")).encode("utf-8", "surrogatepass")
+                ok = secrets.compare_digest(token, self.token.encode("ascii"))
+            # answer before handling so the other launch can exit right away
+            conn.sendall(b"ok\n" if ok else b"denied\n")
+        except OSError:
+            return None
+        return message["request"] if ok else None
+
+    @staticmethod
+    def _deliver(handler, request):
+        try:
+            handler(request)
+        except Exception as e:
+            print("Launch request failed:", e)
+
+    def close(self):
+        self._closed = True
+        if self._sock is not None:
+            self._sock.close()
+        # leave the file alone if a newer instance has taken over
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                ours = json.load(f).get("token") == self.token
+        except (OSError, ValueError):
+            return
+        if ours:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
@@ -0,0 +1,176 @@
+# core/items.py — compact named, weighted item collection (no Kivy)
+"""
+The roster type behind the Wheel of Names and the Randomizer lists.
+
+``ItemCollection`` is a sequence of names. It keeps:
+
+* the names, interned, in a plain list;
+* the weights in an ``array('d')``;
+* a name -> first-index map, built on first lookup, so ``index`` and ``in``
+  are O(1) afterwards and rosters that are never searched do not pay for it;
+* a ``version`` counter that every mutation bumps. Renderers and samplers
+  compare it with the version they last saw to decide whether to rebuild.
+
+Because it is a ``Sequence`` of names, ``random.choice`` and ``random.sample``
+work on it directly. ``pick`` does weighted sampling with cumulative weights
+that are cached per version, so repeated picks are O(log n).
+"""
+import random
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import accumulate
+
+
+def _pairs(items):
+    for it in items:
+        if isinstance(it, str):
+            yield it, 1.0
+        elif isinstance(it, dict):
+            yield it["name"], it.get("weight", 1.0)
+        else:
+            yield it[0], it[1]
+
+
+class ItemCollection(Sequence):
+    """Names with weights; accepts names, ``(name, weight)`` pairs or ``{"name", "weight"}`` dicts."""
+
+    __slots__ = ("names", "weights", "version", "_index", "_cumulative")
+
+    def __init__(self, items=()):
+        self.names = []
+        self.weights = array("d")
+        self.version = 0
+        self._index = None        # name -> first position, built lazily
+        self._cumulative = None   # (version, cumulative weights)
+        self.add_many(items, unique=False)
+
+    # ----- sequence -----
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        return self.names[i]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self._lookup()
+
+    def __delitem__(self, i):
+        self.remove_at(i)
+
+    def index(self, name, *args):
+        """Position of the first item called ``name``; raises ValueError like ``list.index``."""
+        i = self._lookup().get(name)
+        if i is None or args:
+            if i is None:
+                raise ValueError(f"{name!r} is not in collection")
+            return self.names.index(name, *args)
+        return i
+
+    def __repr__(self):
+        return f"ItemCollection({len(self)} items, version {self.version})"
+
+    # ----- mutation -----
+    def add(self, name, weight=1.0, unique=False):
+        """Append one item; with ``unique`` an existing name is skipped. True if added."""
+        name = sys.intern(str(name))
+        index = self._lookup() if unique else self._index
+        if unique and name in index:
+            return False
+        if index is not None:
+            index.setdefault(name, len(self.names))
+        self.names.append(name)
+        self.weights.append(max(0.0, float(weight)))
+        self.version += 1
+        return True
+
+    def add_many(self, items, unique=True):
+        """Append many items with a single version bump; returns how many were added."""
+        names, weights = self.names, self.weights
+        index = self._lookup() if unique else self._index
+        added = 0
+        for name, weight in _pairs(items):
+            name = sys.intern(str(name))
+            if index is not None:
+                if unique and name in index:
+                    continue
+                index.setdefault(name, len(names))
+            names.append(name)
+            weights.append(max(0.0, float(weight)))
+            added += 1
+        if added:
+            self.version += 1
+        return added
+
+    def remove_at(self, i):
+        if i < 0:
+            i += len(self.names)
+        name = self.names.pop(i)
+        del self.weights[i]
+        # positions after i shift down by one; the map is rebuilt on the next lookup
+        self._index = None
+        self.version += 1
+        return name
+
+    def clear(self):
+        self.names = []
+        self.weights = array("d")
+        self._index = None
+        self.version += 1
+
+    def _lookup(self):
+        index = self._index
+        if index is None:
+            index = {}
+            for i, name in enumerate(self.names):
+                index.setdefault(name, i)
+            self._index = index
+        return index
+
+    # ----- bulk views -----
+    def name(self, i):
+        return self.names[i]
+
+    def weight(self, i):
+        return self.weights[i]
+
+    def pairs(self):
+        return list(zip(self.names, self.weights))
+
+    def snapshot(self):
+        """Independent copy; cheap because names are shared and weights are copied in bulk."""
+        copy = ItemCollection()
+        copy.names = list(self.names)
+        copy.weights = array("d", self.weights)
+        copy._index = None if self._index is None else dict(self._index)
+        copy.version = self.version
+        return copy
+
+    def _cumulative_weights(self):
+        cached = self._cumulative
+        if cached is None or cached[0] != self.version:
+            cached = self._cumulative = (self.version, array("d", accumulate(self.weights)))
+        return cached[1]
+
+    def pick_index(self, rng=random):
+        """Weighted random index (uniform if every weight is zero); None when empty."""
+        n = len(self.names)
+        if not n:
+            return None
+        cum = self._cumulative_weights()
+        total = cum[-1]
+        if total <= 0:
+            return rng.randrange(n)
+        i = bisect_right(cum, rng.random() * total)
+        if i >= n:
+            # float rounding: land on the last item that can actually win
+            i = max(j for j in range(n) if self.weights[j] > 0)
+        return i
+
+    def pick(self, rng=random):
+        i = self.pick_index(rng)
+        return None if i is None else self.names[i]
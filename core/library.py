@@ -0,0 +1,113 @@
+# core/library.py — music folder scanning and persistent library index (no Kivy)
+"""
+Walks music folders with ``os.scandir`` and remembers every directory's
+mtime, audio files and subdirectories in ``music_library.json``. A rescan
+only lists directories whose mtime changed; unchanged ones are served from
+the index (their subdirectories are still stat'ed, since a change deep in
+the tree does not touch the parent's mtime).
+"""
+import json
+import os
+import threading
+
+AUDIO_EXTS = (".mp3", ".wav", ".ogg", ".flac", ".m4a")
+LIBRARY_FILE = "music_library.json"
+# how many paths to collect before handing a batch to the progress callback
+BATCH_SIZE = 2000
+
+
+class LibraryIndex:
+    def __init__(self, path=LIBRARY_FILE):
+        self.path = path
+        self.roots = []
+        self.dirs = {}   # dirpath -> {"mtime": ns, "files": [...], "subdirs": [...]}
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.roots = list(data.get("roots", []))
+            self.dirs = dict(data.get("dirs", {}))
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"roots": self.roots, "dirs": self.dirs}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print("Library index save error:", e)
+
+    def scan(self, root, exts=AUDIO_EXTS, progress=None, cancel=None):
+        """Scan ``root`` recursively and return ``(paths, stats)``.
+
+        ``progress(batch)`` is called with lists of new paths as they are
+        found; ``cancel`` is an optional ``threading.Event``. The index is
+        saved when the scan completes.
+        """
+        root = os.path.abspath(root)
+        with self._lock:
+            if root not in self.roots:
+                self.roots.append(root)
+            paths, batch = [], []
+            stats = {"dirs": 0, "rescanned": 0, "files": 0}
+            seen = set()
+            stack = [root]
+            while stack:
+                if cancel is not None and cancel.is_set():
+                    return paths, stats
+                d = stack.pop()
+                seen.add(d)
+                entry = self._scan_dir(d, exts, stats)
+                if entry is None:
+                    continue
+                stats["dirs"] += 1
+                for name in entry["files"]:
+                    batch.append(os.path.join(d, name))
+                stack.extend(os.path.join(d, s) for s in reversed(entry["subdirs"]))
+                if len(batch) >= BATCH_SIZE:
+                    paths.extend(batch)
+                    if progress:
+                        progress(batch)
+                    batch = []
+            paths.extend(batch)
+            if progress and batch:
+                progress(batch)
+            stats["files"] = len(paths)
+
+            # forget directories under this root that no longer exist
+            prefix = root + os.sep
+            for d in [d for d in self.dirs if (d == root or d.startswith(prefix)) and d not in seen]:
+                del self.dirs[d]
+            self.save()
+            return paths, stats
+
+    def _scan_dir(self, d, exts, stats):
+        try:
+            mtime = os.stat(d).st_mtime_ns
+        except OSError:
+            self.dirs.pop(d, None)
+            return None
+        cached = self.dirs.get(d)
+        if cached and cached["mtime"] == mtime:
+            return cached
+        files, subdirs = [], []
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            subdirs.append(e.name)
+                        elif e.name.lower().endswith(exts) and e.is_file():
+                            files.append(e.name)
+                    except OSError:
+                        continue
+        except OSError:
+            self.dirs.pop(d, None)
+            return None
+        files.sort(key=str.lower)
+        subdirs.sort(key=str.lower)
+        entry = self.dirs[d] = {"mtime": mtime, "files": files, "subdirs": subdirs}
+        stats["rescanned"] += 1
+        return entry
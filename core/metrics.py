@@ -0,0 +1,321 @@
+# core/metrics.py — in-process counters, gauges and latency histograms (no Kivy)
+"""
+A small metrics registry that is cheap enough to leave on in production.
+
+Each screen creates its metrics once at import time and then records into
+them:
+
+    LOAD_TIME = metrics.histogram("backrooms.load_seconds", "Level JSON load time")
+    with LOAD_TIME.time():
+        ...
+
+Every observation is a few attribute updates and one list increment, with no
+locks and no allocation. The catch is that two threads updating the same
+metric at once can very rarely lose an update, which is acceptable for
+telemetry.
+
+Histograms use HDR-style log-linear buckets. Each power of two is split into
+``SUB_BUCKETS`` linear sub-buckets, which gives percentiles within about 6%
+from nanoseconds to hours (or from one item to billions).
+
+``start_export`` writes snapshots to a rotating JSON-lines file. When given
+a port, it also serves ``/metrics`` in Prometheus text format on localhost.
+"""
+import json
+import logging
+import math
+import threading
+import time
+
+METRICS_FILE = "metrics.jsonl"
+PREFIX = "srboli"
+
+SUB_BUCKETS = 8
+MIN_EXP = -24          # 2**-25 s ~ 30 ns is the smallest non-zero bucket
+MAX_EXP = 40
+_N_BUCKETS = (MAX_EXP - MIN_EXP) * SUB_BUCKETS
+
+_frexp = math.frexp
+_perf = time.perf_counter
+
+
+class Counter:
+    __slots__ = ("name", "help", "value")
+    kind = "counter"
+
+    def __init__(self, name, help=""):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, n=1):
+        self.value += n
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    __slots__ = ("name", "help", "value")
+    kind = "gauge"
+
+    def __init__(self, name, help=""):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def set(self, v):
+        self.value = v
+
+    def inc(self, n=1):
+        self.value += n
+
+    def dec(self, n=1):
+        self.value -= n
+
+    def snapshot(self):
+        return self.value
+
+
+class _Timer:
+    __slots__ = ("hist", "start")
+
+    def __init__(self, hist):
+        self.hist = hist
+
+    def __enter__(self):
+        self.start = _perf()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(_perf() - self.start)
+        return False
+
+
+class Histogram:
+    """Log-linear histogram; ``observe`` takes any non-negative number."""
+
+    __slots__ = ("name", "help", "counts", "count", "sum", "max")
+    kind = "histogram"
+
+    def __init__(self, name, help=""):
+        self.name = name
+        self.help = help
+        self.counts = [0] * (_N_BUCKETS + 1)   # the extra slot holds zeros
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, v):
+        self.count += 1
+        self.sum += v
+        if v > self.max:
+            self.max = v
+        if v <= 0:
+            self.counts[_N_BUCKETS] += 1
+            return
+        m, e = _frexp(v)
+        i = (e - MIN_EXP) * SUB_BUCKETS + int((m - 0.5) * (2 * SUB_BUCKETS))
+        if i < 0:
+            i = 0
+        elif i >= _N_BUCKETS:
+            i = _N_BUCKETS - 1
+        self.counts[i] += 1
+
+    def time(self):
+        """Context manager that observes the elapsed seconds."""
+        return _Timer(self)
+
+    @staticmethod
+    def bucket_bound(i):
+        """Upper bound of bucket ``i``."""
+        e, sub = divmod(i, SUB_BUCKETS)
+        return math.ldexp(0.5 + (sub + 1) / (2 * SUB_BUCKETS), e + MIN_EXP)
+
+    def buckets(self):
+        """``(upper_bound, count)`` for non-empty buckets in ascending order, zeros first."""
+        counts = list(self.counts)
+        out = [(0.0, counts[_N_BUCKETS])] if counts[_N_BUCKETS] else []
+        out.extend((self.bucket_bound(i), c) for i, c in enumerate(counts[:_N_BUCKETS]) if c)
+        return out
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q / 100.0 * self.count
+        seen = 0
+        for bound, c in self.buckets():
+            seen += c
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class Registry:
+    def __init__(self, prefix=PREFIX):
+        self.prefix = prefix
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help):
+        m = self._metrics.get(name)
+        if m is None:
+            with self._lock:
+                m = self._metrics.setdefault(name, cls(name, help))
+        if not isinstance(m, cls):
+            raise ValueError(f"metric {name!r} is already a {m.kind}")
+        return m
+
+    def counter(self, name, help=""):
+        return self._get(Counter, name, help)
+
+    def gauge(self, name, help=""):
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name, help=""):
+        return self._get(Histogram, name, help)
+
+    def metrics(self):
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda m: m.name)
+
+    def snapshot(self):
+        out = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "counters": {}, "gauges": {}, "histograms": {}}
+        for m in self.metrics():
+            out[m.kind + "s"][m.name] = m.snapshot()
+        return out
+
+    def _prom_name(self, name):
+        safe = "".join(c if c.isalnum() else "_" for c in name)
+        return f"{self.prefix}_{safe}" if self.prefix else safe
+
+    def prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for m in self.metrics():
+            name = self._prom_name(m.name)
+            if m.kind == "counter" and not name.endswith("_total"):
+                # the sample and its HELP/TYPE lines must share one name, as prometheus_client does
+                name += "_total"
+            if m.help:
+                lines.append(f"# HELP {name} {m.help}")
+            lines.append(f"# TYPE {name} {m.kind}")
+            if m.kind in ("counter", "gauge"):
+                lines.append(f"{name} {m.value}")
+            else:
+                cumulative = 0
+                for bound, c in m.buckets():
+                    cumulative += c
+                    lines.append(f'{name}_bucket{{le="{bound:.6g}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{le="+Inf"}} {m.count}')
+                lines.append(f"{name}_sum {m.sum}")
+                lines.append(f"{name}_count {m.count}")
+        return "\n".join(lines) + "\n"
+
+
+class FileExporter:
+    """Appends a registry snapshot as one JSON line every ``interval`` seconds."""
+
+    def __init__(self, registry, path=METRICS_FILE, interval=60.0, max_bytes=1 << 20, backups=3):
+        # imported here, like http.server below: every module importing metrics pays for the top level
+        from logging.handlers import RotatingFileHandler
+        self.registry = registry
+        self.interval = interval
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                            encoding="utf-8", delay=True)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="metrics-export", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        line = json.dumps(self.registry.snapshot(), separators=(",", ":"))
+        self._handler.handle(logging.makeLogRecord({"msg": line}))
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self.write()
+        self._handler.close()
+
+
+class MetricsServer:
+    """Serves ``GET /metrics`` in Prometheus text format; bound to localhost by default."""
+
+    def __init__(self, registry, port, host="127.0.0.1"):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry_ = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry_.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *a):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+_exporters = []
+
+
+def start_export(path=METRICS_FILE, interval=60.0, port=None, registry=REGISTRY):
+    """Start the file exporter and, if ``port`` is given, the localhost endpoint."""
+    started = [FileExporter(registry, path, interval).start()]
+    if port is not None:
+        try:
+            started.append(MetricsServer(registry, port).start())
+        except OSError as e:
+            print(f"Metrics endpoint on port {port} failed: {e}")
+    _exporters.extend(started)
+    return started
+
+
+def stop_export():
+    """Stop all exporters; the file exporter writes one last snapshot."""
+    while _exporters:
+        _exporters.pop().stop()
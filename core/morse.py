@@ -0,0 +1,22 @@
+# core/morse.py — Morse code tables and conversion (no Kivy)
+MORSE = {
+ 'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.',
+ 'G': '--.', 'H': '....', 'I': '..', 'J': '.---','K': '-.-', 'L': '.-..',
+ 'M': '--', 'N': '-.', 'O': '---', 'P': '.--.', 'Q': '--.-', 'R': '.-.',
+ 'S': '...', 'T': '-', 'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-',
+ 'Y': '-.--', 'Z': '--..', '0': '-----','1': '.----','2': '..---',
+ '3': '...--','4': '....-','5': '.....','6': '-....','7': '--...',
+ '8': '---..','9': '----.',' ': '/'
+}
+REVERSE = {v:k for k,v in MORSE.items()}
+
+
+def text_to_morse(text):
+    """Letters, digits and spaces to Morse; anything else becomes '?'."""
+    return ' '.join(MORSE.get(ch, '?') for ch in text.upper())
+
+
+def morse_to_text(code):
+    """Morse with ' / ' between words back to text; unknown codes become '?'."""
+    words = code.strip().split(' / ')
+    return ' '.join(''.join(REVERSE.get(c, '?') for c in w.split()) for w in words)
@@ -0,0 +1,225 @@
+# core/playback.py — gapless playback on top of pygame.mixer.music (no Kivy)
+"""
+``PlaybackEngine`` wraps ``pygame.mixer.music`` so the next track is read
+ahead on a worker thread and handed to ``music.queue``. SDL_mixer then
+switches tracks on the audio thread the instant the current one ends, with
+no silence and no file I/O on the UI thread.
+
+The engine reports transitions through ``poll()``. It listens for pygame's
+end event, but pygame only posts it when its own video system is
+initialised, which is not the case under Kivy. There a queued-track switch
+is detected from ``get_pos()``, which restarts from zero when the queued
+track starts: either it went backwards since the last poll, or it is well
+behind the wall-clock time since the current track started. The second
+check catches a switch even when ``poll`` was not called near the end of
+the outgoing track.
+"""
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# files up to this size are read into memory ahead of time; larger ones are
+# queued by path and streamed from disk by SDL_mixer
+PRELOAD_LIMIT = 64 * 1024 * 1024
+ADVANCED = "advanced"
+FINISHED = "finished"
+# pygame.USEREVENT + 7; a literal so the module does not need pygame at import
+END_EVENT = 0x8000 + 7
+# get_pos() this far behind the wall clock means the queued track has started
+SWITCH_SLACK_MS = 500
+
+
+def _music():
+    # pygame is imported and the audio device opened on first use, not at startup
+    import pygame
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    return pygame.mixer.music
+
+
+def _end_events():
+    """Number of pending end events, or None when pygame's event queue is unusable."""
+    try:
+        import pygame
+        return len(pygame.event.get(END_EVENT))
+    except Exception:
+        return None
+
+
+class PlaybackEngine:
+    def __init__(self):
+        self.current = None      # path of the track SDL_mixer is playing
+        self.queued = None       # path handed to music.queue, if any
+        self._last_pos = 0
+        self._started_at = time.monotonic()   # when get_pos() last counted from zero
+        self._buffers = {}       # path -> bytes read ahead (at most the next track)
+        self._sources = []       # keep BytesIO objects alive while SDL reads them
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preload")
+        self._end_event = False
+
+    def _arm_end_event(self):
+        if self._end_event:
+            return
+        try:
+            _music().set_endevent(END_EVENT)
+            self._end_event = _end_events() is not None
+        except Exception:
+            self._end_event = False
+
+    def _source(self, path):
+        with self._lock:
+            data = self._buffers.pop(path, None)
+        if data is None:
+            return path, None
+        return io.BytesIO(data), os.path.splitext(path)[1].lstrip(".")
+
+    def _load_args(self, path):
+        src, hint = self._source(path)
+        if hint is None:
+            return (src,)
+        self._sources = self._sources[-1:] + [src]
+        return (src, hint)
+
+    def play(self, path, start=0.0):
+        """Load ``path`` and start it at ``start`` seconds. Raises on pygame errors."""
+        music = _music()
+        self._arm_end_event()
+        music.load(*self._load_args(path))
+        self._drain_end_events()
+        if start:
+            music.play(start=start)
+        else:
+            music.play()
+        self.current = path
+        self.queued = None
+        self._mark_start()
+
+    def play_source(self, path, fileobj, namehint):
+        """Play ``path`` from an already-positioned file object (see core.seek_index)."""
+        music = _music()
+        music.load(fileobj, namehint)
+        self._sources = self._sources[-1:] + [fileobj]
+        self._drain_end_events()
+        music.play()
+        self.current = path
+        self.queued = None
+        self._mark_start()
+
+    def restart_at(self, start):
+        """Restart the loaded track from ``start`` seconds (stop() drops the queue)."""
+        music = _music()
+        music.stop()
+        self._drain_end_events()
+        music.play(start=start)
+        self.queued = None
+        self._mark_start()
+
+    def _mark_start(self, pos=0):
+        self._last_pos = pos
+        self._started_at = time.monotonic() - pos / 1000.0
+
+    def stop(self):
+        try:
+            _music().stop()
+        except Exception:
+            pass
+        self._drain_end_events()
+        self.queued = None
+
+    def _drain_end_events(self):
+        # stop()/load() post an end event too; drop it so poll() does not misread it
+        if self._end_event:
+            _end_events()
+
+    def preload(self, path, on_ready=None):
+        """Read ``path`` ahead on the worker; ``on_ready(path)`` runs on the worker."""
+        def work():
+            try:
+                if os.path.getsize(path) <= PRELOAD_LIMIT:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    with self._lock:
+                        self._buffers = {path: data}
+            except OSError:
+                pass
+            if on_ready:
+                on_ready(path)
+        self._pool.submit(work)
+
+    def queue(self, path):
+        """Queue ``path`` to start right after the current track. Returns success."""
+        try:
+            _music().queue(*self._load_args(path))
+        except Exception as e:
+            print(f"Queue failed for {path}: {e}")
+            self.queued = None
+            return False
+        self.queued = path
+        return True
+
+    def poll(self):
+        """Return ADVANCED when the queued track took over, FINISHED when playback ended."""
+        if self._end_event:
+            ended = _end_events()
+            if ended:
+                if self.queued:
+                    self.current, self.queued = self.queued, None
+                    self._mark_start()
+                    return ADVANCED
+                self.current = None
+                return FINISHED
+            if ended is not None:
+                return None
+        try:
+            music = _music()
+            busy = music.get_busy()
+            pos = music.get_pos()
+        except Exception:
+            return FINISHED
+        if not busy:
+            if self.current is None:
+                return None
+            self.current = self.queued = None
+            return FINISHED
+        played = (time.monotonic() - self._started_at) * 1000
+        if self.queued and 0 <= pos and (pos < self._last_pos or pos + SWITCH_SLACK_MS < played):
+            self.current, self.queued = self.queued, None
+            self._mark_start(pos)
+            return ADVANCED
+        self._last_pos = pos
+        return None
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class PlaybackClock:
+    """Track position from a monotonic clock anchored at play/seek.
+
+    Cheaper and steadier than asking the mixer on every tick, and it keeps
+    counting correctly across ``play(start=...)`` where ``get_pos()`` restarts.
+    """
+
+    def __init__(self):
+        self._anchor_pos = 0.0
+        self._anchor_time = None
+
+    @property
+    def running(self):
+        return self._anchor_time is not None
+
+    def anchor(self, position=0.0):
+        self._anchor_pos = float(position)
+        self._anchor_time = time.monotonic()
+
+    def stop(self):
+        self._anchor_pos = self.position()
+        self._anchor_time = None
+
+    def position(self):
+        if self._anchor_time is None:
+            return self._anchor_pos
+        return self._anchor_pos + (time.monotonic() - self._anchor_time)
@@ -0,0 +1,129 @@
+# core/playlist.py — indexed playlist model for the Music Player (no Kivy)
+"""
+``PlaylistStore`` keeps tracks in an ordered dict keyed by path, so adding,
+deduplicating and looking up a track are O(1) even for libraries with tens of
+thousands of entries. It still behaves like the old list where the screen
+needs it (``len``, ``store[i]``, ``path in store``).
+"""
+import os
+from collections import OrderedDict
+
+SORT_KEYS = ("added", "name", "title", "artist", "album", "duration")
+
+
+def track_label(entry):
+    """Display text for a playlist row."""
+    title = entry.get("title")
+    if title:
+        artist = entry.get("artist")
+        return f"{artist} - {title}" if artist else title
+    return entry["name"]
+
+
+class PlaylistStore:
+    def __init__(self, paths=()):
+        self._entries = OrderedDict()
+        self._paths = None          # cached list(self._entries), rebuilt after removals
+        self._positions = None      # cached path -> index
+        self._view_cache = None
+        self.version = 0
+        self.add(paths)
+
+    # ----- list-like access -----
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __contains__(self, path):
+        return path in self._entries
+
+    def __getitem__(self, index):
+        return self._path_list()[index]
+
+    def _path_list(self):
+        if self._paths is None:
+            self._paths = list(self._entries)
+        return self._paths
+
+    def index(self, path):
+        if self._positions is None:
+            self._positions = {p: i for i, p in enumerate(self._path_list())}
+        return self._positions[path]
+
+    def entry(self, path):
+        return self._entries[path]
+
+    # ----- mutation -----
+    def add(self, paths):
+        """Append new paths, skipping ones already present. Returns the added paths."""
+        added = []
+        for p in paths:
+            if p in self._entries:
+                continue
+            self._entries[p] = {"path": p, "name": os.path.basename(p)}
+            if self._paths is not None:
+                self._paths.append(p)
+            if self._positions is not None:
+                self._positions[p] = len(self._entries) - 1
+            added.append(p)
+        if added:
+            self._changed()
+        return added
+
+    def remove(self, path):
+        if self._entries.pop(path, None) is not None:
+            self._paths = self._positions = None
+            self._changed()
+
+    def clear(self):
+        self._entries.clear()
+        self._paths = self._positions = None
+        self._changed()
+
+    def update_meta(self, path, meta):
+        entry = self._entries.get(path)
+        if entry is None or not meta:
+            return False
+        entry.update((k, v) for k, v in meta.items() if v is not None)
+        entry.pop("_search", None)
+        self._changed()
+        return True
+
+    def _changed(self):
+        self.version += 1
+        self._view_cache = None
+
+    # ----- filtered / sorted views -----
+    def view(self, query="", sort_key="added", reverse=False):
+        """Paths matching ``query`` (case-insensitive, name and tags), sorted by ``sort_key``."""
+        key = (query, sort_key, reverse)
+        if self._view_cache and self._view_cache[0] == key:
+            return self._view_cache[1]
+        q = query.strip().lower()
+        if q:
+            paths = [p for p, e in self._entries.items() if q in _search_text(e)]
+        else:
+            paths = list(self._path_list())
+        if sort_key and sort_key != "added":
+            paths.sort(key=lambda p: _sort_value(self._entries[p], sort_key))
+        if reverse:
+            paths.reverse()
+        self._view_cache = (key, paths)
+        return paths
+
+
+def _search_text(entry):
+    text = entry.get("_search")
+    if text is None:
+        parts = (entry["name"], entry.get("title"), entry.get("artist"), entry.get("album"))
+        text = entry["_search"] = " ".join(x for x in parts if x).lower()
+    return text
+
+
+def _sort_value(entry, sort_key):
+    if sort_key == "duration":
+        return (entry.get("duration") is None, entry.get("duration") or 0.0)
+    value = entry.get(sort_key) if sort_key != "name" else entry["name"]
+    return (value is None, (value or "").lower())
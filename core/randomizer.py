@@ -0,0 +1,110 @@
+# core/randomizer.py — Randomizer Tools logic (no Kivy)
+"""
+Pure functions behind UtilityToolsScreen: random numbers, passwords, list and
+weighted picks, byte-size conversion and the plain-text list format used by
+the import buttons. Every random helper takes an ``rng`` so callers can seed
+it; passwords default to the OS CSPRNG.
+"""
+import random
+import string
+
+from core.spin import pick_index
+
+SIMPLE_WORDS = [
+    "sun", "moon", "tree", "sky", "water", "fire", "earth", "wind", "rock", "star",
+    "cat", "dog", "bird", "fish", "car", "bike", "home", "code", "game", "play",
+    "love", "hope", "dream", "goal", "life", "light", "dark", "blue", "red", "fun",
+    "cool", "fast", "slow", "big", "small", "new", "old", "hot", "cold", "good"
+]
+
+DEFAULT_SYMBOLS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+
+_system_rng = random.SystemRandom()
+
+
+def random_number(lo, hi, rng=random):
+    if lo > hi:
+        lo, hi = hi, lo
+    return rng.randint(lo, hi)
+
+
+def generate_password(length=12, letters=True, numbers=True, symbols=True,
+                      words=False, simple=False, word_list=SIMPLE_WORDS, rng=None):
+    """Password of ``length`` (clamped to 4..200) from the selected character classes."""
+    rng = rng or _system_rng
+    length = max(4, min(length, 200))
+
+    charset = ""
+    if letters:
+        charset += string.ascii_letters
+    if numbers:
+        charset += string.digits
+    if symbols:
+        charset += DEFAULT_SYMBOLS
+    charset = charset or string.ascii_letters
+
+    parts = []
+    if words and word_list:
+        word_count = 2 if simple else 1
+        word_count = min(word_count, max(1, length // 6))
+        parts.extend(rng.choice(word_list) for _ in range(word_count))
+
+    size = sum(len(p) for p in parts)
+    parts.extend(rng.choice(charset) for _ in range(max(0, length - size)))
+    rng.shuffle(parts)
+    return "".join(parts)[:length]
+
+
+def pick_items(items, count=1, rng=random):
+    """``count`` distinct items (clamped to the list size), joined with ', '."""
+    if not items:
+        return None
+    count = max(1, min(count, len(items)))
+    if count == 1:
+        return rng.choice(items)
+    return ", ".join(rng.sample(items, count))
+
+
+def parse_weighted(lines):
+    """``name`` / ``name:weight`` lines to ``[(name, weight)]``; bad or missing weights are 1."""
+    parsed = []
+    for ln in lines:
+        ln = ln.strip()
+        if not ln:
+            continue
+        name, sep, w = ln.partition(":")
+        weight = 1.0
+        if sep:
+            try:
+                weight = float(w.strip())
+            except ValueError:
+                pass
+        if name.strip():
+            parsed.append((name.strip(), max(0.0, weight)))
+    return parsed
+
+
+def weighted_pick(parsed, rng=random):
+    if not parsed:
+        return None
+    return parsed[pick_index([w for _, w in parsed], rng)][0]
+
+
+def convert_size(size):
+    kb = size / 1024
+    mb = kb / 1024
+    gb = mb / 1024
+    tb = gb / 1024
+    return (
+        f"Bytes: {size:,}\n"
+        f"KB: {kb:.2f}\n"
+        f"MB: {mb:.2f}\n"
+        f"GB: {gb:.2f}\n"
+        f"TB: {tb:.2f}"
+    )
+
+
+def read_list_file(path):
+    """Non-empty, stripped lines of a UTF-8 text file."""
+    with open(path, encoding="utf-8") as f:
+        return [ln.strip() for ln in f if ln.strip()]
@@ -0,0 +1,301 @@
+# core/scheduler.py — app-wide countdown scheduler (no Kivy)
+"""
+``TimerScheduler`` owns every countdown in the app. Deadlines sit in a heap
+served by a single thread, which sleeps until the earliest deadline or until
+the set of timers changes. Hundreds of timers therefore cost one wakeup per
+expiry, not one polling loop per timer.
+
+Timers are saved to ``TIMERS_FILE`` as elapsed time plus the wall-clock time
+of the save. A timer that was running when the app closed counts the closed
+time too. A timer whose deadline passed while the app was closed comes back
+as expired without running its actions: powering the machine off or
+beeping at launch, possibly hours late, is never what the user wanted.
+
+When a timer expires, the scheduler runs its completion actions by name from
+``ACTIONS``. New actions can be added with ``register_action``.
+"""
+import heapq
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from core.timer import CountdownTimer
+
+TIMERS_FILE = "timers.json"
+
+
+# ----- completion actions -----
+
+def shutdown_computer(entry):
+    if sys.platform.startswith("win"):
+        cmd = ["shutdown", "/s", "/t", "1"]
+    elif sys.platform == "darwin":
+        cmd = ["osascript", "-e", 'tell app "System Events" to shut down']
+    else:
+        cmd = ["systemctl", "poweroff"]
+    subprocess.Popen(cmd)
+
+
+def play_sound(entry):
+    if sys.platform.startswith("win"):
+        import winsound
+        winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
+    elif sys.platform == "darwin":
+        subprocess.Popen(["afplay", "/System/Library/Sounds/Glass.aiff"])
+    elif shutil.which("paplay"):
+        subprocess.Popen(["paplay", "/usr/share/sounds/freedesktop/stereo/complete.oga"])
+    else:
+        sys.stdout.write("\a")
+        sys.stdout.flush()
+
+
+def notify(entry):
+    title, message = "Srboli Light", f"Timer {entry.timer.label} finished"
+    try:
+        from plyer import notification
+        notification.notify(title=title, message=message)
+        return
+    except Exception:
+        pass  # plyer missing or no backend: fall back to the platform tools
+    if sys.platform == "darwin":
+        subprocess.Popen(["osascript", "-e", f'display notification "{message}" with title "{title}"'])
+    elif shutil.which("notify-send"):
+        subprocess.Popen(["notify-send", title, message])
+    else:
+        print(f"{title}: {message}")
+
+
+ACTIONS = {
+    "shutdown": shutdown_computer,
+    "sound": play_sound,
+    "notify": notify,
+}
+
+
+def register_action(name, fn):
+    """Make ``fn(entry)`` available as a completion action called ``name``."""
+    ACTIONS[name] = fn
+
+
+# ----- scheduler -----
+
+class ScheduledTimer:
+    """A countdown owned by the scheduler, plus what to do when it ends."""
+
+    def __init__(self, timer_id, timer, actions=()):
+        self.id = timer_id
+        self.timer = timer
+        self.actions = tuple(actions)
+        self.fired = False
+        self.gen = 0    # bumped on pause/resume/remove; stale heap entries are skipped
+
+    def to_json(self):
+        return {"id": self.id, "label": self.timer.label, "duration": self.timer.duration,
+                "elapsed": self.timer.elapsed(), "running": not self.fired and not self.timer.paused,
+                "actions": list(self.actions), "fired": self.fired}
+
+
+class TimerScheduler:
+    """Thread-safe set of countdowns with a single deadline thread.
+
+    ``subscribe(fn)`` registers ``fn(event, entry)`` for the events
+    ``"added"``, ``"changed"``, ``"fired"`` and ``"removed"``. Listeners run
+    on the calling thread or on the scheduler thread, so UI code has to
+    marshal them itself.
+    """
+
+    def __init__(self, path=TIMERS_FILE, clock=time.monotonic):
+        self.path = path
+        self._clock = clock
+        self._entries = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._listeners = []
+        self._cond = threading.Condition()
+        self._dirty = False
+        self._thread = None
+        self._stopping = False
+        self._load()
+
+    # ----- public API -----
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="timer-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def shutdown(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self.save()
+
+    def subscribe(self, fn):
+        self._listeners.append(fn)
+
+    def unsubscribe(self, fn):
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def entries(self):
+        with self._cond:
+            return list(self._entries.values())
+
+    def get(self, timer_id):
+        return self._entries.get(timer_id)
+
+    def add(self, duration, label="", actions=()):
+        with self._cond:
+            entry = ScheduledTimer(next(self._ids), CountdownTimer(duration, label, self._clock), actions)
+            self._entries[entry.id] = entry
+            entry.timer.start()
+            self._push(entry)
+        self._emit("added", entry)
+        return entry
+
+    def pause(self, timer_id):
+        with self._cond:
+            entry = self._entries.get(timer_id)
+            if entry is None or not entry.timer.running:
+                return
+            entry.timer.pause()
+            entry.gen += 1
+            self._touch()
+        self._emit("changed", entry)
+
+    def resume(self, timer_id):
+        with self._cond:
+            entry = self._entries.get(timer_id)
+            if entry is None or entry.fired or entry.timer.running:
+                return
+            entry.timer.resume()
+            self._push(entry)
+        self._emit("changed", entry)
+
+    def remove(self, timer_id):
+        with self._cond:
+            entry = self._entries.pop(timer_id, None)
+            if entry is None:
+                return
+            entry.gen += 1
+            self._touch()
+        self._emit("removed", entry)
+
+    # ----- persistence -----
+
+    def save(self):
+        with self._cond:
+            data = {"saved_at": time.time(), "timers": [e.to_json() for e in self._entries.values()]}
+            self._dirty = False
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print("Timer save error:", e)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        away = max(0.0, time.time() - data.get("saved_at", time.time()))
+        with self._cond:
+            self._restore(data.get("timers", []), away)
+
+    def _restore(self, items, away):
+        for item in items:
+            try:
+                elapsed = item["elapsed"] + (away if item.get("running") else 0.0)
+                timer = CountdownTimer(item["duration"], item.get("label", ""), self._clock, elapsed)
+                entry = ScheduledTimer(int(item["id"]), timer, item.get("actions", ()))
+            except (KeyError, TypeError, ValueError):
+                continue
+            entry.fired = bool(item.get("fired"))
+            self._entries[entry.id] = entry
+            if not item.get("running") or entry.fired:
+                continue
+            if timer.done:
+                entry.fired = True  # overdue while closed: expired, actions skipped
+                self._dirty = True
+            else:
+                timer.resume()
+                self._push(entry)
+        if self._entries:
+            self._ids = itertools.count(max(self._entries) + 1)
+
+    # ----- internals (call with the lock held) -----
+
+    def _push(self, entry):
+        entry.gen += 1
+        deadline = self._clock() + entry.timer.remaining()
+        heapq.heappush(self._heap, (deadline, next(self._seq), entry.id, entry.gen))
+        self._touch()
+
+    def _touch(self):
+        self._dirty = True
+        self._cond.notify()
+
+    def _emit(self, event, entry):
+        for fn in list(self._listeners):
+            try:
+                fn(event, entry)
+            except Exception as e:
+                print(f"Timer listener error ({event}): {e}")
+
+    def _run(self):
+        while True:
+            due = []
+            with self._cond:
+                if self._stopping:
+                    return
+                now = self._clock()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, timer_id, gen = heapq.heappop(self._heap)
+                    entry = self._entries.get(timer_id)
+                    if entry is not None and entry.gen == gen and not entry.fired:
+                        entry.fired = True
+                        entry.timer.pause()     # freeze at the full duration
+                        self._dirty = True
+                        due.append(entry)
+                dirty = self._dirty
+            # save outside the lock so bursts of adds/removes coalesce into one write
+            if dirty:
+                self.save()
+            for entry in due:
+                self._fire(entry)
+            with self._cond:
+                if self._stopping or self._dirty:
+                    continue
+                timeout = self._heap[0][0] - self._clock() if self._heap else None
+                if timeout is None or timeout > 0:
+                    self._cond.wait(timeout)
+
+    def _fire(self, entry):
+        self._emit("fired", entry)
+        for name in entry.actions:
+            fn = ACTIONS.get(name)
+            if fn is None:
+                print(f"Unknown timer action: {name}")
+                continue
+            # actions may block (subprocesses, audio); keep the deadline thread free
+            threading.Thread(target=self._run_action, args=(name, fn, entry), daemon=True).start()
+
+    @staticmethod
+    def _run_action(name, fn, entry):
+        try:
+            fn(entry)
+        except Exception as e:
+            print(f"Timer action {name} failed: {e}")
@@ -0,0 +1,448 @@
+# core/seek_index.py — per-track frame/offset index for accurate seeking (no Kivy)
+"""
+``build_index(path)`` produces a ``SeekIndex``: a sorted table of
+``(seconds, byte offset)`` points that each start a decodable frame, plus the
+header bytes a decoder needs in front of them.
+
+- MP3: every frame header is walked once (headers only, nothing is decoded).
+- FLAC: the SEEKTABLE block when present, otherwise frame headers sampled
+  across the file (each carries its own sample/frame number and a CRC-8
+  that rules out sync codes found inside audio data).
+- Ogg: pages sampled across the file (each carries a granule position).
+- WAV: no table; the offset of any sample frame is computed directly from
+  the block alignment.
+
+``SeekIndex.open_at(t)`` returns a file-like object that presents the header
+followed by the stream from the nearest frame at or before ``t``, so playback
+starts exactly there instead of relying on the backend's ``play(start=)``.
+"""
+import bisect
+import io
+import os
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from core.audio_meta import find_mp3_frame, id3v2_size, ogg_packets, parse_mp3_header
+
+# MP3 index resolution in seconds
+MP3_STEP = 0.5
+# number of probe points for formats that are sampled rather than walked
+SAMPLE_POINTS = 400
+READ_CHUNK = 1 << 20
+# indexes kept in memory by SeekIndexService
+CACHE_SIZE = 16
+
+
+class SeekIndex:
+    def __init__(self, path, fmt, times, offsets, prefix=b"", duration=None, rate=None, block_align=None):
+        self.path = path
+        self.format = fmt
+        self.times = array("d", times)
+        self.offsets = array("q", offsets)
+        self.prefix = prefix
+        self.duration = duration
+        # PCM only: offsets are computed per sample frame instead of looked up
+        self.rate = rate
+        self.block_align = block_align
+
+    def __len__(self):
+        return len(self.times)
+
+    def lookup(self, seconds):
+        """``(frame_time, byte_offset)`` of the last indexed frame at or before ``seconds``."""
+        if self.block_align:
+            frames = max(0, min(round(seconds * self.rate), round((self.duration or 0) * self.rate)))
+            return frames / self.rate, self.offsets[0] + frames * self.block_align
+        i = bisect.bisect_right(self.times, seconds) - 1
+        i = max(0, min(i, len(self.times) - 1))
+        return self.times[i], self.offsets[i]
+
+    def open_at(self, seconds):
+        """Return ``(fileobj, frame_time)`` positioned at the frame nearest ``seconds``."""
+        frame_time, offset = self.lookup(seconds)
+        prefix = self.prefix
+        if self.format == "wav":
+            prefix = _patch_wav_sizes(prefix, os.path.getsize(self.path) - offset)
+        return SpliceReader(self.path, prefix, offset), frame_time
+
+
+class SpliceReader(io.RawIOBase):
+    """Read-only view of ``prefix`` followed by ``path`` from ``offset`` onwards."""
+
+    def __init__(self, path, prefix, offset):
+        super().__init__()
+        self._f = open(path, "rb")
+        self._prefix = prefix
+        self._offset = offset
+        self._size = len(prefix) + os.path.getsize(path) - offset
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += self._size
+        self._pos = max(0, min(pos, self._size))
+        return self._pos
+
+    def readinto(self, buf):
+        n = min(len(buf), self._size - self._pos)
+        if n <= 0:
+            return 0
+        done = 0
+        plen = len(self._prefix)
+        if self._pos < plen:
+            chunk = self._prefix[self._pos:self._pos + n]
+            buf[:len(chunk)] = chunk
+            done = len(chunk)
+        if done < n:
+            self._f.seek(self._offset + self._pos + done - plen)
+            data = self._f.read(n - done)
+            buf[done:done + len(data)] = data
+            done += len(data)
+        self._pos += done
+        return done
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+
+def build_index(path):
+    """Build a ``SeekIndex`` for ``path``, or None for unsupported formats."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if head[:4] == b"fLaC":
+            return _index_flac(path, f, size)
+        if head[:4] == b"OggS":
+            return _index_ogg(path, f, size)
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            return _index_wav(path, f)
+        if head[4:8] == b"ftyp":
+            return None
+        return _index_mp3(path, f, size)
+
+
+# ----- MP3 -----
+
+def _index_mp3(path, f, size):
+    f.seek(0)
+    start = find_mp3_frame(f, id3v2_size(f.read(10)))
+    if start is None:
+        return None
+    times, offsets = [], []
+    t = 0.0
+    next_mark = 0.0
+    pos = start
+    f.seek(pos)
+    buf = f.read(READ_CHUNK)
+    base = pos
+    while True:
+        rel = pos - base
+        if rel + 4 > len(buf):
+            f.seek(pos)
+            buf = f.read(READ_CHUNK)
+            base = pos
+            rel = 0
+            if len(buf) < 4:
+                break
+        hdr = parse_mp3_header(buf[rel:rel + 4])
+        if hdr is None:
+            # lost sync (junk or trailing tag): resync from here
+            nxt = find_mp3_frame(f, pos + 1)
+            if nxt is None:
+                break
+            pos = nxt
+            f.seek(pos)
+            buf = f.read(READ_CHUNK)
+            base = pos
+            continue
+        length, spf, rate, _, _ = hdr
+        if t >= next_mark:
+            times.append(t)
+            offsets.append(pos)
+            next_mark = t + MP3_STEP
+        t += spf / rate
+        pos += length
+    return SeekIndex(path, "mp3", times, offsets, duration=t)
+
+
+# ----- FLAC -----
+
+def _index_flac(path, f, size):
+    f.seek(4)
+    last = False
+    rate = total = min_block = None
+    fixed_block = None
+    seekpoints = []
+    while not last:
+        hdr = f.read(4)
+        if len(hdr) < 4:
+            return None
+        last = bool(hdr[0] & 0x80)
+        btype = hdr[0] & 0x7F
+        length = int.from_bytes(hdr[1:4], "big")
+        data = f.read(length)
+        if btype == 0:
+            min_block, max_block = struct.unpack_from(">HH", data, 0)
+            bits = int.from_bytes(data[10:18], "big")
+            rate, total = bits >> 44, bits & 0xFFFFFFFFF
+            fixed_block = min_block if min_block == max_block else None
+        elif btype == 3:
+            for i in range(0, length - 17, 18):
+                sample, offset, _ = struct.unpack_from(">QQH", data, i)
+                if sample != 0xFFFFFFFFFFFFFFFF:
+                    seekpoints.append((sample, offset))
+    first_frame = f.tell()
+    if not rate:
+        return None
+    f.seek(0)
+    prefix = f.read(first_frame)
+    duration = total / rate if total else None
+
+    points = {0: first_frame}
+    for sample, offset in seekpoints:
+        points[sample] = first_frame + offset
+    if len(points) < SAMPLE_POINTS // 4:
+        for probe in _probe_offsets(first_frame, size):
+            found = _next_flac_frame(f, probe, fixed_block)
+            if found:
+                points.setdefault(found[0], found[1])
+    ordered = sorted(points.items())
+    return SeekIndex(path, "flac", [s / rate for s, _ in ordered], [o for _, o in ordered],
+                     prefix=prefix, duration=duration)
+
+
+def _next_flac_frame(f, offset, fixed_block):
+    """``(first_sample, offset)`` of the first frame header at/after ``offset``."""
+    f.seek(offset)
+    data = f.read(64 * 1024)
+    pos = data.find(b"\xff")
+    while 0 <= pos < len(data) - 16:
+        b1 = data[pos + 1]
+        if b1 in (0xF8, 0xF9):
+            number = _flac_frame_number(data, pos)
+            if number is not None:
+                variable = b1 & 1
+                if variable:
+                    return number, offset + pos
+                if fixed_block:
+                    return number * fixed_block, offset + pos
+        pos = data.find(b"\xff", pos + 1)
+    return None
+
+
+def _flac_frame_number(data, pos):
+    """Frame/sample number of the frame header at ``pos``, or None if it is not one."""
+    block_code, rate_code = data[pos + 2] >> 4, data[pos + 2] & 0x0F
+    channels, bits = data[pos + 3] >> 4, (data[pos + 3] >> 1) & 0x07
+    if block_code == 0 or rate_code == 15 or channels > 10 or bits == 3 or data[pos + 3] & 1:
+        return None
+    number, n = _utf8_number(data, pos + 4)
+    if not n:
+        return None
+    end = pos + 4 + n
+    end += 1 if block_code == 6 else 2 if block_code == 7 else 0
+    end += 1 if rate_code == 12 else 2 if rate_code in (13, 14) else 0
+    if end >= len(data) or _crc8(data, pos, end) != data[end]:
+        return None
+    return number
+
+
+def _crc8(data, start, end):
+    """CRC-8 (polynomial 0x07), as used by FLAC frame headers."""
+    crc = 0
+    for b in data[start:end]:
+        crc = _CRC8_TABLE[crc ^ b]
+    return crc
+
+
+def _crc8_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return bytes(table)
+
+
+_CRC8_TABLE = _crc8_table()
+
+
+def _utf8_number(data, pos):
+    """``(value, length)`` of FLAC's UTF-8 style coded number; length 0 if malformed."""
+    first = data[pos]
+    if first < 0x80:
+        return first, 1
+    n = 0
+    mask = 0x80
+    while first & mask:
+        n += 1
+        mask >>= 1
+    if n < 2 or n > 7:
+        return 0, 0
+    value = first & (mask - 1)
+    for i in range(1, n):
+        b = data[pos + i]
+        if b & 0xC0 != 0x80:
+            return 0, 0
+        value = (value << 6) | (b & 0x3F)
+    return value, n
+
+
+# ----- Ogg -----
+
+def _index_ogg(path, f, size):
+    f.seek(0)
+    head = f.read(64 * 1024)
+    packets = ogg_packets(head, limit=1)
+    if not packets:
+        return None
+    ident = packets[0]
+    preskip = 0
+    if ident[:7] == b"\x01vorbis":
+        rate = struct.unpack_from("<I", ident, 12)[0]
+    elif ident[:8] == b"OpusHead":
+        rate, preskip = 48000, struct.unpack_from("<H", ident, 10)[0]
+    else:
+        return None
+
+    # header pages are the ones before the first page with a positive granule
+    pos = 0
+    first_audio = None
+    prev_granule = 0
+    while pos + 27 <= len(head) and head[pos:pos + 4] == b"OggS":
+        granule = struct.unpack_from("<q", head, pos + 6)[0]
+        nsegs = head[pos + 26]
+        plen = 27 + nsegs + sum(head[pos + 27:pos + 27 + nsegs])
+        if granule > 0:
+            first_audio = pos
+            break
+        pos += plen
+    if first_audio is None:
+        return None
+    prefix = head[:first_audio]
+
+    times, offsets = [0.0], [first_audio]
+    for probe in _probe_offsets(first_audio, size):
+        f.seek(probe)
+        data = f.read(64 * 1024)
+        p = data.find(b"OggS")
+        # a page's granule is the sample count at its *end*; the next page starts there
+        while 0 <= p and p + 27 <= len(data):
+            granule = struct.unpack_from("<q", data, p + 6)[0]
+            nsegs = data[p + 26]
+            if p + 27 + nsegs > len(data):
+                break
+            plen = 27 + nsegs + sum(data[p + 27:p + 27 + nsegs])
+            if granule > prev_granule and p + plen < len(data):
+                nxt = data.find(b"OggS", p + plen)
+                if nxt == p + plen:
+                    t = max(0, granule - preskip) / rate
+                    if t > times[-1]:
+                        times.append(t)
+                        offsets.append(probe + nxt)
+                        prev_granule = granule
+                break
+            p = data.find(b"OggS", p + 4)
+    return SeekIndex(path, "ogg", times, offsets, prefix=prefix)
+
+
+# ----- WAV -----
+
+def _index_wav(path, f):
+    f.seek(12)
+    block_align = rate = None
+    while True:
+        hdr = f.read(8)
+        if len(hdr) < 8:
+            return None
+        cid, length = hdr[:4], struct.unpack("<I", hdr[4:])[0]
+        if cid == b"fmt ":
+            data = f.read(length)
+            _, _, rate, _, block_align = struct.unpack_from("<HHIIH", data, 0)
+            if length & 1:
+                f.seek(1, os.SEEK_CUR)
+        elif cid == b"data":
+            data_start = f.tell()
+            break
+        else:
+            f.seek(length + (length & 1), os.SEEK_CUR)
+    if not rate or not block_align:
+        return None
+    f.seek(0)
+    prefix = f.read(data_start)
+    frames = length // block_align
+    duration = frames / rate
+    return SeekIndex(path, "wav", [0.0], [data_start], prefix=prefix, duration=duration,
+                     rate=rate, block_align=block_align)
+
+
+def _patch_wav_sizes(prefix, data_len):
+    """Rewrite the RIFF and data chunk sizes so the spliced stream is self-consistent."""
+    out = bytearray(prefix)
+    struct.pack_into("<I", out, 4, len(out) - 8 + data_len)
+    struct.pack_into("<I", out, len(out) - 4, data_len)
+    return bytes(out)
+
+
+def _probe_offsets(start, size):
+    span = size - start
+    if span <= 0:
+        return []
+    step = max(4096, span // SAMPLE_POINTS)
+    return range(start + step, size, step)
+
+
+class SeekIndexService:
+    """Builds indexes on a background thread and keeps the most recent ones."""
+
+    def __init__(self):
+        self._indexes = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="seek-index")
+
+    def get(self, path):
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is not None:
+                self._indexes.move_to_end(path)
+            return index
+
+    def request(self, path):
+        with self._lock:
+            if path in self._indexes or path in self._pending:
+                return
+            self._pending.add(path)
+        self._pool.submit(self._build, path)
+
+    def _build(self, path):
+        try:
+            index = build_index(path)
+        except Exception as e:
+            print(f"Seek index failed for {path}: {e}")
+            index = None
+        with self._lock:
+            self._pending.discard(path)
+            if index is not None:
+                self._indexes[path] = index
+                while len(self._indexes) > CACHE_SIZE:
+                    self._indexes.popitem(last=False)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,200 @@
+# core/spin.py — Wheel of Names selection engine (no Kivy)
+"""
+Selection math shared by the Wheel of Names screen and the spin benchmark.
+
+The wheel is drawn with equal slices, slice ``i`` covering
+``[i * seg, (i + 1) * seg)`` degrees counter-clockwise from 3 o'clock, and a
+fixed pointer at 90 degrees. The winner is decided up front (weighted by the
+configured weights) and the target angle is chosen so the wheel comes to
+rest inside that slice.
+"""
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:  # the simulator falls back to the scalar path
+    np = None
+
+POINTER_ANGLE = 90.0
+MIN_FULL_SPINS = 3
+MAX_FULL_SPINS = 6
+# Keep the pointer away from slice borders so the landing slice is unambiguous
+EDGE_MARGIN = 0.1
+
+
+def selected_index(rotation_angle, count):
+    """Return the index of the slice under the pointer, or None for an empty wheel."""
+    if not count:
+        return None
+    seg_angle = 360.0 / count
+    relative = (POINTER_ANGLE - (rotation_angle % 360.0)) % 360.0
+    return int(relative // seg_angle) % count
+
+
+def pick_index(weights, rng=random):
+    """Weighted pick of an index; all-zero (or negative) weights fall back to uniform."""
+    weights = [max(0.0, float(w)) for w in weights]
+    total = sum(weights)
+    if total <= 0:
+        return rng.randrange(len(weights))
+    r = rng.random() * total
+    acc = 0.0
+    for i, w in enumerate(weights):
+        acc += w
+        if r < acc:
+            return i
+    # float rounding: land on the last slice that can actually win
+    return max(i for i, w in enumerate(weights) if w > 0)
+
+
+def plan_spin(weights, current_angle, rng=random):
+    """Pick a winner and the rotation angle that lands on it.
+
+    Returns ``(chosen_index, target_degrees)``. The target is always ahead
+    of ``current_angle`` so the wheel never spins backwards.
+    """
+    n = len(weights)
+    seg = 360.0 / n
+    chosen = pick_index(weights, rng)
+    offset_inside = rng.uniform(seg * EDGE_MARGIN, seg * (1 - EDGE_MARGIN))
+    final_angle = (POINTER_ANGLE - (chosen * seg + offset_inside)) % 360.0
+    delta = (final_angle - current_angle) % 360.0
+    full_spins = rng.randint(MIN_FULL_SPINS, MAX_FULL_SPINS)
+    return chosen, current_angle + delta + 360.0 * full_spins
+
+
+# ----- simulation -----
+
+def simulate(weights, spins, seed=None, start_angle=0.0, chunk_size=1 << 20):
+    """Run ``spins`` back-to-back spins and count the winners.
+
+    Uses NumPy when available, otherwise the scalar ``plan_spin`` path.
+    Returns ``(counts, mismatches)`` where ``mismatches`` is the number of
+    spins whose landing slice differed from the chosen one (always 0 unless
+    the angle math regresses).
+    """
+    if not weights:
+        raise ValueError("simulate() needs at least one weight")
+    if np is None:
+        return simulate_scalar(weights, spins, seed, start_angle)
+
+    n = len(weights)
+    seg = 360.0 / n
+    w = np.clip(np.asarray(weights, dtype=float), 0.0, None)
+    if w.sum() <= 0:
+        w = np.ones(n)
+    cum = np.cumsum(w)
+    cum /= cum[-1]
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(n, dtype=np.int64)
+    mismatches = 0
+    current = start_angle % 360.0
+    done = 0
+    while done < spins:
+        size = min(chunk_size, spins - done)
+        chosen = np.searchsorted(cum, rng.random(size), side="right")
+        np.minimum(chosen, n - 1, out=chosen)
+        offset = rng.uniform(seg * EDGE_MARGIN, seg * (1 - EDGE_MARGIN), size)
+        full = rng.integers(MIN_FULL_SPINS, MAX_FULL_SPINS + 1, size)
+        final_angle = (POINTER_ANGLE - (chosen * seg + offset)) % 360.0
+
+        # each spin starts where the previous one stopped
+        starts = np.empty(size)
+        starts[0] = current
+        starts[1:] = final_angle[:-1]
+        target = starts + (final_angle - starts) % 360.0 + 360.0 * full
+
+        relative = (POINTER_ANGLE - target % 360.0) % 360.0
+        winners = (relative // seg).astype(np.int64) % n
+        counts += np.bincount(winners, minlength=n)
+        mismatches += int(np.count_nonzero(winners != chosen))
+
+        current = float(final_angle[-1])
+        done += size
+    return counts.tolist(), mismatches
+
+
+def simulate_scalar(weights, spins, seed=None, start_angle=0.0):
+    """Pure-Python simulator driving the exact functions the screen uses."""
+    rng = random.Random(seed)
+    n = len(weights)
+    counts = [0] * n
+    mismatches = 0
+    angle = start_angle
+    for _ in range(spins):
+        chosen, angle = plan_spin(weights, angle, rng)
+        # keep the angle small, as a long session would otherwise lose precision
+        angle %= 360.0
+        idx = selected_index(angle, n)
+        counts[idx] += 1
+        if idx != chosen:
+            mismatches += 1
+    return counts, mismatches
+
+
+# ----- fairness statistics -----
+
+def chi_square(observed, weights):
+    """Pearson chi-square of observed winner counts against the configured weights.
+
+    Returns ``(statistic, degrees_of_freedom, p_value)``. Zero-weight entries
+    are excluded from the degrees of freedom; any win on one makes the fit fail.
+    """
+    total = sum(observed)
+    w = [max(0.0, float(x)) for x in weights]
+    wsum = sum(w)
+    if wsum <= 0:
+        w = [1.0] * len(observed)
+        wsum = float(len(observed))
+    stat = 0.0
+    cells = 0
+    for obs, wi in zip(observed, w):
+        expected = total * wi / wsum
+        if expected <= 0:
+            if obs:
+                return math.inf, max(0, cells - 1), 0.0
+            continue
+        cells += 1
+        stat += (obs - expected) ** 2 / expected
+    dof = max(0, cells - 1)
+    if dof == 0:
+        return stat, 0, 1.0
+    return stat, dof, _gamma_q(dof / 2.0, stat / 2.0)
+
+
+def _gamma_q(a, x):
+    """Regularized upper incomplete gamma Q(a, x), i.e. the chi-square survival function."""
+    if x <= 0:
+        return 1.0
+    if x < a + 1:
+        # series for P(a, x)
+        term = total = 1.0 / a
+        ap = a
+        for _ in range(1000):
+            ap += 1
+            term *= x / ap
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(-x + a * math.log(x) - math.lgamma(a)))
+    # continued fraction for Q(a, x) (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return h * math.exp(-x + a * math.log(x) - math.lgamma(a))
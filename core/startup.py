@@ -0,0 +1,197 @@
+# core/startup.py — Kivy provider selection and import-time report (no Kivy)
+"""
+Startup tuning that must run before Kivy is imported.
+
+``configure_kivy_env`` narrows Kivy's provider lists to the ones this app
+uses. By default Kivy probes every window, text, image and clipboard
+backend it knows. On Linux the clipboard probe alone launches ``xclip``
+and ``xsel`` subprocesses. The defaults are written with ``setdefault``, so
+any ``KIVY_*`` variable already in the environment wins. Audio, video,
+camera and spelling are not listed because the app never imports those
+Kivy modules; music plays through pygame.
+
+``ImportProfiler`` is an in-process equivalent of ``python -X importtime``.
+It also works in frozen builds, where interpreter flags cannot be passed.
+It sits on ``sys.meta_path`` and times each module's execution, recording
+self and cumulative time. ``mark`` records named phases on the same clock.
+Set ``SRBOLI_STARTUP_REPORT=1`` to enable it. The app calls ``finish`` once
+the first frame is drawn, which writes ``REPORT_FILE`` and prints the
+slowest imports. Modules imported before ``begin``, such as the standard
+library used by the launcher itself, are not counted.
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+ENV_REPORT = "SRBOLI_STARTUP_REPORT"
+REPORT_FILE = "startup_report.json"
+SUMMARY_TOP = 15
+
+
+def configure_kivy_env(platform=sys.platform):
+    """Point Kivy at the providers this app needs; existing KIVY_* variables win."""
+    android = "ANDROID_ARGUMENT" in os.environ or "ANDROID_PRIVATE" in os.environ
+    os.environ.setdefault("KIVY_WINDOW", "sdl2")
+    os.environ.setdefault("KIVY_TEXT", "sdl2")
+    os.environ.setdefault("KIVY_IMAGE", "tex,dds,sdl2")
+    if android:
+        clipboard = "android"
+    elif platform.startswith("win"):
+        clipboard = "winctypes"
+    else:
+        clipboard = "sdl2"
+    os.environ.setdefault("KIVY_CLIPBOARD", clipboard)
+
+
+class _TimedLoader:
+    """Wraps a loader for one import; hands the real loader back before running the module."""
+
+    def __init__(self, loader, profiler):
+        self.loader = loader
+        self.profiler = profiler
+
+    def create_module(self, spec):
+        # timing starts here: extension modules do most of their work in create_module
+        self.profiler._enter()
+        create = getattr(self.loader, "create_module", None)
+        try:
+            return create(spec) if create is not None else None
+        except BaseException:
+            self.profiler._exit(spec.name)
+            raise
+
+    def exec_module(self, module):
+        # keep the proxy out of the finished module: pkg_resources and friends inspect __loader__
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.profiler._exit(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class ImportProfiler:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.records = []   # (name, self seconds, cumulative seconds, depth)
+        self.marks = []     # (label, seconds since t0)
+        # per thread: a stack of [start time, time spent in nested imports], and a re-entry flag
+        self._local = threading.local()
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    # ----- meta path finder -----
+    def find_spec(self, fullname, path=None, target=None):
+        local = self._local
+        if getattr(local, "finding", False):
+            return None
+        local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            local.finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self):
+        self._stack().append([time.perf_counter(), 0.0])
+
+    def _exit(self, name):
+        stack = self._stack()
+        if not stack:
+            return  # importlib.reload() runs exec_module without create_module: not timed
+        start, nested = stack.pop()
+        total = time.perf_counter() - start
+        if stack:
+            stack[-1][1] += total
+        self.records.append((name, total - nested, total, len(stack)))
+
+    # ----- phases and report -----
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter() - self.t0))
+
+    def report(self, top=50):
+        by_total = sorted(self.records, key=lambda r: r[2], reverse=True)
+        by_self = sorted(self.records, key=lambda r: r[1], reverse=True)
+
+        def rows(records):
+            return [{"module": n, "self_ms": round(s * 1000, 2), "cumulative_ms": round(c * 1000, 2),
+                     "depth": d} for n, s, c, d in records[:top]]
+
+        return {
+            "created": time.time(),
+            "modules": len(self.records),
+            "import_ms": round(sum(r[2] for r in self.records if r[3] == 0) * 1000, 1),
+            "phases": [{"phase": label, "ms": round(t * 1000, 1)} for label, t in self.marks],
+            "slowest_cumulative": rows(by_total),
+            "slowest_self": rows(by_self),
+        }
+
+    def summary(self, top=SUMMARY_TOP):
+        rep = self.report(top)
+        lines = [f"Startup: {rep['modules']} modules imported in {rep['import_ms']:.0f} ms"]
+        lines += [f"  {p['ms']:8.1f} ms  {p['phase']}" for p in rep["phases"]]
+        lines.append("Slowest imports (cumulative / self):")
+        lines += [f"  {r['cumulative_ms']:8.1f} / {r['self_ms']:7.1f} ms  {r['module']}"
+                  for r in rep["slowest_cumulative"]]
+        return "\n".join(lines)
+
+
+_profiler = None
+
+
+def begin():
+    """Start the import profiler when SRBOLI_STARTUP_REPORT is set."""
+    global _profiler
+    if _profiler is None and os.environ.get(ENV_REPORT, "") not in ("", "0"):
+        _profiler = ImportProfiler().install()
+    return _profiler
+
+
+def mark(label):
+    if _profiler is not None:
+        _profiler.mark(label)
+
+
+def finish(path=REPORT_FILE):
+    """Stop profiling, write the report and print its summary; no-op when not profiling."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    profiler.mark("first frame")
+    profiler.uninstall()
+    rep = profiler.report()
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rep, f, indent=2)
+    except OSError as e:
+        print("Could not write startup report:", e)
+    print(profiler.summary())
+    return rep
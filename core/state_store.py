@@ -0,0 +1,208 @@
+# core/state_store.py — SQLite session state with write-behind batching (no Kivy)
+"""
+Keeps what the user builds across restarts: rosters, playlists and per-tool
+settings.
+
+Two kinds of data live in one SQLite file (``STATE_DB``):
+
+* **settings**: small JSON values addressed by ``(namespace, key)``;
+* **item lists**: ordered ``(name, weight)`` rows per namespace, for
+  rosters that can reach tens of thousands of entries.
+
+Writes never touch the disk on the caller's thread. ``set``,
+``replace_items`` and ``append_items`` only record the change and wake a
+writer thread. The writer waits ``delay`` seconds for more changes, then
+applies the whole batch in one transaction. A newer value for a key, or a
+newer ``replace_items`` for a list, supersedes anything still queued, so a
+burst of edits costs one write. Reads see queued settings immediately.
+Reading an item list with queued changes flushes that batch first.
+
+Screens fetch their state the first time they are shown, so startup never
+waits on the database.
+"""
+import json
+import sqlite3
+import threading
+
+STATE_DB = "srboli_state.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,
+    PRIMARY KEY (ns, key)
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY, ns TEXT NOT NULL, name TEXT NOT NULL, weight REAL NOT NULL DEFAULT 1.0
+);
+CREATE INDEX IF NOT EXISTS items_ns ON items (ns, id);
+"""
+
+REPLACE = "replace"
+APPEND = "append"
+
+
+def _pairs(items):
+    for it in items:
+        if isinstance(it, str):
+            yield it, 1.0
+        else:
+            yield str(it[0]), float(it[1])
+
+
+class StateStore:
+    def __init__(self, path=STATE_DB, delay=0.5):
+        self.path = path
+        self.delay = delay
+        self.flushes = 0
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._settings = {}     # (ns, key) -> value waiting to be written
+        self._inflight = {}     # settings the writer is committing right now
+        self._list_ops = []     # (kind, ns, [(name, weight)]) waiting to be written
+        self._writing = False
+        self._urgent = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="state-store", daemon=True)
+        self._thread.start()
+
+    # ----- settings -----
+    def get(self, ns, key, default=None):
+        with self._cond:
+            for pending in (self._settings, self._inflight):
+                if (ns, key) in pending:
+                    return pending[(ns, key)]
+        with self._db_lock:
+            row = self._db.execute("SELECT value FROM settings WHERE ns=? AND key=?", (ns, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def settings(self, ns):
+        """Every setting in ``ns`` as a dict, including ones not written yet."""
+        # snapshot the unwritten values first: if they commit meanwhile, the read sees them too
+        with self._cond:
+            overlay = {k: v for pending in (self._inflight, self._settings)
+                       for (n, k), v in pending.items() if n == ns}
+        with self._db_lock:
+            rows = self._db.execute("SELECT key, value FROM settings WHERE ns=?", (ns,)).fetchall()
+        out = {k: json.loads(v) for k, v in rows}
+        out.update(overlay)
+        return out
+
+    def set(self, ns, key, value):
+        self.update(ns, {key: value})
+
+    def update(self, ns, values):
+        with self._cond:
+            for key, value in values.items():
+                self._settings[(ns, key)] = value
+            self._cond.notify_all()
+
+    # ----- item lists -----
+    def items(self, ns):
+        """``[(name, weight)]`` in insertion order."""
+        with self._cond:
+            queued = self._writing or any(op[1] == ns for op in self._list_ops)
+        if queued:
+            self.flush()
+        with self._db_lock:
+            return self._db.execute("SELECT name, weight FROM items WHERE ns=? ORDER BY id", (ns,)).fetchall()
+
+    def replace_items(self, ns, items):
+        pairs = list(_pairs(items))
+        with self._cond:
+            # a full replace makes every queued change to this list irrelevant
+            self._list_ops = [op for op in self._list_ops if op[1] != ns]
+            self._list_ops.append((REPLACE, ns, pairs))
+            self._cond.notify_all()
+
+    def append_items(self, ns, items):
+        pairs = list(_pairs(items))
+        if not pairs:
+            return
+        with self._cond:
+            self._list_ops.append((APPEND, ns, pairs))
+            self._cond.notify_all()
+
+    # ----- writer -----
+    def _run(self):
+        while True:
+            with self._cond:
+                while not (self._settings or self._list_ops or self._closed):
+                    self._cond.wait()
+                # let a burst of edits collapse into one transaction
+                self._cond.wait_for(lambda: self._urgent or self._closed, self.delay)
+                settings, self._settings = self._settings, {}
+                self._inflight = settings
+                ops, self._list_ops = self._list_ops, []
+                self._urgent = False
+                if not (settings or ops):
+                    if self._closed:
+                        return
+                    continue
+                self._writing = True
+            try:
+                self._write(settings, ops)
+            except sqlite3.Error as e:
+                print("State store write error:", e)
+            with self._cond:
+                self._writing = False
+                self._inflight = {}
+                self.flushes += 1
+                self._cond.notify_all()
+
+    def _write(self, settings, ops):
+        with self._db_lock:
+            db = self._db
+            db.execute("BEGIN")
+            try:
+                db.executemany("INSERT OR REPLACE INTO settings (ns, key, value) VALUES (?, ?, ?)",
+                               [(ns, key, json.dumps(v)) for (ns, key), v in settings.items()])
+                for kind, ns, pairs in ops:
+                    if kind == REPLACE:
+                        db.execute("DELETE FROM items WHERE ns=?", (ns,))
+                    db.executemany("INSERT INTO items (ns, name, weight) VALUES (?, ?, ?)",
+                                   [(ns, n, w) for n, w in pairs])
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def flush(self, timeout=10):
+        """Write everything queued now and wait until it is on disk."""
+        with self._cond:
+            self._urgent = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: not (self._settings or self._list_ops or self._writing), timeout)
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=5)
+        with self._db_lock:
+            self._db.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The process-wide store, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = StateStore()
+        return _store
+
+
+def close_store():
+    global _store
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None:
+        store.close()
@@ -0,0 +1,80 @@
+# core/timer.py — drift-free countdown timer (no Kivy)
+"""
+``CountdownTimer`` derives elapsed time from ``time.monotonic()`` against its
+start timestamp instead of adding up frame deltas, so event-loop stalls and
+sleep never make it drift. It also tells the UI exactly when the next
+visible change is due (the displayed second or a progress-bar pixel), so
+the UI can sleep until then instead of waking ten times a second.
+"""
+import math
+import time
+
+
+def fmt_hms(seconds):
+    seconds = max(0, int(seconds))
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+class CountdownTimer:
+    def __init__(self, duration, label="", clock=time.monotonic, elapsed=0.0):
+        self.duration = float(duration)
+        self.label = label
+        self._clock = clock
+        self._started_at = None     # monotonic time of the last start/resume
+        self._banked = min(self.duration, max(0.0, float(elapsed)))  # elapsed before the last pause
+
+    @property
+    def running(self):
+        return self._started_at is not None and not self.done
+
+    @property
+    def paused(self):
+        return self._started_at is None and 0 < self._banked < self.duration
+
+    @property
+    def done(self):
+        return self.elapsed() >= self.duration
+
+    def start(self):
+        self._banked = 0.0
+        self._started_at = self._clock()
+
+    def pause(self):
+        if self._started_at is not None:
+            self._banked = self.elapsed()
+            self._started_at = None
+
+    def resume(self):
+        if self._started_at is None and not self.done:
+            self._started_at = self._clock()
+
+    def elapsed(self):
+        if self._started_at is None:
+            return self._banked
+        return min(self.duration, self._banked + (self._clock() - self._started_at))
+
+    def remaining(self):
+        return max(0.0, self.duration - self.elapsed())
+
+    def progress(self):
+        return min(1.0, self.elapsed() / self.duration) if self.duration > 0 else 1.0
+
+    def display(self):
+        """HH:MM:SS of the remaining time, rounded down like the original screen."""
+        return fmt_hms(self.remaining())
+
+    def next_change(self, width_px=0):
+        """Seconds until the displayed second or the bar (``width_px`` wide) next changes.
+
+        Returns None when nothing will change (paused or finished).
+        """
+        if not self.running:
+            return None
+        remaining = self.remaining()
+        frac = remaining - math.floor(remaining)
+        delay = frac if frac > 1e-6 else 1.0
+        if width_px > 0 and self.duration > 0:
+            px = math.floor(self.progress() * width_px)
+            next_px_at = (px + 1) * self.duration / width_px
+            delay = min(delay, max(0.0, next_px_at - self.elapsed()))
+        return min(delay, remaining)
@@ -0,0 +1,254 @@
+# core/waveform.py — waveform overview peaks for the Music Player (no Kivy)
+"""
+Streams decoded audio in fixed-size chunks and reduces it to ``buckets``
+(min, max) pairs in the range -1..1. Memory use is bounded by the chunk size,
+not by the track length.
+
+Decoding: WAV is read with the ``wave`` module; other formats are piped
+through ``ffmpeg`` as 8 kHz mono 16-bit PCM when ffmpeg is on PATH.
+
+``WaveformService`` runs the work in a single worker process and caches the
+peaks on disk per track (path + mtime + size). Every request bumps a shared
+generation counter, so a worker still busy with a previous track sees the
+change between chunks and gives up. Skipping through a playlist therefore
+never queues up work.
+"""
+import hashlib
+import multiprocessing
+import os
+import shutil
+import subprocess
+import wave
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BUCKETS = 600
+CACHE_DIR = "waveform_cache"
+FFMPEG_RATE = 8000
+CHUNK_SAMPLES = 1 << 16
+
+
+class Cancelled(Exception):
+    pass
+
+
+# ----- reduction -----
+
+class PeakReducer:
+    """Fold a stream of int16 sample chunks into ``buckets`` min/max pairs."""
+
+    def __init__(self, total_samples, buckets):
+        self.per_bucket = max(1, -(-int(total_samples) // buckets))
+        self.buckets = buckets
+        self.mins, self.maxs = [], []
+        self._carry = array("h")
+
+    def feed(self, samples):
+        buf = self._carry
+        buf.extend(samples)
+        full = len(buf) // self.per_bucket
+        if full:
+            end = full * self.per_bucket
+            self._reduce(buf[:end], full)
+            self._carry = buf[end:]
+
+    def _reduce(self, block, count):
+        if np is not None:
+            m = np.frombuffer(block, dtype=np.int16).reshape(count, self.per_bucket)
+            self.mins.extend((m.min(axis=1) / 32768.0).tolist())
+            self.maxs.extend((m.max(axis=1) / 32768.0).tolist())
+            return
+        step = self.per_bucket
+        for i in range(count):
+            part = block[i * step:(i + 1) * step]
+            self.mins.append(min(part) / 32768.0)
+            self.maxs.append(max(part) / 32768.0)
+
+    def finish(self):
+        if self._carry:
+            self._reduce_tail(self._carry)
+            self._carry = array("h")
+        mins, maxs, n = self.mins, self.maxs, len(self.mins)
+        if n > self.buckets:
+            # the length was underestimated, so there are extra buckets at the end:
+            # merge neighbours down to ``buckets`` so the whole track stays in view
+            edges = [i * n // self.buckets for i in range(self.buckets + 1)]
+            mins = [min(mins[a:b]) for a, b in zip(edges, edges[1:])]
+            maxs = [max(maxs[a:b]) for a, b in zip(edges, edges[1:])]
+        # an overestimate leaves the last buckets empty: pad with silence
+        pad = self.buckets - len(mins)
+        return mins + [0.0] * pad, maxs + [0.0] * pad
+
+    def _reduce_tail(self, part):
+        self.mins.append(min(part) / 32768.0)
+        self.maxs.append(max(part) / 32768.0)
+
+
+def _to_int16(raw, width):
+    """Convert little-endian PCM of ``width`` bytes per sample to an int16 array."""
+    if width == 2:
+        return array("h", raw)
+    if np is not None:
+        if width == 1:
+            return array("h", ((np.frombuffer(raw, np.uint8).astype(np.int16) - 128) << 8).tobytes())
+        if width == 4:
+            return array("h", (np.frombuffer(raw, np.int32) >> 16).astype(np.int16).tobytes())
+        if width == 3:
+            b = np.frombuffer(raw, np.uint8).reshape(-1, 3)
+            return array("h", (b[:, 1].astype(np.uint16) | (b[:, 2].astype(np.uint16) << 8)).astype(np.int16).tobytes())
+    step = width
+    out = array("h")
+    for i in range(0, len(raw) - step + 1, step):
+        if width == 1:
+            out.append((raw[i] - 128) << 8)
+        else:
+            out.append(int.from_bytes(raw[i + step - 2:i + step], "little", signed=True))
+    return out
+
+
+def compute_peaks(path, buckets=BUCKETS, duration=None, cancelled=lambda: False):
+    """Return ``(mins, maxs)`` for ``path`` or None if it cannot be decoded here."""
+    if path.lower().endswith(".wav"):
+        try:
+            return _peaks_wav(path, buckets, cancelled)
+        except wave.Error:
+            pass  # compressed WAV: let ffmpeg try
+    if shutil.which("ffmpeg") and duration:
+        return _peaks_ffmpeg(path, buckets, duration, cancelled)
+    return None
+
+
+def _peaks_wav(path, buckets, cancelled):
+    with wave.open(path, "rb") as w:
+        width, channels = w.getsampwidth(), w.getnchannels()
+        reducer = PeakReducer(w.getnframes() * channels, buckets)
+        while True:
+            if cancelled():
+                raise Cancelled()
+            raw = w.readframes(CHUNK_SAMPLES // channels)
+            if not raw:
+                break
+            reducer.feed(_to_int16(raw, width))
+    return reducer.finish()
+
+
+def _peaks_ffmpeg(path, buckets, duration, cancelled):
+    cmd = ["ffmpeg", "-v", "quiet", "-i", path, "-f", "s16le", "-ac", "1",
+           "-ar", str(FFMPEG_RATE), "-"]
+    reducer = PeakReducer(duration * FFMPEG_RATE, buckets)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stdin=subprocess.DEVNULL)
+    try:
+        while True:
+            if cancelled():
+                raise Cancelled()
+            raw = proc.stdout.read(CHUNK_SAMPLES * 2)
+            if not raw:
+                break
+            if len(raw) & 1:
+                raw += proc.stdout.read(1)
+            reducer.feed(array("h", raw[:len(raw) & ~1]))
+    finally:
+        proc.kill()
+        proc.wait()
+    return reducer.finish()
+
+
+# ----- worker process -----
+
+_generation = None
+
+
+def _init_worker(generation):
+    global _generation
+    _generation = generation
+
+
+def _job(path, buckets, duration, gen):
+    def cancelled():
+        return _generation is not None and _generation.value != gen
+    try:
+        return compute_peaks(path, buckets, duration, cancelled)
+    except Cancelled:
+        return None
+
+
+# ----- disk cache -----
+
+def cache_path(path, buckets=BUCKETS, cache_dir=CACHE_DIR):
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{buckets}"
+    return os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".peaks")
+
+
+def load_cached(path, buckets=BUCKETS, cache_dir=CACHE_DIR):
+    try:
+        data = array("f")
+        with open(cache_path(path, buckets, cache_dir), "rb") as f:
+            data.frombytes(f.read())
+    except (OSError, ValueError):
+        return None
+    if len(data) != 2 * buckets:
+        return None
+    return data[:buckets].tolist(), data[buckets:].tolist()
+
+
+def save_cached(path, peaks, buckets=BUCKETS, cache_dir=CACHE_DIR):
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path(path, buckets, cache_dir), "wb") as f:
+            array("f", peaks[0] + peaks[1]).tofile(f)
+    except OSError as e:
+        print("Waveform cache save error:", e)
+
+
+class WaveformService:
+    """Computes peaks in one worker process; only the latest request is kept alive.
+
+    ``callback(path, peaks)`` runs on an executor thread; ``peaks`` is
+    ``(mins, maxs)`` or None.
+    """
+
+    def __init__(self, buckets=BUCKETS, cache_dir=CACHE_DIR):
+        self.buckets = buckets
+        self.cache_dir = cache_dir
+        self._generation = multiprocessing.Value("i", 0)
+        self._pool = None
+
+    def request(self, path, duration, callback):
+        cached = load_cached(path, self.buckets, self.cache_dir)
+        if cached:
+            self.cancel()
+            callback(path, cached)
+            return
+        gen = self.cancel()
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=1, initializer=_init_worker,
+                                             initargs=(self._generation,))
+        fut = self._pool.submit(_job, path, self.buckets, duration, gen)
+        fut.add_done_callback(lambda f: self._done(path, f, callback))
+
+    def cancel(self):
+        """Invalidate every queued or running job; returns the new generation."""
+        with self._generation.get_lock():
+            self._generation.value += 1
+            return self._generation.value
+
+    def _done(self, path, fut, callback):
+        try:
+            peaks = fut.result()
+        except Exception as e:
+            print(f"Waveform failed for {path}: {e}")
+            peaks = None
+        if peaks:
+            save_cached(path, peaks, self.buckets, self.cache_dir)
+            callback(path, peaks)
+
+    def shutdown(self):
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
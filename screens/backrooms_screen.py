@@ -1,61 +1,35 @@
 # screens/converted/backrooms_screen.py
-import os, json
+import os
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.button import Button
 from kivy.uix.popup import Popup
-from kivy.uix.filechooser import FileChooserIconView
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.gridlayout import GridLayout
 
-# Filenames it will try automatically
-POSSIBLE_FILENAMES = ("backrooms_data.json", "backrooms_levels.json")
-# File to persist a user-selected JSON path
-PATH_SAVE = "backrooms_json_path.txt"
-
-def find_levels_json():
-    """Try: saved path -> working dir -> project root -> screens dir."""
-    # 1) saved explicit path
-    if os.path.exists(PATH_SAVE):
-        p = open(PATH_SAVE, encoding="utf-8").read().strip()
-        if p and os.path.exists(p):
-            return p
-
-    # 2) working dir
-    for fn in POSSIBLE_FILENAMES:
-        if os.path.exists(fn):
-            return os.path.abspath(fn)
-
-    # 3) project root (two levels up)
-    base = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-    for fn in POSSIBLE_FILENAMES:
-        p = os.path.join(base, fn)
-        if os.path.exists(p):
-            return os.path.abspath(p)
-
-    # 4) same dir as this file
-    for fn in POSSIBLE_FILENAMES:
-        p = os.path.join(os.path.dirname(__file__), fn)
-        if os.path.exists(p):
-            return os.path.abspath(p)
-
-    return None
-
-def load_levels_from_file(path):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        print("Backrooms JSON load error:", e)
-        return {}
+from core.backrooms import (
+    find_levels_sources, looked_in, load_levels_from_sources, save_sources, find_level,
+)
+from core import metrics
+from services.tasks import runner
+from widgets.file_picker import FilePicker
+
+LOAD_TIME = metrics.histogram("backrooms.load_seconds", "Backrooms level JSON load time")
+LEVELS = metrics.gauge("backrooms.levels", "Levels in the loaded JSON")
+FILES = metrics.gauge("backrooms.files", "JSON files merged into the loaded levels")
+CONFLICTS = metrics.gauge("backrooms.conflicts", "Level fields that differed between JSON files")
+SEARCHES = metrics.counter("backrooms.searches", "Level searches")
+SEARCH_MISSES = metrics.counter("backrooms.search_misses", "Level searches with no match")
 
 class BackroomsScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.levels = {}
-        self.json_path = None
+        self.sources = []        # JSON files and/or folders of .json shards, in precedence order
+        self.load_report = None  # merge report of the last load (core.backrooms.merge_shards)
+        self._load_task = None
 
         root = BoxLayout(orientation="vertical", padding=10, spacing=8)
 
@@ -73,9 +47,14 @@ class BackroomsScreen(Screen):
 
         root.add_widget(top)
 
-        # info area that shows where app looked or saved path
-        self.info_label = Label(text="", size_hint_y=None, height=30)
-        root.add_widget(self.info_label)
+        # info area that shows where app looked or saved path, and the merge report
+        info_row = BoxLayout(size_hint_y=None, height=30, spacing=8)
+        self.info_label = Label(text="")
+        info_row.add_widget(self.info_label)
+        self.report_btn = Button(text="Report", size_hint_x=None, width=90, disabled=True)
+        self.report_btn.bind(on_release=self.show_load_report)
+        info_row.add_widget(self.report_btn)
+        root.add_widget(info_row)
 
         # scrollable content grid
         sv = ScrollView()
@@ -94,37 +73,50 @@ class BackroomsScreen(Screen):
         self.try_load_json()
 
     def try_load_json(self, force_search=False):
-        """Attempt to load levels. If force_search True, ignore saved path and auto-find again."""
-        # If user has previously saved a path, prefer it unless force_search True
-        if not force_search and os.path.exists(PATH_SAVE):
-            p = open(PATH_SAVE, encoding="utf-8").read().strip()
-            if p:
-                self.json_path = p if os.path.exists(p) else None
-
-        # If no saved/valid path, try autofind
-        if not self.json_path:
-            self.json_path = find_levels_json()
+        """Attempt to load levels. If force_search True, ignore the current sources and auto-find again."""
+        # saved sources (files or folders) win; otherwise auto-find one file or shard folder
+        if force_search or not any(os.path.exists(p) for p in self.sources):
+            self.sources = find_levels_sources()
+        sources = [p for p in self.sources if os.path.exists(p)]
 
         # update info label with where it looked
-        looked = []
-        if os.path.exists(PATH_SAVE):
-            saved = open(PATH_SAVE, encoding="utf-8").read().strip()
-            looked.append(f"Saved path: {saved}" if saved else "Saved path: <empty>")
-        looked.extend([os.path.abspath(p) for p in POSSIBLE_FILENAMES if os.path.exists(p)])
-        # Include checks we attempted
-        if not looked:
-            looked = ["Checked working dir, project root, and screens folder for: " + ", ".join(POSSIBLE_FILENAMES)]
-
-        self.info_label.text = "JSON: " + (self.json_path if self.json_path else "not found — " + "; ".join(looked))
-
-        # load
-        if self.json_path and os.path.exists(self.json_path):
-            self.levels = load_levels_from_file(self.json_path) or {}
-            try:
-                # ensure keys are strings
-                self.levels = {str(k): v for k, v in self.levels.items()}
-            except Exception:
-                pass
+        looked = looked_in()
+
+        if not sources:
+            self.info_label.text = "JSON: not found — " + "; ".join(looked)
+        elif len(sources) == 1:
+            self.info_label.text = "JSON: " + sources[0]
+        else:
+            self.info_label.text = f"JSON: {len(sources)} sources"
+
+        # load on a worker; a newer load supersedes one still running
+        if self._load_task is not None:
+            self._load_task.cancel()
+        if sources:
+            self.grid.clear_widgets()
+            self.grid.add_widget(Label(text="Loading levels...", size_hint_y=None, height=30))
+            self._load_task = runner().submit(self._load_levels, sources, runner().process_pool(),
+                                              on_done=lambda result: self._levels_loaded(result, looked),
+                                              on_error=lambda e: self._load_failed(e, looked))
+        else:
+            self._levels_loaded(None, looked)
+
+    @staticmethod
+    def _load_levels(sources, pool):
+        # runs on a task-runner thread; shards are parsed on the runner's process pool
+        with LOAD_TIME.time():
+            return load_levels_from_sources(sources, executor=pool)
+
+    def _levels_loaded(self, result, looked):
+        self._load_task = None
+        if result is not None:
+            levels, report = result
+            self.levels = levels
+            self.load_report = report
+            LEVELS.set(len(levels))
+            FILES.set(report["files"])
+            CONFLICTS.set(len(report["conflicts"]))
+            self._show_report_summary(report)
 
         # show helpful messaging
         if not self.levels:
@@ -134,50 +126,89 @@ class BackroomsScreen(Screen):
             # show what was tried
             for line in (looked if looked else []):
                 self.grid.add_widget(Label(text=line, size_hint_y=None, height=20))
+        elif self.search_input.text.strip():
+            # rebuilt after eviction: show what was searched for
+            self.perform_search()
         else:
             # display the first level available
             first_key = next(iter(self.levels))
             self.display_level(self.levels[first_key])
 
+    def _load_failed(self, error, looked):
+        # e.g. the process pool broke; keep whatever was loaded before and say what happened
+        print("Backrooms load failed:", error)
+        self.info_label.text = f"JSON: load failed — {error}"
+        self._levels_loaded(None, looked)
+
     def open_file_chooser(self, *a):
-        chooser = FileChooserIconView(path=".", filters=['*.json'], multiselect=False)
-        btn = Button(text="Select", size_hint_y=None, height=40)
-        layout = BoxLayout(orientation='vertical')
+        # tap one or more .json files, or use the whole folder being shown
+        chooser = FilePicker("backrooms", filters=(".json",), multiselect=True)
+        layout = BoxLayout(orientation="vertical")
         layout.add_widget(chooser)
-        layout.add_widget(btn)
-        popup = Popup(title="Locate backrooms .json file", content=layout, size_hint=(0.9, 0.9))
-        def _select(inst):
-            if chooser.selection:
-                chosen = chooser.selection[0]
-                if os.path.exists(chosen):
-                    # persist choice
-                    with open(PATH_SAVE, "w", encoding="utf-8") as f:
-                        f.write(os.path.abspath(chosen))
-                    self.json_path = os.path.abspath(chosen)
-                    popup.dismiss()
-                    self.try_load_json()
-                else:
-                    Popup(title="Error", content=Label(text="File not found."), size_hint=(0.6,0.4)).open()
-            else:
-                popup.dismiss()
-        btn.bind(on_release=_select)
+        btn_row = BoxLayout(size_hint_y=None, height=40, spacing=6)
+        files_btn = Button(text="Use selected files")
+        folder_btn = Button(text="Use this folder")
+        btn_row.add_widget(files_btn)
+        btn_row.add_widget(folder_btn)
+        layout.add_widget(btn_row)
+        popup = Popup(title="Locate backrooms .json files or a folder", content=layout, size_hint=(0.9, 0.9))
+        popup.bind(on_dismiss=lambda *a: chooser.remember())
+
+        def _use(paths):
+            popup.dismiss()
+            paths = [p for p in paths if os.path.exists(p)]
+            if not paths:
+                Popup(title="Error", content=Label(text="File not found."), size_hint=(0.6,0.4)).open()
+                return
+            # persist choice
+            save_sources(paths)
+            self.sources = [os.path.abspath(p) for p in paths]
+            self.try_load_json()
+
+        files_btn.bind(on_release=lambda inst: _use(list(chooser.selection)))
+        folder_btn.bind(on_release=lambda inst: _use([chooser.path]))
         popup.open()
 
+    def _show_report_summary(self, report):
+        notes = []
+        if report["files"] > 1:
+            notes.append(f"{report['files']} files, {report['levels']} levels")
+        if report["duplicates"]:
+            notes.append(f"{report['duplicates']} duplicates merged")
+        if report["conflicts"]:
+            notes.append(f"{len(report['conflicts'])} conflicts")
+        if report["errors"]:
+            notes.append(f"{len(report['errors'])} skipped")
+        for err in report["errors"]:
+            print("Backrooms JSON load error:", err["file"], "-", err["error"])
+        if notes:
+            self.info_label.text += " (" + ", ".join(notes) + ")"
+        self.report_btn.disabled = not (report["conflicts"] or report["errors"] or report["duplicates"])
+
+    def show_load_report(self, *a):
+        report = self.load_report
+        if not report:
+            return
+        lines = [f"{report['files']} files, {report['levels']} levels, {report['duplicates']} duplicate entries merged"]
+        for err in report["errors"]:
+            lines.append(f"Skipped in {err['file']}: {err['error']}")
+        for c in report["conflicts"]:
+            lines.append(f"Level {c['level']} / {c['field']}: kept {os.path.basename(c['kept'])}, "
+                         f"replaced {os.path.basename(c['dropped'] or '?')}")
+        text = Label(text="\n".join(lines), size_hint_y=None, halign="left", valign="top")
+        text.bind(width=lambda inst, w: setattr(inst, "text_size", (w, None)),
+                  texture_size=lambda inst, ts: setattr(inst, "height", ts[1]))
+        sv = ScrollView()
+        sv.add_widget(text)
+        Popup(title="Backrooms load report", content=sv, size_hint=(0.9, 0.8)).open()
+
     def perform_search(self, *a):
-        q = self.search_input.text.strip().lower()
-        if not q:
+        if not self.search_input.text.strip():
             return
-        entry = None
-        # numeric keys
-        if q.isdigit():
-            entry = self.levels.get(q)
-        if not entry:
-            for k, v in self.levels.items():
-                nick = str(v.get("nickname", "")).lower()
-                if q in nick or q == k:
-                    entry = v
-                    break
+        SEARCHES.inc()
+        entry = find_level(self.levels, self.search_input.text)
         if not entry:
+            SEARCH_MISSES.inc()
             self.grid.clear_widgets()
             self.grid.add_widget(Label(text="Not found.", size_hint_y=None, height=30))
             return
@@ -218,6 +249,17 @@ class BackroomsScreen(Screen):
         if self.manager:
             self.manager.current = "dashboard"
 
+    # idle eviction (services/screen_memory.py): the levels are reloaded from the saved sources
+    def get_state(self):
+        return {"search": self.search_input.text}
+
+    def set_state(self, state):
+        self.search_input.text = state.get("search", "")
+
+    def release(self):
+        if self._load_task is not None:
+            self._load_task.cancel()
+
     # swallow right-clicks (avoid ripple artifacts)
     def on_touch_down(self, touch):
         try:
@@ -1,13 +1,23 @@
 # screens/converted/loading_screen.py
-import os
+from kivy.app import App
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.uix.checkbox import CheckBox
+from kivy.uix.scrollview import ScrollView
 from kivy.clock import Clock
-from kivy.graphics import Color, Rectangle
+
+from core.scheduler import TimerScheduler
+from core.state_store import get_store
+from core.timer import fmt_hms
+from widgets.progress_bar import FlatProgressBar
+from services.tasks import runner
+
+SETTINGS_NS = "timer"  # session store key (core/state_store.py)
+# never carried into a new session: a restored shutdown box is too easy to miss
+UNSAVED = ("shutdown",)
 
 
 class LoadingTimerScreen(Screen):
@@ -26,11 +36,17 @@ class LoadingTimerScreen(Screen):
         time_layout.add_widget(self.seconds_input)
         layout.add_widget(time_layout)
 
-        # Shutdown toggle
+        # Completion actions
         toggle_layout = BoxLayout(orientation="horizontal", spacing=10, size_hint_y=None, height=30)
         self.shutdown_checkbox = CheckBox(size_hint=(None, None), size=(25, 25))
+        self.sound_checkbox = CheckBox(size_hint=(None, None), size=(25, 25))
+        self.notify_checkbox = CheckBox(size_hint=(None, None), size=(25, 25))
         toggle_layout.add_widget(Label(text="Shutdown after completion:", size_hint_x=None, width=220))
         toggle_layout.add_widget(self.shutdown_checkbox)
+        toggle_layout.add_widget(Label(text="Sound:", size_hint_x=None, width=60))
+        toggle_layout.add_widget(self.sound_checkbox)
+        toggle_layout.add_widget(Label(text="Notify:", size_hint_x=None, width=60))
+        toggle_layout.add_widget(self.notify_checkbox)
         layout.add_widget(toggle_layout)
 
         # Start button
@@ -38,13 +54,16 @@ class LoadingTimerScreen(Screen):
         self.start_btn.bind(on_release=self.start_timer)
         layout.add_widget(self.start_btn)
 
-        # Time remaining label
+        # Status line (validation errors, number of running timers)
         self.time_label = Label(text="00:00:00", size_hint_y=None, height=30)
         layout.add_widget(self.time_label)
 
-        # Progress bar area (fixed slim height)
-        self.canvas_area = BoxLayout(size_hint_y=None, height=20)
-        layout.add_widget(self.canvas_area)
+        # One row per running timer
+        self.timers_box = BoxLayout(orientation="vertical", spacing=8, size_hint_y=None)
+        self.timers_box.bind(minimum_height=self.timers_box.setter("height"))
+        scroll = ScrollView()
+        scroll.add_widget(self.timers_box)
+        layout.add_widget(scroll)
 
         # Back button
         self.back_btn = Button(text="Back", size_hint_y=None, height=40)
@@ -53,58 +72,178 @@ class LoadingTimerScreen(Screen):
 
         self.add_widget(layout)
 
-        # Internal state
-        self._progress = 0.0
-        self._duration = 0
-        self._elapsed = 0
-        self._event = None
+        # Timers live in the app-wide scheduler, so they keep running when
+        # this screen is left and come back after a restart
+        app = App.get_running_app()
+        self.scheduler = getattr(app, "scheduler", None) or TimerScheduler().start()
+        self._rows = {}     # timer id -> TimerRow
+        self._visible = False
+        self._saved_loaded = False  # last used inputs are fetched on the first visit
+        for entry in self.scheduler.entries():
+            self._add_row(entry)
+        self._update_status()
+        self.scheduler.subscribe(self._on_scheduler_event)
 
     def start_timer(self, *args):
         # Parse time inputs
         h = int(self.hours_input.text) if self.hours_input.text.isdigit() else 0
         m = int(self.minutes_input.text) if self.minutes_input.text.isdigit() else 0
         s = int(self.seconds_input.text) if self.seconds_input.text.isdigit() else 0
-        self._duration = h * 3600 + m * 60 + s
+        duration = h * 3600 + m * 60 + s
 
-        if self._duration <= 0:
+        if duration <= 0:
             self.time_label.text = "Invalid time!"
             return
 
-        self._progress = 0.0
-        self._elapsed = 0
+        actions = [name for name, box in (("shutdown", self.shutdown_checkbox),
+                                          ("sound", self.sound_checkbox),
+                                          ("notify", self.notify_checkbox)) if box.active]
+        entry = self.scheduler.add(duration, label=fmt_hms(duration), actions=actions)
+        self._add_row(entry)
+        self._update_status()
+        # the next session starts with the inputs of the last timer
+        get_store().update(SETTINGS_NS, self._saved_settings(self.get_state()))
+
+    def _add_row(self, entry):
+        if entry.id in self._rows:
+            return
+        row = TimerRow(entry, self.scheduler)
+        self._rows[entry.id] = row
+        self.timers_box.add_widget(row)
+        row.set_active(self._visible)
+
+    def _on_scheduler_event(self, event, entry):
+        # called from the scheduler thread (fired) or the UI thread
+        Clock.schedule_once(lambda dt: self._apply_event(event, entry))
+
+    def _apply_event(self, event, entry):
+        if event == "added":
+            self._add_row(entry)
+        elif event == "removed":
+            row = self._rows.pop(entry.id, None)
+            if row is not None:
+                row.set_active(False)
+                self.timers_box.remove_widget(row)
+        elif entry.id in self._rows:
+            self._rows[entry.id].refresh()
+        self._update_status()
+
+    def _update_status(self):
+        active = sum(1 for r in self._rows.values() if not r.entry.fired)
+        self.time_label.text = f"{active} timer(s) running" if active else "00:00:00"
+
+    def on_pre_enter(self, *a):
+        if not self._saved_loaded:
+            self._saved_loaded = True
+            runner().submit(lambda: get_store().settings(SETTINGS_NS), name="timer-restore",
+                            on_done=lambda saved: saved and self.set_state(self._saved_settings(saved)))
+
+    @staticmethod
+    def _saved_settings(state):
+        return {k: v for k, v in state.items() if k not in UNSAVED}
+
+    def on_enter(self, *a):
+        self._visible = True
+        for row in self._rows.values():
+            row.set_active(True)
+
+    def on_leave(self, *a):
+        # the scheduler keeps counting; only the on-screen ticking stops
+        self._visible = False
+        for row in self._rows.values():
+            row.set_active(False)
+
+    # idle eviction (services/screen_memory.py): the timers themselves live in the scheduler
+    def get_state(self):
+        return {"hours": self.hours_input.text, "minutes": self.minutes_input.text,
+                "seconds": self.seconds_input.text, "shutdown": self.shutdown_checkbox.active,
+                "sound": self.sound_checkbox.active, "notify": self.notify_checkbox.active}
+
+    def set_state(self, state):
+        self._saved_loaded = True
+        self.hours_input.text = state.get("hours", "")
+        self.minutes_input.text = state.get("minutes", "")
+        self.seconds_input.text = state.get("seconds", "")
+        self.shutdown_checkbox.active = state.get("shutdown", False)
+        self.sound_checkbox.active = state.get("sound", False)
+        self.notify_checkbox.active = state.get("notify", False)
+
+    def release(self):
+        self.scheduler.unsubscribe(self._on_scheduler_event)
+        for row in self._rows.values():
+            row.set_active(False)
+
+
+class TimerRow(BoxLayout):
+    """One scheduled countdown: remaining time, pause/resume, remove, and a slim progress bar.
+
+    While active the row sleeps until the next visible change (a new second
+    on the label or a new pixel on the bar) instead of polling.
+    """
+
+    def __init__(self, entry, scheduler, **kwargs):
+        super().__init__(orientation="vertical", spacing=4, size_hint_y=None, height=64, **kwargs)
+        self.entry = entry
+        self.timer = entry.timer
+        self.scheduler = scheduler
+        self._event = None
+        self._active = False
+
+        top = BoxLayout(orientation="horizontal", spacing=10, size_hint_y=None, height=40)
+        name = self.timer.label + (f" ({', '.join(entry.actions)})" if entry.actions else "")
+        top.add_widget(Label(text=name, size_hint_x=0.35))
+        self.time_label = Label(text=self.timer.display(), size_hint_x=0.35)
+        top.add_widget(self.time_label)
+        self.pause_btn = Button(text="Pause", size_hint_x=0.15)
+        self.pause_btn.bind(on_release=self.toggle_pause)
+        top.add_widget(self.pause_btn)
+        remove_btn = Button(text="X", size_hint_x=0.15)
+        remove_btn.bind(on_release=lambda x: self.scheduler.remove(self.entry.id))
+        top.add_widget(remove_btn)
+        self.add_widget(top)
+
+        # Progress bar (fixed slim height)
+        self.bar = FlatProgressBar(size_hint_y=None, height=20, inset=10)
+        self.add_widget(self.bar)
+        self.refresh()
+
+    def set_active(self, active):
+        self._active = active
+        self.refresh()
+
+    def refresh(self):
+        self.pause_btn.disabled = self.entry.fired
+        self.pause_btn.text = "Resume" if self.timer.paused else "Pause"
+        self._tick_ui()
+        self.schedule()
+
+    def schedule(self):
+        self.cancel()
+        if not self._active:
+            return
+        delay = self.timer.next_change(int(self.bar.bar_width))
+        if delay is not None:
+            self._event = Clock.schedule_once(self._tick, delay)
+
+    def cancel(self):
         if self._event:
-            Clock.unschedule(self._event)
-        self._event = Clock.schedule_interval(self._update_timer, 0.1)
-
-    def _update_timer(self, dt):
-        self._elapsed += dt
-        self._progress = min(1.0, self._elapsed / self._duration)
-        self._draw_progress()
-
-        remaining = max(0, int(self._duration - self._elapsed))
-        h = remaining // 3600
-        m = (remaining % 3600) // 60
-        s = remaining % 60
-        self.time_label.text = f"{h:02d}:{m:02d}:{s:02d}"
-
-        if self._elapsed >= self._duration:
-            Clock.unschedule(self._event)
+            self._event.cancel()
             self._event = None
-            if self.shutdown_checkbox.active:
-                os.system("shutdown /s /t 1")
-
-    def _draw_progress(self, *a):
-        self.canvas_area.canvas.clear()
-        with self.canvas_area.canvas:
-            w = max(10, self.canvas_area.width - 20)
-            h = self.canvas_area.height
-            x = self.canvas_area.x + 10
-            y = self.canvas_area.y
-
-            # Background
-            Color(0.18, 0.18, 0.18)
-            Rectangle(pos=(x, y), size=(w, h))
-
-            # Progress bar
-            Color(0.12, 0.7, 0.9)
-            Rectangle(pos=(x, y), size=(w * self._progress, h))
+
+    def toggle_pause(self, *a):
+        if self.timer.running:
+            self.scheduler.pause(self.entry.id)
+        else:
+            self.scheduler.resume(self.entry.id)
+        self.refresh()
+
+    def _tick(self, dt):
+        self._event = None
+        self._tick_ui()
+        self.schedule()
+
+    def _tick_ui(self):
+        text = self.timer.display()
+        if self.time_label.text != text:
+            self.time_label.text = text
+        self.bar.value = self.timer.progress()
@@ -5,16 +5,7 @@ from kivy.uix.textinput import TextInput
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 
-MORSE = {
- 'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.',
- 'G': '--.', 'H': '....', 'I': '..', 'J': '.---','K': '-.-', 'L': '.-..',
- 'M': '--', 'N': '-.', 'O': '---', 'P': '.--.', 'Q': '--.-', 'R': '.-.',
- 'S': '...', 'T': '-', 'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-',
- 'Y': '-.--', 'Z': '--..', '0': '-----','1': '.----','2': '..---',
- '3': '...--','4': '....-','5': '.....','6': '-....','7': '--...',
- '8': '---..','9': '----.',' ': '/'
-}
-REVERSE = {v:k for k,v in MORSE.items()}
+from core.morse import text_to_morse, morse_to_text
 
 class MorseScreen(Screen):
     def __init__(self, **kwargs):
@@ -41,20 +32,18 @@ class MorseScreen(Screen):
         self.add_widget(root)
 
     def text_to_morse(self, *a):
-        s = self.input.text.upper()
-        out = []
-        for ch in s:
-            out.append(MORSE.get(ch, '?'))
-        self.output.text = ' '.join(out)
+        self.output.text = text_to_morse(self.input.text)
 
     def morse_to_text(self, *a):
-        s = self.input.text.strip()
-        words = s.split(' / ')
-        out_words = []
-        for w in words:
-            chars = w.split()
-            out_words.append(''.join(REVERSE.get(c,'?') for c in chars))
-        self.output.text = ' '.join(out_words)
+        self.output.text = morse_to_text(self.input.text)
+
+    # idle eviction (services/screen_memory.py)
+    def get_state(self):
+        return {"input": self.input.text, "output": self.output.text}
+
+    def set_state(self, state):
+        self.input.text = state.get("input", "")
+        self.output.text = state.get("output", "")
 
     def go_back(self, *a):
         if self.manager:
@@ -2,24 +2,42 @@
 import os, sys, subprocess
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
-from kivy.uix.filechooser import FileChooserIconView
 from kivy.uix.popup import Popup
 from kivy.uix.slider import Slider
+from kivy.uix.spinner import Spinner
+from kivy.uix.textinput import TextInput
 from kivy.clock import Clock
-import pygame
 
-AUDIO_EXTS = (".mp3", ".wav", ".ogg", ".flac", ".m4a")
+from core.audio_meta import MetadataService
+from core.library import AUDIO_EXTS, LibraryIndex
+from core.playback import PlaybackEngine, PlaybackClock, ADVANCED, FINISHED
+from core.seek_index import SeekIndexService
+from core.waveform import WaveformService
+from core import metrics
+from core.state_store import get_store
+from services.tasks import runner, BULK
+from core.playlist import PlaylistStore, track_label
+from widgets.playlist_view import PlaylistView, NORMAL_COLOR, CURRENT_COLOR
+from widgets.waveform_view import WaveformView
+from widgets.progress_bar import FlatProgressBar
+from widgets.file_picker import FilePicker
+
+# fallback poll interval for the end watch when the track length is unknown
+END_POLL = 1.0
+# the end watch also polls this long before the expected end, so the engine sees
+# the outgoing track's last position before the queued one takes over
+PRE_END_POLL = 0.25
+DURATION_MISSES = metrics.counter("music.duration_misses", "Duration lookups that had to wait for a probe")
+SAVED_PLAYLIST = "music.playlist"  # session store key (core/state_store.py)
 
 
 class MusicScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        try:
-            pygame.mixer.init()
-        except Exception:
-            pass
+        # pygame and the mixer are loaded by core.playback when the first track plays
 
         root = BoxLayout(orientation="vertical", padding=8, spacing=8)
 
@@ -32,15 +50,35 @@ class MusicScreen(Screen):
         top.add_widget(self.autonext_btn)
         root.add_widget(top)
 
-        # big timeline bar (cosmetic but updated to reflect position)
-        self.timeline = Slider(min=0, max=1, value=0, size_hint_y=None, height=56)
-        root.add_widget(self.timeline)
+        # big timeline bar over the track's waveform; drag it to scrub
+        timeline_box = FloatLayout(size_hint_y=None, height=56)
+        self.waveform_view = WaveformView(size_hint=(1, 1), pos_hint={"x": 0, "y": 0})
+        timeline_box.add_widget(self.waveform_view)
+        self.played_bar = FlatProgressBar(size_hint=(1, 1), pos_hint={"x": 0, "y": 0},
+                                          bar_color=[0.3, 0.55, 0.8, 0.25], back_color=[0, 0, 0, 0])
+        timeline_box.add_widget(self.played_bar)
+        self.timeline = Slider(min=0, max=1, value=0, size_hint=(1, 1), pos_hint={"x": 0, "y": 0})
+        self.timeline.bind(on_touch_down=self._on_timeline_down, on_touch_up=self._on_timeline_up)
+        self.timeline.bind(value=self.played_bar.setter("value"), max=self.played_bar.setter("max"))
+        timeline_box.add_widget(self.timeline)
+        root.add_widget(timeline_box)
         self.time_label = Label(text="00:00 / 00:00", size_hint_y=None, height=28)
         root.add_widget(self.time_label)
 
-        # playlist UI
-        self.playlist_box = BoxLayout(orientation="vertical", size_hint_y=0.4)
-        root.add_widget(self.playlist_box)
+        # playlist UI: search + sort over a virtualized list
+        filter_row = BoxLayout(size_hint_y=None, height=36, spacing=6)
+        self.search_input = TextInput(hint_text="Search title, artist, album or file", multiline=False)
+        self.search_input.bind(text=lambda *a: self._filter_trigger())
+        filter_row.add_widget(self.search_input)
+        self.sort_spinner = Spinner(text="Added", values=["Added", "Name", "Title", "Artist", "Album", "Duration"],
+                                    size_hint_x=None, width=120)
+        self.sort_spinner.bind(text=lambda *a: self._refresh_playlist_ui())
+        filter_row.add_widget(self.sort_spinner)
+        root.add_widget(filter_row)
+
+        self.playlist_view = PlaylistView(size_hint_y=0.4)
+        self.playlist_view.bind(on_track=lambda inst, path: self.select_and_play(self.playlist.index(path)))
+        root.add_widget(self.playlist_view)
 
         # controls row
         controls = BoxLayout(size_hint_y=None, height=48, spacing=6)
@@ -73,44 +111,141 @@ class MusicScreen(Screen):
         self.add_widget(root)
 
         # playback state
-        self.playlist = []
+        self.playlist = PlaylistStore()
         self.current_index = None
         self.playing = False
         self.autonext = True
-        self.update_ev = None
-        self._durations = {}           # cached durations
-        self.current_start_pos = 0.0   # absolute start position (seconds) for current play
+        self._update_ev = None           # per-second UI tick (visible only)
+        self._end_ev = None              # one-shot wakeup at the expected track end
+        self._visible = False
+        self._shown_second = None
+        self.clock = PlaybackClock()
+        self.seeker = SeekIndexService()  # frame/offset tables built in the background
+        self._scrubbing = False
+        self.waveforms = WaveformService()  # peaks computed in a worker process
+        self.meta = MetadataService()  # header-only probing, persisted to disk
+        self.engine = PlaybackEngine()  # reads the next track ahead and queues it
+        self._duration_known = False
+        self._meta_dirty = set()
+        self._highlighted = None
+        self.library = LibraryIndex()
+        self._library_restored = False
+        self._meta_trigger = Clock.create_trigger(self._flush_meta, 0.25)
+        self._filter_trigger = Clock.create_trigger(lambda dt: self._refresh_playlist_ui(), 0.2)
 
     # ----- loading & playlist UI -----
     def load_songs(self, *a):
-        chooser = FileChooserIconView(path=".", multiselect=True)
+        # tap files to select them; "Add folder" scans the folder being shown
+        chooser = FilePicker("music", filters=AUDIO_EXTS, multiselect=True)
         popup_layout = BoxLayout(orientation="vertical")
         popup_layout.add_widget(chooser)
-        select_btn = Button(text="Add selected", size_hint_y=None, height=40)
-        popup_layout.add_widget(select_btn)
-        popup = Popup(title="Select audio files", content=popup_layout, size_hint=(0.9, 0.9))
+        btn_row = BoxLayout(size_hint_y=None, height=40, spacing=6)
+        select_btn = Button(text="Add selected")
+        folder_btn = Button(text="Add folder (recursive)")
+        btn_row.add_widget(select_btn)
+        btn_row.add_widget(folder_btn)
+        popup_layout.add_widget(btn_row)
+        popup = Popup(title="Select audio files or a folder", content=popup_layout, size_hint=(0.9, 0.9))
+        popup.bind(on_dismiss=lambda *a: chooser.remember())
 
         def do_add(inst):
-            added = 0
-            for p in chooser.selection:
-                if os.path.isfile(p) and p.lower().endswith(AUDIO_EXTS):
-                    if p not in self.playlist:
-                        self.playlist.append(p)
-                        added += 1
-            if added:
-                self._refresh_playlist_ui()
+            self.add_tracks(list(chooser.selection))
+            popup.dismiss()
+
+        def do_add_folder(inst):
+            self.scan_folder(chooser.path)
             popup.dismiss()
 
         select_btn.bind(on_release=do_add)
+        folder_btn.bind(on_release=do_add_folder)
         popup.open()
 
+    def scan_folder(self, root):
+        """Recursively add a folder's tracks; the walk runs on the bulk task lane."""
+        self.info.text = f"Scanning {os.path.basename(root) or root}..."
+
+        def work(task):
+            return self.library.scan(root, progress=task.progress, cancel=task.cancel_event)
+
+        def done(result):
+            _, stats = result
+            self.info.text = (f"{len(self.playlist)} tracks loaded "
+                              f"(scanned {stats['dirs']} folders, {stats['rescanned']} changed)")
+
+        def failed(e):
+            self.info.text = f"Scan error: {e}"
+
+        runner().submit(work, lane=BULK, pass_task=True, name="music-scan",
+                        on_progress=self.add_tracks, on_done=done, on_error=failed)
+
+    def on_pre_enter(self, *a):
+        # bring back the saved playlist, then the folders from earlier sessions;
+        # unchanged directories come from the index
+        if not self._library_restored:
+            self._library_restored = True
+            runner().submit(self._load_saved_playlist, lane=BULK, name="music-restore",
+                            on_done=self._restore_library, on_error=lambda e: self._restore_library(()))
+
+    @staticmethod
+    def _load_saved_playlist():
+        store = get_store()
+        saved = store.items(SAVED_PLAYLIST)
+        kept = [item for item in saved if os.path.isfile(item[0])]
+        if len(kept) < len(saved):
+            # drop tracks that were deleted or moved since the last session
+            store.replace_items(SAVED_PLAYLIST, kept)
+        return [path for path, _ in kept]
+
+    def _restore_library(self, paths):
+        self.add_tracks(paths, save=False)
+        for root in list(self.library.roots):
+            if os.path.isdir(root):
+                self.scan_folder(root)
+
+    def add_tracks(self, paths, save=True):
+        added = self.playlist.add(paths)
+        if not added:
+            return
+        if save:
+            get_store().append_items(SAVED_PLAYLIST, added)
+        if self._unfiltered():
+            # plain append: extend the rows instead of rebuilding the whole view
+            self.playlist_view.append_rows([self._row(p) for p in added])
+            self.info.text = f"{len(self.playlist)} tracks loaded"
+        else:
+            self._refresh_playlist_ui()
+        # cached tags and lengths come back through _on_meta like fresh probes
+        self.meta.request(added, self._on_meta)
+        if self.playing and not self.engine.queued:
+            self._prepare_next()
+
+    def _unfiltered(self):
+        return not self.search_input.text.strip() and self.sort_spinner.text == "Added"
+
+    def _row(self, path):
+        current = self.current_index is not None and self.playlist[self.current_index] == path
+        return {
+            "path": path,
+            "text": track_label(self.playlist.entry(path)),
+            "background_color": CURRENT_COLOR if current else NORMAL_COLOR,
+        }
+
     def _refresh_playlist_ui(self):
-        self.playlist_box.clear_widgets()
-        for idx, p in enumerate(self.playlist):
-            btn = Button(text=os.path.basename(p), size_hint_y=None, height=40)
-            btn.bind(on_release=lambda inst, i=idx: self.select_and_play(i))
-            self.playlist_box.add_widget(btn)
-        self.info.text = f"{len(self.playlist)} tracks loaded"
+        sort_key = self.sort_spinner.text.lower()
+        paths = self.playlist.view(self.search_input.text, sort_key)
+        self.playlist_view.set_rows([self._row(p) for p in paths])
+        shown = f" ({len(paths)} shown)" if len(paths) != len(self.playlist) else ""
+        self.info.text = f"{len(self.playlist)} tracks loaded{shown}"
+
+    def _mark_current(self, path):
+        # recolour just the rows that changed instead of rebuilding the list
+        if self._highlighted == path:
+            return
+        if self._highlighted:
+            self.playlist_view.update_row(self._highlighted, background_color=NORMAL_COLOR)
+        self.playlist_view.update_row(path, background_color=CURRENT_COLOR)
+        self._highlighted = path
+        self.playlist_view.refresh_from_data()
 
     def select_and_play(self, index):
         self.current_index = index
@@ -125,14 +260,11 @@ class MusicScreen(Screen):
         track = self.playlist[self.current_index]
         try:
             # load and play from start
-            pygame.mixer.music.load(track)
-            pygame.mixer.music.play()
-            self.current_start_pos = 0.0
+            self.engine.play(track)
             self.playing = True
-            dur = self._get_duration(track) or 0.0
-            self.timeline.max = dur if dur > 0 else 1.0
-            self.timeline.value = 0.0
-            self.time_label.text = f"0:00 / {self._fmt(dur)}"
+            self._show_track_started(track)
+            self._prepare_next()
+            self._start_tracking(0.0)
         except Exception:
             # fallback to opening externally (won't be tracked)
             try:
@@ -150,30 +282,75 @@ class MusicScreen(Screen):
                 self.playing = False
                 return
 
-        if self.update_ev:
-            self.update_ev.cancel()
-        self.update_ev = Clock.schedule_interval(self._update, 0.5)
+    def _show_track_started(self, track):
+        self._mark_current(track)
+        self.seeker.request(track)
+        dur = self._get_duration(track) or 0.0
+        self.waveform_view.clear()
+        self.waveforms.request(track, dur, self._on_waveform)
+        self._duration_known = dur > 0
+        self.timeline.max = dur if dur > 0 else 1.0
+        self.timeline.value = 0.0
+        self.time_label.text = f"0:00 / {self._fmt(dur)}"
+
+    def _next_index(self):
+        if self.current_index is None:
+            return 0
+        return (self.current_index + 1) % len(self.playlist)
+
+    def _prepare_next(self):
+        """Read the following track ahead and queue it for a gapless switch."""
+        if not self.autonext or len(self.playlist) < 2:
+            return
+        nxt = self.playlist[self._next_index()]
+        self.engine.preload(nxt, lambda p: Clock.schedule_once(lambda dt: self._queue_next(p)))
+
+    def _queue_next(self, path):
+        # the playlist or the current track may have changed while reading ahead
+        if not self.playing or not self.autonext or self.engine.queued or not self.playlist:
+            return
+        if self.playlist[self._next_index()] == path:
+            self.engine.queue(path)
 
     def stop_music(self, *a):
-        try:
-            pygame.mixer.music.stop()
-        except Exception:
-            pass
+        self.engine.stop()
         self.playing = False
-        if self.update_ev:
-            self.update_ev.cancel()
-            self.update_ev = None
+        self._stop_tracking()
         self.time_label.text = "Stopped"
 
+    def shutdown(self):
+        """Stop playback and the background services; called by the app on exit."""
+        self.stop_music()
+        for service in (self.engine, self.meta, self.seeker, self.waveforms):
+            service.shutdown()
+
     def _update(self, dt):
-        # called periodically to update timeline and handle AutoNext
-        try:
-            busy = pygame.mixer.music.get_busy()
-        except Exception:
-            busy = False
+        # per-second UI tick, only scheduled while the screen is visible
+        self._update_ev = None
+        if self.playing and self._visible:
+            self._refresh_position()
+            self._schedule_tick()
+
+    def _check_end(self, *a):
+        """Handle a finished or advanced track; re-arms the end watch otherwise."""
+        self._end_ev = None
+        if not self.playing:
+            return
+        event = self.engine.poll()
 
-        # if not busy but we think we are playing => track likely finished
-        if self.playing and not busy:
+        if event == ADVANCED:
+            # the queued track is already playing; just catch the UI up
+            if not self.autonext:
+                self.stop_music()
+                return
+            if self.engine.current in self.playlist:
+                self.current_index = self.playlist.index(self.engine.current)
+            self._show_track_started(self.engine.current)
+            self._prepare_next()
+            self._start_tracking(0.0)
+            return
+
+        if event == FINISHED:
             if self.autonext and self.playlist:
                 # advance to next
                 if self.current_index is None:
@@ -181,36 +358,115 @@ class MusicScreen(Screen):
                 else:
                     self.current_index = (self.current_index + 1) % len(self.playlist)
                 self.play_current()
-                return
             else:
                 self.stop_music()
-                return
-
-        # update position using get_pos + current_start_pos
-        try:
-            pos_ms = pygame.mixer.music.get_pos()
-            pos = (pos_ms / 1000.0) if pos_ms >= 0 else 0.0
-            absolute = self.current_start_pos + pos
-        except Exception:
-            absolute = 0.0
-
-        # update timeline safely
-        try:
-            self.timeline.value = min(absolute, self.timeline.max)
-            self.time_label.text = f"{self._fmt(absolute)} / {self._fmt(self.timeline.max)}"
-        except Exception:
-            pass
+            return
+        self._schedule_end_watch()
+
+    def _schedule_tick(self):
+        if self._update_ev:
+            self._update_ev.cancel()
+        # wake just after the displayed second changes
+        delay = 1.0 - (self.clock.position() % 1.0) + 0.01
+        self._update_ev = Clock.schedule_once(self._update, delay)
+
+    def _schedule_end_watch(self):
+        """Wake when the track should end rather than polling all the time."""
+        if self._end_ev:
+            self._end_ev.cancel()
+        remaining = self.timeline.max - self.clock.position() if self._duration_known else 0
+        if remaining > PRE_END_POLL:
+            delay = remaining - PRE_END_POLL
+        elif remaining > 0:
+            delay = remaining + 0.05
+        else:
+            delay = END_POLL
+        self._end_ev = Clock.schedule_once(self._check_end, delay)
+
+    def _start_tracking(self, position):
+        self.clock.anchor(position)
+        self._shown_second = None
+        self._refresh_position()
+        self._schedule_end_watch()
+        if self._visible:
+            self._schedule_tick()
+
+    def _stop_tracking(self):
+        self.clock.stop()
+        for ev in (self._update_ev, self._end_ev):
+            if ev:
+                ev.cancel()
+        self._update_ev = self._end_ev = None
+
+    def _refresh_position(self):
+        if self._scrubbing:
+            return
+        absolute = min(self.clock.position(), self.timeline.max)
+        second = int(absolute)
+        if second == self._shown_second:
+            return
+        self._shown_second = second
+        self.timeline.value = absolute
+        self.time_label.text = f"{self._fmt(absolute)} / {self._fmt(self.timeline.max)}"
+
+    def on_enter(self, *a):
+        self._visible = True
+        if self.playing:
+            self._shown_second = None
+            self._refresh_position()
+            self._schedule_tick()
+
+    # keep playing if user leaves the screen; only the end watch stays armed
+    def on_leave(self, *a):
+        self._visible = False
+        if self._update_ev:
+            self._update_ev.cancel()
+            self._update_ev = None
 
     def _get_duration(self, path):
-        if path in self._durations:
-            return self._durations[path]
-        try:
-            s = pygame.mixer.Sound(path)
-            dur = s.get_length()
-            self._durations[path] = dur
-            return dur
-        except Exception:
+        # never decode on the UI thread; unknown lengths are filled in by _on_meta
+        meta = self.meta.get(path)
+        if meta is None:
+            DURATION_MISSES.inc()
+            self.meta.request([path], self._on_meta)
             return None
+        return meta.get("duration")
+
+    def _on_meta(self, path, meta):
+        # called on a metadata worker thread
+        Clock.schedule_once(lambda dt: self._apply_meta(path, meta))
+
+    def _apply_meta(self, path, meta):
+        if not meta or not self.playlist.update_meta(path, meta):
+            return
+        self._meta_dirty.add(path)
+        self._meta_trigger()
+        if self.current_index is None:
+            return
+        if self.playlist[self.current_index] == path and meta.get("duration"):
+            self.timeline.max = meta["duration"]
+            self._duration_known = True
+            self.time_label.text = f"{self._fmt(self.timeline.value)} / {self._fmt(self.timeline.max)}"
+            self.waveforms.request(path, meta["duration"], self._on_waveform)
+            if self.playing:
+                self._schedule_end_watch()
+
+    def _on_waveform(self, path, peaks):
+        # called off the UI thread; drop results for a track that is no longer current
+        def apply(dt):
+            if self.engine.current == path:
+                self.waveform_view.set_peaks(peaks)
+        Clock.schedule_once(apply)
+
+    def _flush_meta(self, dt):
+        # metadata arrives in bursts; relabel once per batch
+        dirty, self._meta_dirty = self._meta_dirty, set()
+        if not self._unfiltered():
+            self._refresh_playlist_ui()
+            return
+        for p in dirty:
+            self.playlist_view.update_row(p, text=track_label(self.playlist.entry(p)))
+        self.playlist_view.refresh_from_data()
 
     def _fmt(self, seconds):
         try:
@@ -225,42 +481,50 @@ class MusicScreen(Screen):
     def seek_relative(self, seconds):
         if not self.playlist or self.current_index is None:
             return
-        # compute current absolute position as best we can
-        try:
-            pos_ms = pygame.mixer.music.get_pos()
-            pos = (pos_ms / 1000.0) if pos_ms >= 0 else 0.0
-        except Exception:
-            pos = 0.0
-        absolute = self.current_start_pos + pos
-        new = max(0.0, absolute + seconds)
+        self.seek_absolute(self.clock.position() + seconds)
+
+    def seek_absolute(self, new):
+        if not self.playlist or self.current_index is None:
+            return
+        new = max(0.0, new)
         # clamp to length
         if hasattr(self.timeline, "max") and self.timeline.max:
             new = min(new, self.timeline.max - 0.01)
 
-        # attempt to play from new position (best-effort)
         track = self.playlist[self.current_index]
+        index = self.seeker.get(track)
         try:
-            pygame.mixer.music.stop()
-            # NOTE: pygame.mixer.music.play(start=sec) works for many formats/backends
-            pygame.mixer.music.play(start=new)
-            self.current_start_pos = new
+            if index is not None:
+                # splice the stream at the indexed frame; the position is that frame's time
+                fileobj, new = index.open_at(new)
+                self.engine.play_source(track, fileobj, os.path.splitext(track)[1].lstrip("."))
+            else:
+                # NOTE: pygame.mixer.music.play(start=sec) works for many formats/backends
+                self.engine.restart_at(new)
             self.playing = True
         except Exception:
             # fallback: try reload and play
             try:
-                pygame.mixer.music.load(track)
-                pygame.mixer.music.play()
-                self.current_start_pos = 0.0
+                self.engine.play(track)
+                new = 0.0
             except Exception:
                 pass
+        # stopping drops the queued track; read the next one ahead again
+        self._prepare_next()
 
-        # ensure update loop
-        if self.update_ev:
-            self.update_ev.cancel()
-        self.update_ev = Clock.schedule_interval(self._update, 0.5)
-        # update UI immediately
-        self.timeline.value = new
-        self.time_label.text = f"{self._fmt(new)} / {self._fmt(self.timeline.max)}"
+        # re-anchor the position clock and update UI immediately
+        self._start_tracking(new)
+
+    def _on_timeline_down(self, slider, touch):
+        if self.playing and slider.collide_point(*touch.pos):
+            self._scrubbing = True
+            touch.ud["music_scrub"] = True
+
+    def _on_timeline_up(self, slider, touch):
+        # the slider sees the release twice (normal + grabbed); seek once
+        if self._scrubbing and touch.ud.get("music_scrub"):
+            self._scrubbing = False
+            self.seek_absolute(slider.value)
 
     def prev_track(self, *a):
         if not self.playlist:
@@ -283,7 +547,6 @@ class MusicScreen(Screen):
     def _toggle_autonext(self, *a):
         self.autonext = not self.autonext
         self.autonext_btn.text = "AutoNext: ON" if self.autonext else "AutoNext: OFF"
+        if self.autonext and self.playing and not self.engine.queued:
+            self._prepare_next()
 
-    # keep playing if user leaves the screen
-    def on_leave(self, *a):
-        pass
@@ -4,8 +4,6 @@ Combined Utility Tools Screen
 Contains: Random Number, Password Generator, List Picker, Weighted Picker, and Size Converter
 """
 import os
-import random
-import string
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
@@ -14,20 +12,27 @@ from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.popup import Popup
-from kivy.uix.filechooser import FileChooserIconView
 from kivy.uix.spinner import Spinner
 from kivy.uix.checkbox import CheckBox
 from kivy.uix.switch import Switch
 
-# Constants
-SIMPLE_WORDS = [
-    "sun", "moon", "tree", "sky", "water", "fire", "earth", "wind", "rock", "star",
-    "cat", "dog", "bird", "fish", "car", "bike", "home", "code", "game", "play",
-    "love", "hope", "dream", "goal", "life", "light", "dark", "blue", "red", "fun",
-    "cool", "fast", "slow", "big", "small", "new", "old", "hot", "cold", "good"
-]
+from core.randomizer import (
+    SIMPLE_WORDS, random_number, generate_password, pick_items, parse_weighted,
+    convert_size, read_list_file,
+)
+from core.items import ItemCollection
+from core import metrics
+from core.state_store import get_store
+from services.tasks import runner
+from widgets.file_picker import open_file_picker
 
-DEFAULT_SYMBOLS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+IMPORT_ITEMS = metrics.histogram("randomizer.import_items", "Lines per imported list or wordlist")
+PASSWORD_LENGTH = metrics.histogram("randomizer.password_length", "Requested password lengths")
+
+# session store keys (core/state_store.py)
+SETTINGS_NS = "randomizer"
+SAVED_ITEMS = "randomizer.items"
+SAVED_WORDS = "randomizer.words"
 
 
 class UtilityToolsScreen(Screen):
@@ -50,8 +55,10 @@ class UtilityToolsScreen(Screen):
         self.include_numbers = True
         self.include_symbols = True
         self.include_words = False
-        self.items = []
-        self.word_list = list(SIMPLE_WORDS)
+        self.items = ItemCollection()
+        self.word_list = ItemCollection(SIMPLE_WORDS)
+        self._weighted = None  # (text, parsed ItemCollection) of the last weighted pick
+        self._saved_loaded = False  # saved session state is fetched on the first visit
         
         self.build_ui()
     
@@ -95,7 +102,7 @@ class UtilityToolsScreen(Screen):
         
         top_row.add_widget(Label(text="Silent:", size_hint_x=None, width=60))
         self.silent_switch = Switch(active=self.silent_mode, size_hint_x=None, width=60)
-        self.silent_switch.bind(active=lambda s, v: setattr(self, 'silent_mode', v))
+        self.silent_switch.bind(active=self._on_silent_change)
         top_row.add_widget(self.silent_switch)
         
         help_btn = Button(text="?", size_hint_x=None, width=50)
@@ -145,6 +152,11 @@ class UtilityToolsScreen(Screen):
         builder = mode_builders.get(text)
         if builder:
             builder()
+            get_store().set(SETTINGS_NS, "mode", text)
+    
+    def _on_silent_change(self, switch, value):
+        self.silent_mode = value
+        get_store().set(SETTINGS_NS, "silent", value)
     
     def _clear_center(self):
         """Clear the center content area"""
@@ -170,13 +182,9 @@ class UtilityToolsScreen(Screen):
     def _generate_number(self):
         """Generate a random number"""
         try:
-            lo = int(self.num_min.text)
-            hi = int(self.num_max.text)
-            if lo > hi:
-                lo, hi = hi, lo
-            return random.randint(lo, hi)
-        except:
-            return random.randint(1, 100)
+            return random_number(int(self.num_min.text), int(self.num_max.text))
+        except ValueError:
+            return random_number(1, 100)
     
     # ==================== PASSWORD GENERATOR UI ====================
     
@@ -235,60 +243,32 @@ class UtilityToolsScreen(Screen):
             length = int(self.password_length.text)
         except:
             length = 12
-        length = max(4, min(length, 200))
-        
-        charset = ""
-        if self.letters_cb.active:
-            charset += string.ascii_letters
-        if self.numbers_cb.active:
-            charset += string.digits
-        if self.symbols_cb.active:
-            charset += DEFAULT_SYMBOLS
-        
-        result_parts = []
-        
-        # Add words if enabled
-        if self.words_cb.active and self.word_list:
-            word_count = 2 if self.simple_cb.active else 1
-            word_count = min(word_count, max(1, length // 6))
-            for _ in range(word_count):
-                result_parts.append(random.choice(self.word_list))
-        
-        # Fill remaining with random characters
-        while len("".join(result_parts)) < length:
-            if charset:
-                result_parts.append(random.choice(charset))
-            else:
-                result_parts.append(random.choice(string.ascii_letters))
-        
-        random.shuffle(result_parts)
-        return "".join(result_parts)[:length]
+        PASSWORD_LENGTH.observe(length)
+        return generate_password(
+            length,
+            letters=self.letters_cb.active,
+            numbers=self.numbers_cb.active,
+            symbols=self.symbols_cb.active,
+            words=self.words_cb.active,
+            simple=self.simple_cb.active,
+            word_list=self.word_list,
+        )
     
     def _import_wordlist(self, *args):
         """Import custom wordlist from file"""
-        chooser = FileChooserIconView(path=".", filters=['*.txt'], multiselect=False)
-        btn = Button(text="Import", size_hint_y=None, height=40)
-        layout = BoxLayout(orientation='vertical')
-        layout.add_widget(chooser)
-        layout.add_widget(btn)
-        popup = Popup(title="Import Wordlist (.txt)", content=layout, size_hint=(0.9, 0.9))
-        
-        def do_import(inst):
-            if chooser.selection:
-                try:
-                    with open(chooser.selection[0], encoding='utf-8') as f:
-                        lines = [l.strip() for l in f.readlines() if l.strip()]
-                    if lines:
-                        self.word_list = lines
-                        if not self.silent_mode:
-                            self._show_popup("Success", f"Imported {len(lines)} words")
-                except Exception as e:
-                    if not self.silent_mode:
-                        self._show_popup("Error", str(e))
-            popup.dismiss()
-        
-        btn.bind(on_release=do_import)
-        popup.open()
+        def apply(lines):
+            IMPORT_ITEMS.observe(len(lines))
+            if lines:
+                self.word_list = ItemCollection(lines)
+                get_store().replace_items(SAVED_WORDS, self.word_list.names)
+                if not self.silent_mode:
+                    self._show_popup("Success", f"Imported {len(lines)} words")
+
+        def do_import(path):
+            runner().submit(read_list_file, path, on_done=apply, on_error=self._import_failed)
+
+        open_file_picker("Import Wordlist (.txt)", "randomizer.wordlist", do_import,
+                         filters=(".txt",), button_text="Import")
     
     # ==================== LIST PICKER UI ====================
     
@@ -335,42 +315,36 @@ class UtilityToolsScreen(Screen):
     def _add_item(self, *args):
         """Add item to the list"""
         name = self.name_input.text.strip()
-        if name and name not in self.items:
-            self.items.append(name)
+        if name and self.items.add(name, unique=True):
             self.name_input.text = ""
+            self._save_appended(len(self.items) - 1)
             self._refresh_list()
     
     def _clear_items(self):
         """Clear all items from the list"""
-        self.items = []
+        self.items.clear()
+        get_store().replace_items(SAVED_ITEMS, ())
         self._refresh_list()
     
     def _import_list(self, *args):
         """Import list from text file"""
-        chooser = FileChooserIconView(path=".", filters=['*.txt'], multiselect=False)
-        btn = Button(text="Import", size_hint_y=None, height=40)
-        layout = BoxLayout(orientation='vertical')
-        layout.add_widget(chooser)
-        layout.add_widget(btn)
-        popup = Popup(title="Import List from .txt", content=layout, size_hint=(0.9, 0.9))
-        
-        def do_import(inst):
-            if chooser.selection:
-                try:
-                    with open(chooser.selection[0], encoding='utf-8') as f:
-                        lines = [l.strip() for l in f.readlines() if l.strip()]
-                    for ln in lines:
-                        if ln not in self.items:
-                            self.items.append(ln)
-                    self._refresh_list()
-                except Exception as e:
-                    if not self.silent_mode:
-                        self._show_popup("Error", str(e))
-            popup.dismiss()
-        
-        btn.bind(on_release=do_import)
-        popup.open()
+        def apply(lines):
+            IMPORT_ITEMS.observe(len(lines))
+            before = len(self.items)
+            self.items.add_many(lines)
+            self._save_appended(before)
+            self._refresh_list()
+
+        def do_import(path):
+            runner().submit(read_list_file, path, on_done=apply, on_error=self._import_failed)
+
+        open_file_picker("Import List from .txt", "randomizer.list", do_import,
+                         filters=(".txt",), button_text="Import")
     
+    def _import_failed(self, e):
+        if not self.silent_mode:
+            self._show_popup("Error", str(e))
+
     def _refresh_list(self):
         """Refresh the list display"""
         if not hasattr(self, "list_grid"):
@@ -394,8 +368,14 @@ class UtilityToolsScreen(Screen):
         """Delete item from list by index"""
         if 0 <= idx < len(self.items):
             del self.items[idx]
+            get_store().replace_items(SAVED_ITEMS, self.items.names)
             self._refresh_list()
     
+    def _save_appended(self, before):
+        """Queue the items added after position ``before`` for the session store"""
+        if len(self.items) > before:
+            get_store().append_items(SAVED_ITEMS, self.items.names[before:])
+    
     def _pick_from_list(self):
         """Pick random item(s) from list"""
         if not self.items:
@@ -403,15 +383,9 @@ class UtilityToolsScreen(Screen):
         
         try:
             count = int(self.pick_count.text)
-            count = max(1, min(count, len(self.items)))
-            
-            if count == 1:
-                return random.choice(self.items)
-            else:
-                chosen = random.sample(self.items, count)
-                return ", ".join(chosen)
-        except:
-            return random.choice(self.items) if self.items else "Error"
+        except ValueError:
+            count = 1
+        return pick_items(self.items, count)
     
     # ==================== WEIGHTED PICKER UI ====================
     
@@ -436,41 +410,14 @@ class UtilityToolsScreen(Screen):
     
     def _do_weighted_pick(self):
         """Perform weighted random selection"""
-        lines = [l.strip() for l in self.weighted_area.text.splitlines() if l.strip()]
-        parsed = []
-        
-        for ln in lines:
-            if ':' in ln:
-                name, w = ln.split(':', 1)
-                try:
-                    weight = float(w.strip())
-                except:
-                    weight = 1.0
-            else:
-                name = ln.strip()
-                weight = 1.0
-            
-            if name.strip():
-                parsed.append((name.strip(), max(0.0, weight)))
-        
+        # re-parse only when the text changed; repeated picks reuse the cumulative weights
+        text = self.weighted_area.text
+        if self._weighted is None or self._weighted[0] != text:
+            self._weighted = (text, ItemCollection(parse_weighted(text.splitlines())))
+        parsed = self._weighted[1]
         if not parsed:
             return "No valid items"
-        
-        names = [p[0] for p in parsed]
-        weights = [p[1] for p in parsed]
-        total = sum(weights)
-        
-        if total <= 0:
-            return random.choice(names)
-        
-        r = random.random() * total
-        acc = 0.0
-        for n, w in zip(names, weights):
-            acc += w
-            if r <= acc:
-                return n
-        
-        return names[-1]
+        return parsed.pick()
     
     # ==================== SIZE CONVERTER UI ====================
     
@@ -504,20 +451,8 @@ class UtilityToolsScreen(Screen):
     def _convert_size(self):
         """Convert bytes to various units"""
         try:
-            size = int(self.size_input.text)
-            kb = size / 1024
-            mb = kb / 1024
-            gb = mb / 1024
-            tb = gb / 1024
-            
-            return (
-                f"Bytes: {size:,}\n"
-                f"KB: {kb:.2f}\n"
-                f"MB: {mb:.2f}\n"
-                f"GB: {gb:.2f}\n"
-                f"TB: {tb:.2f}"
-            )
-        except:
+            return convert_size(int(self.size_input.text))
+        except ValueError:
             return "Invalid number - please enter bytes as an integer"
     
     # ==================== MAIN ACTIONS ====================
@@ -586,6 +521,51 @@ class UtilityToolsScreen(Screen):
         """Show a popup message"""
         Popup(title=title, content=Label(text=message), size_hint=(0.6, 0.4)).open()
     
+    # ==================== EVICTION STATE ====================
+    
+    def get_state(self):
+        """Lightweight state kept while the screen is evicted (services/screen_memory.py)"""
+        return {
+            "mode": self.mode_spinner.text,
+            "silent": self.silent_mode,
+            "items": list(self.items),
+            "word_list": list(self.word_list),
+        }
+    
+    def set_state(self, state):
+        """Restore what get_state saved on a freshly built screen"""
+        self._saved_loaded = True
+        self.silent_switch.active = state.get("silent", self.silent_mode)
+        self.items = ItemCollection(state.get("items", []))
+        self.word_list = ItemCollection(state.get("word_list", SIMPLE_WORDS))
+        self.mode_spinner.text = state.get("mode", self.mode_spinner.text)
+    
+    # ==================== SESSION STORE ====================
+    
+    def on_pre_enter(self, *args):
+        """Fetch the previous session's lists and settings on the first visit"""
+        if not self._saved_loaded:
+            self._saved_loaded = True
+            runner().submit(self._load_saved, name="randomizer-restore", on_done=self._apply_saved)
+    
+    @staticmethod
+    def _load_saved():
+        store = get_store()
+        return store.settings(SETTINGS_NS), store.items(SAVED_ITEMS), store.items(SAVED_WORDS)
+    
+    def _apply_saved(self, saved):
+        settings, items, words = saved
+        if items:
+            # anything added before the rows arrived is in the store already; the list stays unique
+            restored = ItemCollection(items)
+            restored.add_many(self.items.names, unique=True)
+            self.items = restored
+            self._refresh_list()
+        if words:
+            self.word_list = ItemCollection(words)
+        self.silent_switch.active = settings.get("silent", self.silent_mode)
+        self.mode_spinner.text = settings.get("mode", self.mode_spinner.text)
+    
     def _go_back(self, *args):
         """Return to dashboard"""
         if self.manager:
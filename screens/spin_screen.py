@@ -6,7 +6,6 @@ from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.popup import Popup
-from kivy.uix.filechooser import FileChooserIconView
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.gridlayout import GridLayout
 from kivy.graphics import Color, Ellipse, PushMatrix, PopMatrix, Rotate, Triangle
@@ -15,15 +14,27 @@ from kivy.animation import Animation
 from math import sin, cos, radians
 import random
 
+from core.randomizer import read_list_file
+from core.items import ItemCollection
+from core.spin import plan_spin, selected_index
+from core import metrics
+from core.state_store import get_store
+from services.tasks import runner
+from widgets.file_picker import open_file_picker
+
+IMPORT_ITEMS = metrics.histogram("spin.import_items", "Names per imported .txt file")
+SAVED_ITEMS = "spin.items"  # session store key (core/state_store.py)
+
 
 class WheelWidget(FloatLayout):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.items = []
+        self.items = ItemCollection()
         self.rotation_angle = 0.0
         self._rotate = Rotate(angle=0, origin=(self.center_x, self.center_y))
         self.bind(pos=self._update_origin, size=self._update_origin)
         self._label_widgets = []
+        self._drawn_version = None
         self.highlight_index = None
 
     def _update_origin(self, *a):
@@ -31,24 +42,30 @@ class WheelWidget(FloatLayout):
         self.redraw()
 
     def set_items(self, items):
-        self.items = [dict(i) for i in items]
+        # passing the current collection back only redraws if it changed since the last draw
+        if items is self.items:
+            if items.version == self._drawn_version:
+                return
+        else:
+            self.items = ItemCollection(items)
         self.redraw()
 
     def add_item(self, name, weight=1.0):
         if name and name.strip():
-            self.items.append({'name': name.strip(), 'weight': float(weight)})
+            self.items.add(name.strip(), weight)
             self.redraw()
 
     def remove_index(self, idx):
         if 0 <= idx < len(self.items):
-            del self.items[idx]
+            self.items.remove_at(idx)
             self.redraw()
 
     def clear(self):
-        self.items = []
+        self.items.clear()
         self.redraw()
 
     def redraw(self):
+        self._drawn_version = self.items.version
         self.canvas.clear()
         # remove old labels
         for lbl in self._label_widgets:
@@ -66,7 +83,7 @@ class WheelWidget(FloatLayout):
             # Draw slices
             PushMatrix()
             self.canvas.add(self._rotate)
-            for i, it in enumerate(self.items):
+            for i in range(len(self.items)):
                 hue = (i / max(1, len(self.items)))
                 r = 0.6 + 0.4 * (0.5 + 0.5 * sin(hue * 6.28))
                 g = 0.6 + 0.4 * (0.5 + 0.5 * sin((hue + 0.33) * 6.28))
@@ -88,12 +105,12 @@ class WheelWidget(FloatLayout):
                              cx, cy + radius + 40])
 
         # Place labels (also rotated with the wheel)
-        for i, it in enumerate(self.items):
+        for i, name in enumerate(self.items.names):
             ang = (i + 0.5) * seg_angle  # Remove the rotation_angle from here
             rad = radians(ang)
             lx = cx + (radius * 0.65) * cos(rad) - 40
             ly = cy + (radius * 0.65) * sin(rad) - 12
-            lbl = Label(text=it['name'], size_hint=(None, None), size=(80, 24))
+            lbl = Label(text=name, size_hint=(None, None), size=(80, 24))
             lbl.pos = (lx, ly)
             
             # Apply the same rotation to the label
@@ -121,14 +138,7 @@ class WheelWidget(FloatLayout):
         anim.start(self)
 
     def get_selected_index(self):
-        if not self.items:
-            return None
-        eff = (self.rotation_angle % 360.0)
-        seg_angle = 360.0 / len(self.items)
-        pointer_angle = 90.0
-        relative = (pointer_angle - eff) % 360.0
-        idx = int(relative // seg_angle)
-        return idx % len(self.items)
+        return selected_index(self.rotation_angle, len(self.items))
 
 
 class SpinScreen(Screen):
@@ -174,6 +184,8 @@ class SpinScreen(Screen):
         root.add_widget(back)
 
         self.add_widget(root)
+        self._spinning = False
+        self._saved_loaded = False  # the saved wheel is fetched on the first visit
         self._refresh_list_view()
 
     def _add_name(self, *a):
@@ -184,41 +196,35 @@ class SpinScreen(Screen):
         except Exception:
             weight = 1.0
         if name:
+            before = len(self.wheel.items)
             self.wheel.add_item(name, weight)
+            self._save_appended(before)
             self.name_input.text = ""
             self.weight_input.text = ""
             self._refresh_list_view()
 
     def _import_txt(self, *a):
-        chooser = FileChooserIconView(path=".", filters=['*.txt'], multiselect=False)
-        btn = Button(text="Import", size_hint_y=None, height=36)
-        layout = BoxLayout(orientation='vertical')
-        layout.add_widget(chooser)
-        layout.add_widget(btn)
-        popup = Popup(title="Import names from .txt", content=layout, size_hint=(0.9, 0.9))
-
-        def _do_import(inst):
-            if chooser.selection:
-                fn = chooser.selection[0]
-                try:
-                    with open(fn, encoding='utf-8') as f:
-                        lines = [l.strip() for l in f.readlines() if l.strip()]
-                    for ln in lines:
-                        if not any(it['name'] == ln for it in self.wheel.items):
-                            self.wheel.add_item(ln, 1.0)
-                    self._refresh_list_view()
-                except Exception as e:
-                    Popup(title="Error", content=Label(text=str(e)), size_hint=(0.6, 0.4)).open()
-            popup.dismiss()
-
-        btn.bind(on_release=_do_import)
-        popup.open()
+        def _apply(lines):
+            IMPORT_ITEMS.observe(len(lines))
+            # one bulk add and one redraw for the whole file
+            before = len(self.wheel.items)
+            self.wheel.items.add_many(lines, unique=True)
+            self._save_appended(before)
+            self._refresh_list_view()
+
+        def _failed(e):
+            Popup(title="Error", content=Label(text=str(e)), size_hint=(0.6, 0.4)).open()
+
+        def _do_import(path):
+            runner().submit(read_list_file, path, on_done=_apply, on_error=_failed)
+
+        open_file_picker("Import names from .txt", "spin", _do_import, filters=(".txt",), button_text="Import")
 
     def _refresh_list_view(self):
         self.list_grid.clear_widgets()
-        for idx, it in enumerate(self.wheel.items):
+        for idx, (name, weight) in enumerate(self.wheel.items.pairs()):
             row = BoxLayout(size_hint_y=None, height=30)
-            lbl = Label(text=f"{it['name']} (w={it['weight']})", halign='left')
+            lbl = Label(text=f"{name} (w={weight})", halign='left')
             del_btn = Button(text="Delete", size_hint_x=None, width=80)
             del_btn.bind(on_release=lambda inst, i=idx: self._delete_name(i))
             row.add_widget(lbl)
@@ -228,6 +234,30 @@ class SpinScreen(Screen):
 
     def _delete_name(self, idx):
         self.wheel.remove_index(idx)
+        get_store().replace_items(SAVED_ITEMS, self.wheel.items.pairs())
+        self._refresh_list_view()
+
+    def _save_appended(self, before):
+        items = self.wheel.items
+        if len(items) > before:
+            get_store().append_items(SAVED_ITEMS, zip(items.names[before:], items.weights[before:]))
+
+    # session store: the wheel from the previous run is read off the UI thread on the first visit
+    def on_pre_enter(self, *a):
+        if not self._saved_loaded:
+            self._saved_loaded = True
+            runner().submit(lambda: get_store().items(SAVED_ITEMS), name="spin-restore",
+                            on_done=self._apply_saved)
+
+    def _apply_saved(self, pairs):
+        if not pairs:
+            return
+        restored = ItemCollection(pairs)
+        # names added before the restore finished were also appended to the store: skip them
+        restored.add_many(self.wheel.items.pairs(), unique=True)
+        # a new collection can share a version number with the old one, so draw it explicitly
+        self.wheel.items = restored
+        self.wheel.redraw()
         self._refresh_list_view()
 
     def _spin(self, *a):
@@ -235,28 +265,38 @@ class SpinScreen(Screen):
             Popup(title="No names", content=Label(text="Add names first."), size_hint=(0.6, 0.4)).open()
             return
 
-        n = len(self.wheel.items)
-        seg = 360.0 / n
-        chosen = random.randint(0, n - 1)
-        offset_inside = random.uniform(seg * 0.1, seg * 0.9)
-        final_relative = (chosen * seg) + offset_inside
-        pointer = 90.0
-        current = self.wheel.rotation_angle % 360.0
-        final_angle = (pointer - final_relative) % 360.0
-        full_spins = random.randint(3, 6)
-        target_degrees = current + final_angle + 360.0 * full_spins
+        _, target_degrees = plan_spin(self.wheel.items.weights, self.wheel.rotation_angle)
 
         def on_complete():
+            self._spinning = False
             idx = self.wheel.get_selected_index()
             self.wheel.highlight_index = idx
             self.wheel.redraw()
-            chosen_name = self.wheel.items[idx]['name']
+            chosen_name = self.wheel.items[idx]
             self.result_label.text = f"Selected: {chosen_name}"
             Popup(title="Winner", content=Label(text=chosen_name), size_hint=(0.6, 0.4)).open()
 
         self.wheel.highlight_index = None
+        self._spinning = True
         self.wheel.animate_rotation(target_degrees, duration=6.0 + random.random() * 2, on_complete=on_complete)
 
+    # idle eviction (services/screen_memory.py); never mid-spin
+    def can_evict(self):
+        return not self._spinning
+
+    def get_state(self):
+        return {"items": self.wheel.items.pairs(), "angle": self.wheel.rotation_angle,
+                "highlight": self.wheel.highlight_index, "result": self.result_label.text}
+
+    def set_state(self, state):
+        self._saved_loaded = True
+        self.wheel.rotation_angle = state.get("angle", 0.0)
+        self.wheel._rotate.angle = -self.wheel.rotation_angle
+        self.wheel.highlight_index = state.get("highlight")
+        self.wheel.items = ItemCollection(state.get("items", []))
+        self.result_label.text = state.get("result", "")
+        self._refresh_list_view()
+
     def _go_back(self, *a):
         if self.manager:
             self.manager.current = "dashboard"
\ No newline at end of file
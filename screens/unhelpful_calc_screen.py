@@ -4,27 +4,17 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
+from kivy.uix.spinner import Spinner
+from kivy.uix.togglebutton import ToggleButton
 from kivy.clock import Clock
 import random
 
-fake_errors = [
-    "Stnax Error: Unexpected cheese slice.",
-    "Error 404: Answer not found.",
-    "Fatal Error: You tried to divide by cucumber.",
-    "Upgrade to Premium Math to continue.",
-    "Your math privileges have expired.",
-    "Calculator tired. Try again later.",
-    "Illegal equation detected. FBI notified.",
-    "Do you even math, bro?",
-    "Processor overheated by this equation.",
-    "Result classified. Clearance required.",
-    "Unexpected Error: Universe not ready.",
-    "Nah. I’m good.",
-    "LOL. No.",
-    "Math not found. Install Linux?",
-    "Critical math failure. Report to IT.",
-    "Answer lost. Try again in 2042.",
-]
+from core.calc import Calculator, CalcError, DEFAULT_PRECISION, FAKE_ERRORS
+from core.state_store import get_store
+from services.tasks import runner
+
+SETTINGS_NS = "calc"  # session store key (core/state_store.py)
+
 
 class UnhelpfulCalcScreen(Screen):
     def __init__(self, **kwargs):
@@ -39,8 +29,22 @@ class UnhelpfulCalcScreen(Screen):
         self.display.bind(size=self.display.setter("text_size"))
         root.add_widget(self.display)
 
+        # Honest mode: really evaluate instead of pranking (prank stays the default)
+        mode_row = BoxLayout(orientation="horizontal", spacing=5, size_hint_y=0.1)
+        self.honest_toggle = ToggleButton(text="Honest mode", size_hint_x=0.4)
+        self.number_spinner = Spinner(text="Decimal", values=("Decimal", "Fraction"), size_hint_x=0.3)
+        self.precision_spinner = Spinner(text=str(DEFAULT_PRECISION), values=("16", "28", "50", "100", "500"),
+                                         size_hint_x=0.3)
+        self.number_spinner.bind(text=self._configure_engine)
+        self.precision_spinner.bind(text=self._configure_engine)
+        self.honest_toggle.bind(state=lambda *a: self._save_settings())
+        mode_row.add_widget(self.honest_toggle)
+        mode_row.add_widget(self.number_spinner)
+        mode_row.add_widget(self.precision_spinner)
+        root.add_widget(mode_row)
+
         # Buttons layout
-        grid = GridLayout(cols=4, spacing=5, size_hint_y=0.7)
+        grid = GridLayout(cols=4, spacing=5, size_hint_y=0.6)
 
         buttons = [
             "7", "8", "9", "÷",
@@ -69,22 +73,83 @@ class UnhelpfulCalcScreen(Screen):
 
         self.add_widget(root)
 
+        self.calc = Calculator()
+        self._message_shown = False
+        self._saved_loaded = False  # modes from the last session are fetched on the first visit
+
     def press(self, key):
         current = self.display.text
-        if current in fake_errors or current == "...":
+        if current in FAKE_ERRORS or current == "..." or self._message_shown:
             self.display.text = ""
+            self._message_shown = False
         self.display.text += str(key)
 
     def clear(self, *a):
         self.display.text = ""
+        self._message_shown = False
 
     def prank_result(self, *a):
+        if self.honest_toggle.state == "down":
+            self.honest_result()
+            return
         self.display.text = "..."
         # suspense delay
         Clock.schedule_once(self.display_error, 2)
 
     def display_error(self, *a):
-        self.display.text = random.choice(fake_errors)
+        self.display.text = random.choice(FAKE_ERRORS)
+
+    def honest_result(self, *a):
+        expr = self.display.text
+        try:
+            result = self.calc.evaluate(expr)
+        except CalcError as e:
+            self.display.text = str(e)
+            self._message_shown = True
+            return
+        # a plain result can be typed on; an exact fraction or approximation starts over
+        self.display.text = result
+        self._message_shown = " " in result
+
+    def _configure_engine(self, *a):
+        self.calc.configure(mode=self.number_spinner.text.lower(),
+                            precision=int(self.precision_spinner.text))
+        self._save_settings()
+
+    # session store: only the modes persist, never the display
+    def _save_settings(self):
+        get_store().update(SETTINGS_NS, {"honest": self.honest_toggle.state == "down",
+                                         "number": self.number_spinner.text,
+                                         "precision": self.precision_spinner.text})
+
+    def on_pre_enter(self, *a):
+        if not self._saved_loaded:
+            self._saved_loaded = True
+            runner().submit(lambda: get_store().settings(SETTINGS_NS), name="calc-restore",
+                            on_done=self._apply_saved)
+
+    def _apply_saved(self, saved):
+        if saved:
+            self.number_spinner.text = saved.get("number", self.number_spinner.text)
+            self.precision_spinner.text = saved.get("precision", self.precision_spinner.text)
+            self.honest_toggle.state = "down" if saved.get("honest") else "normal"
+
+    # idle eviction (services/screen_memory.py)
+    def get_state(self):
+        return {"display": self.display.text, "message": self._message_shown,
+                "honest": self.honest_toggle.state == "down",
+                "number": self.number_spinner.text, "precision": self.precision_spinner.text}
+
+    def set_state(self, state):
+        self._saved_loaded = True
+        self.number_spinner.text = state.get("number", self.number_spinner.text)
+        self.precision_spinner.text = state.get("precision", self.precision_spinner.text)
+        self.honest_toggle.state = "down" if state.get("honest") else "normal"
+        self.display.text = "" if state.get("display") == "..." else state.get("display", "")
+        self._message_shown = state.get("message", False)
+
+    def release(self):
+        Clock.unschedule(self.display_error)
 
     def go_back(self, *a):
         if self.manager:
@@ -0,0 +1 @@
+# This package holds app services that need Kivy but are not screens
@@ -0,0 +1,237 @@
+# services/frame_monitor.py — opt-in frame-time monitor and jank detector
+"""
+Measures how long each frame takes and explains the slow ones.
+
+A ``Clock`` callback that runs every frame records the time between frames.
+While the monitor runs, a daemon thread samples the main thread's Python
+stack every ``sample_ms``. When a frame exceeds ``budget_ms``, the samples
+taken during that frame are attributed to the innermost function from this
+project, such as ``WheelWidget.redraw`` or ``MusicScreen._update``. The
+``keep`` worst frames are kept, along with a short list of recent janky
+frames.
+
+Nothing is hooked until ``start()`` is called, so a disabled monitor costs
+nothing. Turn it on with ``SRBOLI_FRAME_MONITOR=1`` or press F12 at runtime.
+Ctrl+F12 writes ``frame_report.json``.
+"""
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.metrics import dp
+from kivy.uix.label import Label
+
+ENV_VAR = "SRBOLI_FRAME_MONITOR"
+REPORT_FILE = "frame_report.json"
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SELF = os.path.abspath(__file__)
+
+
+def _is_app_file(filename):
+    return filename.startswith(_ROOT) and filename != _SELF
+
+
+def _label(code):
+    return getattr(code, "co_qualname", code.co_name)
+
+
+class FrameMonitor:
+    def __init__(self, budget_ms=33.3, sample_ms=2.0, keep=25, recent=100, max_depth=40):
+        self.budget = budget_ms / 1000.0
+        self.sample_interval = sample_ms / 1000.0
+        self.keep = keep
+        self.max_depth = max_depth
+        self.running = False
+        self.frames = 0
+        self.janky = 0
+        self.last_ms = 0.0
+        self.worst = []                      # min-heap of (ms, seq, record)
+        self.recent = deque(maxlen=recent)   # recent janky frames, newest last
+        self._seq = 0
+        self._last = None
+        self._samples = deque(maxlen=10000)  # (time, stack) from the sampler thread
+        self._stop = threading.Event()
+        self._thread = None
+        self._main_id = threading.main_thread().ident
+        self._frame_ev = None
+        self._overlay = None
+        self._overlay_ev = None
+
+    # ----- lifecycle -----
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self._last = time.perf_counter()
+        self._samples.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="frame-sampler", daemon=True)
+        self._thread.start()
+        self._frame_ev = Clock.schedule_interval(self._on_frame, 0)
+        return self
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self._stop.set()
+        if self._frame_ev is not None:
+            self._frame_ev.cancel()
+            self._frame_ev = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        self.hide_overlay()
+
+    def toggle(self):
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+            self.show_overlay()
+
+    def reset(self):
+        self.frames = self.janky = 0
+        self.worst.clear()
+        self.recent.clear()
+
+    # ----- sampling -----
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._main_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append((code.co_filename, _label(code)))
+                frame = frame.f_back
+            self._samples.append((time.perf_counter(), tuple(stack)))
+
+    def _on_frame(self, dt):
+        now = time.perf_counter()
+        start, self._last = self._last, now
+        duration = now - start
+        self.frames += 1
+        self.last_ms = duration * 1000.0
+
+        samples = []
+        while self._samples and self._samples[0][0] <= now:
+            t, stack = self._samples.popleft()
+            if t > start:
+                samples.append(stack)
+        if duration > self.budget:
+            self._record(start, duration, samples)
+
+    def _record(self, start, duration, samples):
+        self.janky += 1
+        culprits = Counter()
+        for stack in samples:
+            culprits[self._culprit(stack)] += 1
+        record = {
+            "at": round(start, 4),
+            "ms": round(duration * 1000.0, 2),
+            "samples": len(samples),
+            "culprits": [{"where": w, "samples": n} for w, n in culprits.most_common(5)],
+        }
+        self.recent.append(record)
+        self._seq += 1
+        item = (duration, self._seq, record)
+        if len(self.worst) < self.keep:
+            heapq.heappush(self.worst, item)
+        elif duration > self.worst[0][0]:
+            heapq.heapreplace(self.worst, item)
+
+    @staticmethod
+    def _culprit(stack):
+        """Innermost project function in a sampled stack, else the innermost function."""
+        for filename, name in stack:
+            if _is_app_file(filename):
+                return f"{name} ({os.path.relpath(filename, _ROOT)})"
+        if stack:
+            filename, name = stack[0]
+            return f"{name} ({os.path.basename(filename)})"
+        return "<idle>"
+
+    # ----- reporting -----
+    def worst_frames(self):
+        return [r for _, _, r in sorted(self.worst, reverse=True)]
+
+    def report(self):
+        return {
+            "budget_ms": round(self.budget * 1000.0, 2),
+            "sample_ms": round(self.sample_interval * 1000.0, 2),
+            "frames": self.frames,
+            "janky": self.janky,
+            "worst": self.worst_frames(),
+            "recent": list(self.recent),
+        }
+
+    def dump(self, path=REPORT_FILE):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(tmp, path)
+        print(f"Frame report written to {os.path.abspath(path)}")
+        return path
+
+    def summary(self):
+        line = f"{self.last_ms:5.1f} ms  jank {self.janky}/{self.frames}"
+        if self.worst:
+            worst = max(self.worst)[2]
+            where = worst["culprits"][0]["where"] if worst["culprits"] else "?"
+            line += f"\nworst {worst['ms']:.0f} ms: {where}"
+        return line
+
+    # ----- overlay -----
+    def show_overlay(self):
+        if self._overlay is not None:
+            return
+        self._overlay = Label(text="", font_size=dp(12), halign="right", valign="top",
+                              size_hint=(None, None), color=(1, 0.85, 0.3, 1))
+        self._overlay.bind(texture_size=lambda w, s: setattr(w, "size", s))
+        Window.add_widget(self._overlay)
+        self._overlay_ev = Clock.schedule_interval(self._update_overlay, 0.5)
+
+    def hide_overlay(self):
+        if self._overlay is None:
+            return
+        self._overlay_ev.cancel()
+        Window.remove_widget(self._overlay)
+        self._overlay = self._overlay_ev = None
+
+    def _update_overlay(self, dt):
+        ov = self._overlay
+        ov.text = self.summary()
+        ov.texture_update()
+        ov.pos = (Window.width - ov.width - dp(6), Window.height - ov.height - dp(6))
+
+    # ----- keyboard -----
+    def bind_keys(self):
+        Window.bind(on_key_down=self._on_key_down)
+
+    def _on_key_down(self, window, key, scancode, codepoint, modifiers):
+        if key != 293:  # F12
+            return False
+        if "ctrl" in modifiers:
+            self.dump()
+        else:
+            self.toggle()
+        return True
+
+
+def install(app):
+    """Attach a monitor to ``app``; it only starts when the env var is set or F12 is pressed."""
+    monitor = FrameMonitor()
+    monitor.bind_keys()
+    if os.environ.get(ENV_VAR, "").strip() not in ("", "0"):
+        monitor.start()
+        monitor.show_overlay()
+    return monitor
@@ -0,0 +1,212 @@
+# services/screen_memory.py — evict idle screens and rebuild them on demand
+"""
+Stops long-running sessions from holding every screen's widget tree forever.
+
+``LazyScreenManager`` records when each screen was last shown. Every
+``check_interval`` seconds, it evicts screens that have been hidden longer
+than ``idle_seconds``. If resident memory exceeds ``limit_bytes``, it also
+evicts hidden screens least-recently-used first, regardless of idle time.
+
+Evicting a screen works like this:
+
+1. The screen's ``get_state()`` is saved.
+2. The screen's ``release()`` is called, if defined.
+3. The screen is swapped for an empty ``EvictedScreen`` with the same name.
+
+When the user navigates back, the manager builds a fresh instance of the
+same class, calls ``set_state(state)``, and swaps it back in before the
+transition starts.
+
+The same swap serves startup. ``PendingScreen`` is a stub for a screen that
+has never been built. Its ``loader`` returns the class, so even the screen's
+module is only imported on the first visit. ``ensure`` builds a screen on
+demand without showing it.
+
+A screen opts in by defining ``get_state`` and ``set_state``, which pass a
+small JSON-able dict. It can define ``can_evict()`` to refuse while busy.
+Screens without the pair, such as the Music Player, which keeps playing in
+the background, are never evicted.
+
+Settings: ``SRBOLI_EVICT_IDLE`` (seconds, ``0`` disables idle eviction) and
+``SRBOLI_MEMORY_LIMIT_MB``.
+"""
+import gc
+import os
+import time
+
+from kivy.clock import Clock
+from kivy.uix.screenmanager import Screen, ScreenManager
+
+IDLE_ENV = "SRBOLI_EVICT_IDLE"
+LIMIT_ENV = "SRBOLI_MEMORY_LIMIT_MB"
+DEFAULT_IDLE = 15 * 60
+CHECK_INTERVAL = 30
+
+
+def resident_bytes():
+    """Current resident set size, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def _env_number(name, default):
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def evictable(screen):
+    return (not isinstance(screen, EvictedScreen)
+            and callable(getattr(screen, "get_state", None))
+            and callable(getattr(screen, "set_state", None)))
+
+
+class EvictedScreen(Screen):
+    """Empty stand-in that remembers how to rebuild the real screen."""
+
+    def __init__(self, screen_class, state, **kwargs):
+        super().__init__(**kwargs)
+        self.screen_class = screen_class
+        self.state = state
+
+    def resolve(self):
+        return self.screen_class
+
+    def show_error(self, message, home=None):
+        """Shown instead of a screen that failed to build, so the user is not stranded."""
+        from kivy.uix.boxlayout import BoxLayout
+        from kivy.uix.button import Button
+        from kivy.uix.label import Label
+        self.clear_widgets()
+        box = BoxLayout(orientation="vertical", padding=20, spacing=10)
+        box.add_widget(Label(text=f"[b]{self.name}[/b]\n(failed to load: {message})", markup=True))
+        if home:
+            btn = Button(text="← Back", size_hint_y=None, height=48)
+            btn.bind(on_release=lambda *a: setattr(self.manager, "current", home))
+            box.add_widget(btn)
+        self.add_widget(box)
+
+
+class PendingScreen(EvictedScreen):
+    """Stand-in for a screen not built yet; ``loader()`` imports and returns its class."""
+
+    def __init__(self, loader, **kwargs):
+        super().__init__(None, None, **kwargs)
+        self.loader = loader
+
+    def resolve(self):
+        return self.loader()
+
+
+class LazyScreenManager(ScreenManager):
+    def __init__(self, idle_seconds=None, limit_bytes=None, check_interval=CHECK_INTERVAL, home=None, **kwargs):
+        super().__init__(**kwargs)
+        self.home = home  # where a screen that failed to build sends the user back to
+        if idle_seconds is None:
+            idle_seconds = _env_number(IDLE_ENV, DEFAULT_IDLE)
+        if limit_bytes is None:
+            limit_mb = _env_number(LIMIT_ENV, 0)
+            limit_bytes = int(limit_mb * 1024 * 1024) if limit_mb > 0 else None
+        self.idle_seconds = idle_seconds
+        self.limit_bytes = limit_bytes
+        self.evictions = 0
+        self.restores = 0
+        self.builds = 0
+        self._last_seen = {}  # screen name -> monotonic time it was last current
+        self._check_ev = None
+        if idle_seconds > 0 or limit_bytes:
+            self._check_ev = Clock.schedule_interval(lambda dt: self.check(), check_interval)
+
+    # ----- navigation -----
+    def on_current(self, instance, value):
+        now = time.monotonic()
+        if self.current_screen is not None:
+            self._last_seen[self.current_screen.name] = now
+        if value is not None:
+            self._restore(value)
+            self._last_seen[value] = now
+        return super().on_current(instance, value)
+
+    def ensure(self, name):
+        """The real screen called ``name``, built now if it is pending or evicted."""
+        self._restore(name)
+        return self.get_screen(name)
+
+    def _restore(self, name):
+        stub = self.get_screen(name) if self.has_screen(name) else None
+        if not isinstance(stub, EvictedScreen):
+            return
+        try:
+            screen = stub.resolve()(name=name)
+        except Exception as e:
+            print(f"⚠️ Failed to init {name}: {e}")
+            stub.show_error(e, self.home)
+            return
+        if stub.state is not None:
+            try:
+                screen.set_state(stub.state)
+            except Exception as e:
+                print(f"⚠️ Could not restore state of {name}: {e}")
+        self.remove_widget(stub)
+        self.add_widget(screen)
+        if isinstance(stub, PendingScreen):
+            self.builds += 1
+        else:
+            self.restores += 1
+
+    # ----- eviction -----
+    def candidates(self):
+        """Hidden screens that may be evicted, least recently shown first."""
+        shown = self.current_screen
+        busy = {self.transition.screen_in, self.transition.screen_out} if self.transition.is_active else set()
+        out = [s for s in self.screens if s is not shown and s not in busy and evictable(s)
+               and getattr(s, "can_evict", lambda: True)()]
+        out.sort(key=lambda s: self._last_seen.get(s.name, 0.0))
+        return out
+
+    def evict(self, screen):
+        try:
+            state = screen.get_state()
+        except Exception as e:
+            print(f"⚠️ Not evicting {screen.name}: {e}")
+            return False
+        release = getattr(screen, "release", None)
+        if callable(release):
+            release()
+        self.remove_widget(screen)
+        self.add_widget(EvictedScreen(type(screen), state, name=screen.name))
+        self.evictions += 1
+        return True
+
+    def check(self):
+        """Evict idle screens, then keep evicting while over the memory limit."""
+        now = time.monotonic()
+        evicted = []
+        candidates = self.candidates()
+        if self.idle_seconds > 0:
+            for s in list(candidates):
+                if now - self._last_seen.get(s.name, 0.0) >= self.idle_seconds and self.evict(s):
+                    evicted.append(s.name)
+                    candidates.remove(s)
+        if evicted:
+            gc.collect()
+        if self.limit_bytes:
+            rss = resident_bytes()
+            while rss is not None and rss > self.limit_bytes and candidates:
+                s = candidates.pop(0)
+                if self.evict(s):
+                    evicted.append(s.name)
+                    gc.collect()
+                    rss = resident_bytes()
+        if evicted:
+            print(f"Evicted idle screens: {', '.join(evicted)}")
+        return evicted
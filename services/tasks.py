@@ -0,0 +1,167 @@
+# services/tasks.py — background task runner with results delivered on the Kivy thread
+"""
+One place to run slow work off the UI thread.
+
+    runner().submit(read_list_file, path, on_done=self._apply, on_error=self._fail)
+
+* **Lanes.** ``INTERACTIVE`` is for work the user is waiting on, like an
+  import or a JSON load. ``BULK`` is for long background jobs, like folder
+  scans. Each lane has its own thread pool, so a long scan never queues
+  ahead of a click.
+* **Processes.** ``process=True`` runs a picklable function in a lazily
+  started process pool, for CPU-bound work that would hold the GIL. A
+  thread task can also ``map`` over ``process_pool()`` itself.
+* **Callbacks.** ``on_done(result)``, ``on_error(exc)`` and
+  ``on_progress(value)`` always run on the Kivy thread through
+  ``Clock.schedule_once``. None of them run once the task is cancelled.
+* **Cancellation.** ``Task.cancel()`` drops a queued task and suppresses
+  the callbacks of a running one. Functions submitted with ``pass_task=True``
+  receive the ``Task`` as their first argument. They can poll
+  ``task.cancelled`` and call ``task.progress(value)``.
+
+``SrboliLightApp`` owns the runner and shuts it down in ``on_stop``.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from kivy.app import App
+from kivy.clock import Clock
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANE_WORKERS = {INTERACTIVE: 2, BULK: 2}
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    def __init__(self, name, on_done=None, on_error=None, on_progress=None):
+        self.name = name
+        self.future = None
+        self._cancel = threading.Event()
+        self._on_done = on_done
+        self._on_error = on_error
+        self._on_progress = on_progress
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def cancel_event(self):
+        """The ``threading.Event`` behind ``cancel()``, for APIs that poll one."""
+        return self._cancel
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check(self):
+        """Raise ``TaskCancelled`` from inside the work function once cancelled."""
+        if self._cancel.is_set():
+            raise TaskCancelled(self.name)
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def progress(self, value):
+        """Called from the worker; ``on_progress(value)`` runs on the Kivy thread."""
+        cb = self._on_progress
+        if cb is not None and not self.cancelled:
+            Clock.schedule_once(lambda dt: None if self.cancelled else cb(value))
+
+    def _finished(self, future):
+        # worker thread (or the pool's management thread for processes)
+        if self.cancelled or future.cancelled():
+            return
+        exc = future.exception()
+        if exc is None:
+            cb, arg = self._on_done, future.result()
+        elif isinstance(exc, TaskCancelled):
+            return
+        else:
+            cb, arg = self._on_error, exc
+            if cb is None:
+                print(f"Task {self.name} failed: {exc!r}")
+        if cb is not None:
+            Clock.schedule_once(lambda dt: None if self.cancelled else cb(arg))
+
+
+class TaskRunner:
+    def __init__(self, lane_workers=None, process_workers=None):
+        workers = dict(LANE_WORKERS, **(lane_workers or {}))
+        self._lanes = {lane: ThreadPoolExecutor(max_workers=n, thread_name_prefix=f"task-{lane}")
+                       for lane, n in workers.items()}
+        self._process_workers = process_workers
+        self._processes = None
+        self._lock = threading.Lock()
+        self._tasks = set()
+        self._closed = False
+
+    def submit(self, fn, *args, lane=INTERACTIVE, on_done=None, on_error=None, on_progress=None,
+               pass_task=False, process=False, name=None, **kwargs):
+        if self._closed:
+            raise RuntimeError("task runner is shut down")
+        task = Task(name or getattr(fn, "__qualname__", repr(fn)), on_done, on_error, on_progress)
+        if process:
+            if pass_task:
+                raise ValueError("process tasks cannot receive the Task")
+            future = self.process_pool().submit(fn, *args, **kwargs)
+        else:
+            if pass_task:
+                args = (task,) + args
+            future = self._lanes[lane].submit(fn, *args, **kwargs)
+        task.future = future
+        with self._lock:
+            self._tasks.add(task)
+        future.add_done_callback(lambda f: self._settle(task, f))
+        return task
+
+    def _settle(self, task, future):
+        with self._lock:
+            self._tasks.discard(task)
+        task._finished(future)
+
+    def process_pool(self):
+        """The shared process pool, started on first use; thread tasks can fan work out to it."""
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self._process_workers)
+            return self._processes
+
+    def pending(self):
+        with self._lock:
+            return len(self._tasks)
+
+    def cancel_all(self):
+        with self._lock:
+            tasks = list(self._tasks)
+        for t in tasks:
+            t.cancel()
+
+    def shutdown(self):
+        """Cancel everything and stop the pools without waiting for running work."""
+        self._closed = True
+        self.cancel_all()
+        for pool in self._lanes.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+
+_fallback = None
+
+
+def runner():
+    """The app's runner, or a shared one when no app is running (tests, benchmarks)."""
+    global _fallback
+    app = App.get_running_app()
+    tasks = getattr(app, "tasks", None)
+    if tasks is not None:
+        return tasks
+    if _fallback is None:
+        _fallback = TaskRunner()
+    return _fallback
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import threading
+import unittest
+import wave
+
+from core.audio_meta import MetadataCache, MetadataService
+
+
+class MetadataServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = MetadataCache(os.path.join(self.tmp.name, "meta.json"))
+        self.track = os.path.join(self.tmp.name, "a.wav")
+        with wave.open(self.track, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(b"\0\0" * 8000)
+        self.service = MetadataService(self.cache)
+
+    def tearDown(self):
+        self.service.shutdown()
+        self.tmp.cleanup()
+
+    def request(self, paths):
+        got, done = [], threading.Event()
+
+        def callback(path, meta):
+            got.append((path, meta, threading.current_thread()))
+            done.set()
+        self.service.request(paths, callback)
+        self.assertTrue(done.wait(5))
+        return got
+
+    def test_cache_is_checked_off_the_calling_thread(self):
+        looked_up = []
+        get = self.cache.get
+        self.cache.get = lambda path: looked_up.append(threading.current_thread()) or get(path)
+        self.request([self.track])
+        self.assertTrue(looked_up)
+        self.assertNotIn(threading.current_thread(), looked_up)
+
+    def test_hits_and_misses_both_reach_the_callback(self):
+        (path, meta, thread), = self.request([self.track])
+        self.assertAlmostEqual(meta["duration"], 1.0, places=2)
+        self.assertIsNot(thread, threading.current_thread())
+        (path, cached, _), = self.request([self.track])
+        self.assertEqual(cached, meta)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from core.backrooms import find_level, merge_shards
+
+
+class MergeShardsTest(unittest.TestCase):
+    def test_fields_merge_and_conflicts_name_their_files(self):
+        shards = [
+            ("a.json", 0, {"0": {"name": "Lobby", "tips": ["run"]}}, None),
+            ("b.json", 0, {"0": {"name": "Lobby 2", "tips": ["hide"], "danger": 1}}, None),
+        ]
+        levels, report = merge_shards(shards)
+        self.assertEqual(levels["0"], {"name": "Lobby 2", "tips": ["run", "hide"], "danger": 1})
+        self.assertEqual(report["conflicts"],
+                         [{"level": "0", "field": "name", "kept": "b.json", "dropped": "a.json"}])
+
+    def test_entries_that_are_not_objects_are_skipped(self):
+        shards = [
+            ("a.json", 0, {"0": {"name": "Lobby"}}, None),
+            ("b.json", 0, {"0": "see level 1", "1": ["x"]}, None),
+        ]
+        levels, report = merge_shards(shards)
+        self.assertEqual(levels, {"0": {"name": "Lobby"}})
+        self.assertEqual(report["conflicts"], [])
+        self.assertEqual([e["file"] for e in report["errors"]], ["b.json", "b.json"])
+        self.assertIsNone(find_level(levels, "see"))
+
+    def test_priority_wins_over_order(self):
+        shards = [
+            ("high.json", 5, {"0": {"name": "high"}}, None),
+            ("low.json", 0, {"0": {"name": "low"}}, None),
+            ("bad.json", 0, {}, "invalid JSON"),
+        ]
+        levels, report = merge_shards(shards)
+        self.assertEqual(levels["0"], {"name": "high"})
+        self.assertEqual(report["conflicts"][0]["dropped"], "low.json")
+        self.assertEqual(report["errors"], [{"file": "bad.json", "error": "invalid JSON"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+from core.instance import InstanceServer, MAX_REQUEST_BYTES, forward
+
+
+class InstanceServerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "instance.json")
+        self.server = InstanceServer(self.path).start()
+
+    def tearDown(self):
+        self.server.close()
+        self.tmp.cleanup()
+
+    def send(self, data):
+        with socket.create_connection(("127.0.0.1", self.server.port), timeout=3) as s:
+            s.sendall(data)
+            return s.makefile("rb").readline()
+
+    def test_bad_requests_are_denied_and_server_survives(self):
+        bad = [
+            json.dumps({"token": "été", "request": {}}).encode("utf-8") + b"\n",
+            b'{"token": "\\ud800", "request": {}}\n',
+            b"\xff\xfe\n",
+            b"x" * (MAX_REQUEST_BYTES + 10) + b"\n",
+            b"[" * 50000 + b"\n",
+        ]
+        for data in bad:
+            self.assertEqual(self.send(data), b"denied\n")
+        self.assertTrue(forward({"screen": "music"}, self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
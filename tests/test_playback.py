@@ -0,0 +1,69 @@
+import os
+import tempfile
+import time
+import unittest
+import wave
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+from core.playback import PlaybackEngine, ADVANCED, FINISHED
+
+
+def write_silence(path, seconds, rate=22050):
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\0\0" * int(rate * seconds))
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class GaplessAdvanceTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            self.skipTest(f"no audio device: {e}")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.first = os.path.join(self.tmp.name, "a.wav")
+        self.second = os.path.join(self.tmp.name, "b.wav")
+        write_silence(self.first, 1.0)
+        write_silence(self.second, 3.0)
+        self.engine = PlaybackEngine()
+
+    def tearDown(self):
+        self.engine.stop()
+        self.engine.shutdown()
+        pygame.mixer.quit()
+        self.tmp.cleanup()
+
+    def test_advance_seen_by_first_poll_after_the_switch(self):
+        # the music screen's end watch may first poll only after the switch
+        self.engine.play(self.first)
+        self.assertTrue(self.engine.queue(self.second))
+        time.sleep(1.3)
+        self.assertEqual(self.engine.poll(), ADVANCED)
+        self.assertEqual(self.engine.current, self.second)
+        self.assertIsNone(self.engine.queued)
+
+    def test_no_advance_while_first_track_plays(self):
+        self.engine.play(self.first)
+        self.engine.queue(self.second)
+        time.sleep(0.5)
+        self.assertIsNone(self.engine.poll())
+        self.assertEqual(self.engine.current, self.first)
+
+    def test_finished_without_queue(self):
+        self.engine.play(self.first)
+        time.sleep(1.3)
+        self.assertEqual(self.engine.poll(), FINISHED)
+        self.assertIsNone(self.engine.current)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from core import scheduler
+from core.scheduler import TimerScheduler
+
+
+class RestoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "timers.json")
+        self.calls = []
+        self._saved_action = scheduler.ACTIONS["shutdown"]
+        scheduler.register_action("shutdown", self.calls.append)
+
+    def tearDown(self):
+        scheduler.register_action("shutdown", self._saved_action)
+        self.tmp.cleanup()
+
+    def write(self, saved_at, **timer):
+        item = {"id": 1, "label": "t", "duration": 60.0, "elapsed": 10.0,
+                "running": True, "actions": ["shutdown"], "fired": False}
+        item.update(timer)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": saved_at, "timers": [item]}, f)
+
+    def test_overdue_timer_expires_without_actions(self):
+        self.write(time.time() - 3600)
+        sched = TimerScheduler(self.path).start()
+        try:
+            time.sleep(0.2)
+            entry = sched.get(1)
+            self.assertTrue(entry.fired)
+            self.assertEqual(entry.timer.remaining(), 0.0)
+        finally:
+            sched.shutdown()
+        self.assertEqual(self.calls, [])
+        with open(self.path, encoding="utf-8") as f:
+            self.assertTrue(json.load(f)["timers"][0]["fired"])
+
+    def test_pending_timer_resumes(self):
+        self.write(time.time() - 5)
+        sched = TimerScheduler(self.path).start()
+        try:
+            entry = sched.get(1)
+            self.assertFalse(entry.fired)
+            self.assertTrue(entry.timer.running)
+            self.assertAlmostEqual(entry.timer.remaining(), 45.0, delta=1.0)
+        finally:
+            sched.shutdown()
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
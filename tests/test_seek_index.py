@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import wave
+
+from core.seek_index import _crc8, _next_flac_frame, build_index
+
+
+class WavSeekTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "a.wav")
+        with wave.open(self.path, "wb") as w:
+            w.setnchannels(2)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(b"\0" * 4 * 8000 * 5)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_offsets_are_sample_exact(self):
+        index = build_index(self.path)
+        self.assertEqual(index.lookup(4.3), (4.3, 44 + 34400 * 4))
+        self.assertEqual(index.lookup(-1), (0.0, 44))
+        self.assertEqual(index.lookup(99), (5.0, 44 + 40000 * 4))
+
+    def test_open_at_splices_a_valid_header(self):
+        fileobj, t = build_index(self.path).open_at(2.5)
+        self.assertEqual(t, 2.5)
+        with wave.open(fileobj) as w:
+            self.assertEqual(w.getnframes(), 20000)
+
+
+def flac_header(number, crc_ok=True):
+    # fixed blocksize, 4096-sample blocks (code 12), rate from STREAMINFO, stereo, 16 bit
+    head = bytes([0xFF, 0xF8, 0xC0, 0x18, number])
+    return head + bytes([_crc8(head, 0, len(head)) ^ (0 if crc_ok else 1)])
+
+
+class FlacSyncTest(unittest.TestCase):
+    def scan(self, data):
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            return _next_flac_frame(f, 0, 4096)
+
+    def test_header_with_valid_crc_is_found(self):
+        data = b"\0" * 10 + flac_header(3) + b"\0" * 32
+        self.assertEqual(self.scan(data), (3 * 4096, 10))
+
+    def test_sync_code_in_audio_data_is_skipped(self):
+        data = flac_header(5, crc_ok=False) + b"\0" * 10 + flac_header(7) + b"\0" * 32
+        self.assertEqual(self.scan(data), (7 * 4096, 16))
+
+
+if __name__ == "__main__":
+    unittest.main()
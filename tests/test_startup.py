@@ -0,0 +1,32 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+
+from core.startup import ImportProfiler
+
+
+class ImportProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp.name, "profiled_mod.py"), "w") as f:
+            f.write("VALUE = 1\n")
+        sys.path.insert(0, self.tmp.name)
+        self.profiler = ImportProfiler().install()
+
+    def tearDown(self):
+        self.profiler.uninstall()
+        sys.path.remove(self.tmp.name)
+        sys.modules.pop("profiled_mod", None)
+        self.tmp.cleanup()
+
+    def test_import_is_recorded_and_reload_works(self):
+        import profiled_mod
+        self.assertIn("profiled_mod", [r[0] for r in self.profiler.records])
+        self.assertIs(importlib.reload(profiled_mod), profiled_mod)
+        self.assertEqual(profiled_mod.VALUE, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+from array import array
+
+from core.waveform import PeakReducer
+
+
+class PeakReducerTest(unittest.TestCase):
+    def test_underestimated_length_keeps_the_end(self):
+        reducer = PeakReducer(1000, 10)
+        reducer.feed(array("h", [0] * 1600 + [16384] * 400))
+        mins, maxs = reducer.finish()
+        self.assertEqual(len(maxs), 10)
+        self.assertEqual(maxs[-2:], [0.5, 0.5])
+        self.assertEqual(maxs[:8], [0.0] * 8)
+
+    def test_overestimated_length_pads_with_silence(self):
+        reducer = PeakReducer(2000, 10)
+        reducer.feed(array("h", [-16384] * 1000))
+        mins, maxs = reducer.finish()
+        self.assertEqual(mins, [-0.5] * 5 + [0.0] * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1 @@
+# This package holds Kivy widgets shared between screens
@@ -0,0 +1,224 @@
+# widgets/file_picker.py — scandir-backed file picker shared by every import dialog
+"""
+Replaces ``FileChooserIconView`` in every import dialog.
+
+The directory is listed on the task runner with ``core.dirlist``, so opening a
+folder with thousands of files never blocks the UI. Rows are recycled, so
+only the visible ones exist as widgets. Typing in the filter box narrows the
+list on the next frame. Each tool reopens the folder it used last: the
+folder is looked up on the task runner, and ``remember()`` saves it once
+when the dialog closes, not on every navigation.
+"""
+import os
+
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivy.properties import ListProperty, StringProperty
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.textinput import TextInput
+
+from core.dirlist import LISTINGS, last_dir, matches, remember_dir
+from services.tasks import runner
+
+ROW_HEIGHT = dp(34)
+NORMAL_COLOR = (0.2, 0.2, 0.2, 1)
+SELECTED_COLOR = (0.2, 0.45, 0.8, 1)
+DIR_TEXT_COLOR = (0.75, 0.88, 1, 1)
+FILE_TEXT_COLOR = (1, 1, 1, 1)
+
+
+class PickerRow(RecycleDataViewBehavior, Button):
+    name = None
+    is_dir = False
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.name = data["name"]
+        self.is_dir = data["is_dir"]
+        self.halign = "left"
+        self.shorten = True
+        self.shorten_from = "right"
+        return super().refresh_view_attrs(rv, index, data)
+
+    def on_size(self, *a):
+        self.text_size = (self.width - dp(12), None)
+
+    def on_release(self):
+        rv = self.parent.recycleview if self.parent else None
+        if rv is not None and self.name is not None:
+            rv.dispatch("on_entry", self.name, self.is_dir)
+
+
+class _EntryList(RecycleView):
+    __events__ = ("on_entry",)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.viewclass = PickerRow
+        layout = RecycleBoxLayout(orientation="vertical", default_size=(None, ROW_HEIGHT),
+                                  default_size_hint=(1, None), size_hint_y=None, spacing=dp(2))
+        layout.bind(minimum_height=layout.setter("height"))
+        self.add_widget(layout)
+
+    def on_entry(self, name, is_dir):
+        pass
+
+
+class FilePicker(BoxLayout):
+    """Browse from the ``tool``'s last directory; ``selection`` holds absolute paths.
+
+    ``filters`` are file extensions such as ``(".txt",)``; directories are
+    always listed. Tapping a directory opens it, tapping a file selects it.
+    Call ``remember()`` when the dialog closes to reopen this folder next time.
+    """
+
+    path = StringProperty("")
+    selection = ListProperty([])
+
+    def __init__(self, tool, filters=(), multiselect=False, show_hidden=False, **kwargs):
+        kwargs.setdefault("orientation", "vertical")
+        kwargs.setdefault("spacing", dp(4))
+        super().__init__(**kwargs)
+        self.tool = tool
+        self.filters = tuple(f.lower() for f in filters)
+        self.multiselect = multiselect
+        self.show_hidden = show_hidden
+        self._listing = []
+        self._rows = {}  # name -> position in the list's data
+        self._task = None
+
+        top = BoxLayout(size_hint_y=None, height=dp(36), spacing=dp(4))
+        up = Button(text="Up", size_hint_x=None, width=dp(60))
+        up.bind(on_release=lambda *a: self.go_up())
+        top.add_widget(up)
+        self.path_input = TextInput(multiline=False)
+        self.path_input.bind(on_text_validate=lambda inst: self.open(inst.text))
+        top.add_widget(self.path_input)
+        self.add_widget(top)
+
+        self.filter_input = TextInput(hint_text="Filter", multiline=False, size_hint_y=None, height=dp(36))
+        self._filter_trigger = Clock.create_trigger(lambda dt: self._apply_filter())
+        self.filter_input.bind(text=lambda *a: self._filter_trigger())
+        self.add_widget(self.filter_input)
+
+        self.entries = _EntryList()
+        self.entries.bind(on_entry=lambda rv, name, is_dir: self._activate(name, is_dir))
+        self.add_widget(self.entries)
+
+        self.status = Label(text="", size_hint_y=None, height=dp(22), font_size=dp(12))
+        self.add_widget(self.status)
+
+        self.open(None)
+
+    def open(self, path):
+        """List ``path`` on the task runner; None opens the tool's last directory."""
+        if path is not None:
+            path = os.path.abspath(os.path.expanduser(path.strip() or "."))
+        if self._task is not None:
+            self._task.cancel()
+        self.status.text = "Loading..."
+        self._task = runner().submit(self._list, self.tool, path, name="file-picker",
+                                     on_done=lambda result: self._show(*result),
+                                     on_error=self._failed)
+
+    @staticmethod
+    def _list(tool, path):
+        # runs on the task runner, so last_dirs.json is never read on the UI thread
+        if path is None:
+            path = last_dir(tool)
+        return path, LISTINGS.list(path)
+
+    def remember(self):
+        """Save the folder being shown as the tool's last directory (written off the UI thread)."""
+        if self.path:
+            runner().submit(remember_dir, self.tool, self.path, name="remember-dir")
+
+    def go_up(self):
+        parent = os.path.dirname(self.path)
+        if parent and parent != self.path:
+            self.open(parent)
+
+    def refresh(self):
+        LISTINGS.invalidate(self.path)
+        self.open(self.path)
+
+    def _show(self, path, listing):
+        self._task = None
+        self.path = path
+        self.path_input.text = path
+        self._listing = listing
+        self.selection = []
+        self._apply_filter()
+
+    def _failed(self, e):
+        self._task = None
+        self.path_input.text = self.path
+        self.status.text = f"Cannot open folder: {e}"
+
+    def _apply_filter(self):
+        text = self.filter_input.text.strip().lower()
+        selected = set(self.selection)
+        data, files = [], 0
+        for name, is_dir in self._listing:
+            if not self.show_hidden and name.startswith("."):
+                continue
+            if is_dir:
+                if text and text not in name.lower():
+                    continue
+                label = name + os.sep
+            else:
+                if not matches(name, self.filters, text):
+                    continue
+                label = name
+                files += 1
+            full = os.path.join(self.path, name)
+            data.append({"text": label, "name": name, "is_dir": is_dir,
+                         "color": DIR_TEXT_COLOR if is_dir else FILE_TEXT_COLOR,
+                         "background_color": SELECTED_COLOR if full in selected else NORMAL_COLOR})
+        self._rows = {d["name"]: i for i, d in enumerate(data)}
+        self.entries.data = data
+        self.status.text = f"{len(data) - files} folders, {files} files"
+
+    def _activate(self, name, is_dir):
+        full = os.path.join(self.path, name)
+        if is_dir:
+            self.open(full)
+            return
+        if not self.multiselect:
+            new = [full]
+        elif full in self.selection:
+            new = [p for p in self.selection if p != full]
+        else:
+            new = self.selection + [full]
+        changed = set(new).symmetric_difference(self.selection)
+        self.selection = new
+        for p in changed:
+            i = self._rows.get(os.path.basename(p))
+            if i is not None:
+                self.entries.data[i]["background_color"] = SELECTED_COLOR if p in new else NORMAL_COLOR
+        self.entries.refresh_from_data()
+
+
+def open_file_picker(title, tool, on_select, filters=(), button_text="Select"):
+    """Popup with a ``FilePicker``; ``on_select(path)`` gets the chosen file."""
+    picker = FilePicker(tool, filters=filters)
+    btn = Button(text=button_text, size_hint_y=None, height=dp(40))
+    layout = BoxLayout(orientation="vertical")
+    layout.add_widget(picker)
+    layout.add_widget(btn)
+    popup = Popup(title=title, content=layout, size_hint=(0.9, 0.9))
+    popup.bind(on_dismiss=lambda *a: picker.remember())
+
+    def _select(inst):
+        popup.dismiss()
+        if picker.selection:
+            on_select(picker.selection[0])
+
+    btn.bind(on_release=_select)
+    popup.open()
+    return picker
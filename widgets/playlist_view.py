@@ -0,0 +1,73 @@
+# widgets/playlist_view.py — virtualized track list for the Music Player
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.button import Button
+from kivy.metrics import dp
+
+ROW_HEIGHT = dp(40)
+NORMAL_COLOR = (1, 1, 1, 1)
+CURRENT_COLOR = (0.2, 0.6, 1, 1)
+
+
+class PlaylistRow(RecycleDataViewBehavior, Button):
+    """One recycled row; only the visible handful of these ever exist."""
+
+    path = None
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.path = data.get("path")
+        self.shorten = True
+        self.shorten_from = "right"
+        return super().refresh_view_attrs(rv, index, data)
+
+    def on_size(self, *a):
+        self.text_size = (self.width - dp(12), None)
+
+    def on_release(self):
+        rv = self.parent.recycleview if self.parent else None
+        if rv is not None and self.path:
+            rv.dispatch("on_track", self.path)
+
+
+class PlaylistView(RecycleView):
+    """RecycleView over ``data`` rows of ``{"text", "path", "background_color"}``.
+
+    Dispatches ``on_track(path)`` when a row is tapped.
+    """
+
+    __events__ = ("on_track",)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.viewclass = PlaylistRow
+        layout = RecycleBoxLayout(
+            orientation="vertical",
+            default_size=(None, ROW_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+        )
+        layout.bind(minimum_height=layout.setter("height"))
+        self.add_widget(layout)
+        self._rows = {}  # path -> position in self.data
+
+    def set_rows(self, rows):
+        self._rows = {r["path"]: i for i, r in enumerate(rows)}
+        self.data = rows
+
+    def append_rows(self, rows):
+        start = len(self.data)
+        for i, r in enumerate(rows):
+            self._rows[r["path"]] = start + i
+        self.data.extend(rows)
+
+    def update_row(self, path, **changes):
+        """Patch a row in place; call ``refresh_from_data`` once after a batch."""
+        i = self._rows.get(path)
+        if i is None:
+            return False
+        self.data[i].update(changes)
+        return True
+
+    def on_track(self, path):
+        pass
@@ -0,0 +1,55 @@
+# widgets/progress_bar.py — flat progress bar with persistent canvas instructions
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Rectangle
+from kivy.properties import NumericProperty, ListProperty
+
+
+class FlatProgressBar(Widget):
+    """A background track and a foreground fill, created once.
+
+    Changing ``value`` only resizes the fill rectangle, and only when that
+    moves it by at least one pixel; layout changes rebind both rectangles.
+    ``inset`` is a horizontal margin on each side of the bar.
+    """
+
+    value = NumericProperty(0.0)
+    max = NumericProperty(1.0)
+    inset = NumericProperty(0)
+    bar_color = ListProperty([0.12, 0.7, 0.9, 1])
+    back_color = ListProperty([0.18, 0.18, 0.18, 1])
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        with self.canvas:
+            self._back_color = Color(rgba=self.back_color)
+            self._back = Rectangle()
+            self._bar_color = Color(rgba=self.bar_color)
+            self._bar = Rectangle()
+        self.bind(pos=self._layout, size=self._layout, inset=self._layout,
+                  value=self._update_fill, max=self._update_fill,
+                  bar_color=self._update_colors, back_color=self._update_colors)
+        self._layout()
+
+    @property
+    def bar_width(self):
+        return max(0, self.width - 2 * self.inset)
+
+    def fill_pixels(self):
+        frac = min(1.0, max(0.0, self.value / self.max)) if self.max else 0.0
+        return int(self.bar_width * frac)
+
+    def _layout(self, *a):
+        pos = (self.x + self.inset, self.y)
+        self._back.pos = pos
+        self._back.size = (self.bar_width, self.height)
+        self._bar.pos = pos
+        self._bar.size = (self.fill_pixels(), self.height)
+
+    def _update_fill(self, *a):
+        px = self.fill_pixels()
+        if px != self._bar.size[0]:
+            self._bar.size = (px, self.height)
+
+    def _update_colors(self, *a):
+        self._back_color.rgba = self.back_color
+        self._bar_color.rgba = self.bar_color
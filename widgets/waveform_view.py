@@ -0,0 +1,43 @@
+# widgets/waveform_view.py — min/max waveform drawn as one mesh
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Mesh
+
+
+class WaveformView(Widget):
+    """Draws ``(mins, maxs)`` peaks (each -1..1) as a single triangle-strip mesh.
+
+    The canvas instructions are created once; new peaks or a resize only
+    rewrite the mesh vertices.
+    """
+
+    def __init__(self, color=(0.3, 0.55, 0.8, 0.45), **kwargs):
+        super().__init__(**kwargs)
+        self._peaks = None
+        with self.canvas:
+            Color(*color)
+            self._mesh = Mesh(mode="triangle_strip", vertices=[], indices=[])
+        self.bind(pos=self._update_mesh, size=self._update_mesh)
+
+    def set_peaks(self, peaks):
+        self._peaks = peaks
+        self._update_mesh()
+
+    def clear(self):
+        self.set_peaks(None)
+
+    def _update_mesh(self, *a):
+        if not self._peaks or not self._peaks[0]:
+            self._mesh.vertices = []
+            self._mesh.indices = []
+            return
+        mins, maxs = self._peaks
+        n = len(mins)
+        cy = self.center_y
+        half = self.height / 2.0
+        step = self.width / max(1, n - 1)
+        verts = []
+        for i in range(n):
+            x = self.x + i * step
+            verts.extend((x, cy + maxs[i] * half, 0, 0, x, cy + mins[i] * half, 0, 0))
+        self._mesh.vertices = verts
+        self._mesh.indices = list(range(2 * n))